@@ -5,7 +5,7 @@ from typing import Protocol, override, runtime_checkable
 
 from loguru import logger
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import CapabilityClientProtocol, TextDocumentCapabilityProtocol
 from lsp_client.utils.types import AnyPath, lsp_type
 
@@ -53,7 +53,7 @@ class WithDocumentDiagnostic(
     ) -> lsp_type.DocumentDiagnosticReport:
         return await self.request(
             lsp_type.DocumentDiagnosticRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.DocumentDiagnosticResponse,
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections.abc import AsyncGenerator, AsyncIterator, Iterator
+from contextlib import asynccontextmanager
 from typing import Protocol, override, runtime_checkable
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.convert import value_deserialize
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import (
     CapabilityClientProtocol,
     ServerRequestHook,
@@ -54,7 +56,7 @@ class WithWorkspaceDiagnostic(
     ) -> lsp_type.WorkspaceDiagnosticReport:
         return await self.request(
             lsp_type.WorkspaceDiagnosticRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.WorkspaceDiagnosticResponse,
@@ -76,6 +78,40 @@ class WithWorkspaceDiagnostic(
             )
         )
 
+    @asynccontextmanager
+    async def stream_workspace_diagnostic(
+        self,
+        *,
+        identifier: str | None = None,
+        previous_result_ids: list[lsp_type.PreviousResultId] | None = None,
+    ) -> AsyncGenerator[AsyncIterator[lsp_type.WorkspaceDocumentDiagnosticReport]]:
+        """
+        Stream per-document reports of `workspace/diagnostic` as the server reports
+        partial results.
+        """
+
+        async def send_request(
+            token: lsp_type.ProgressToken,
+        ) -> lsp_type.WorkspaceDiagnosticReport:
+            return await self._request_workspace_diagnostic(
+                lsp_type.WorkspaceDiagnosticParams(
+                    identifier=identifier,
+                    previous_result_ids=previous_result_ids or [],
+                    partial_result_token=token,
+                )
+            )
+
+        async with self.get_progress_dispatcher().partial_results(
+            send_request,
+            partial_items=lambda value: (
+                value_deserialize(
+                    value, lsp_type.WorkspaceDiagnosticReportPartialResult
+                ).items
+            ),
+            result_items=lambda result: result.items if result else (),
+        ) as reports:
+            yield reports
+
     async def _respond_diagnostic_refresh(self, params: None) -> None:
         return None
 
@@ -6,7 +6,7 @@ from typing import Protocol, override, runtime_checkable
 import asyncer
 from lsprotocol.types import TextDocumentClientCapabilities
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import CapabilityClientProtocol, TextDocumentCapabilityProtocol
 from lsp_client.utils.types import AnyPath, Position, lsp_type
 
@@ -47,34 +47,37 @@ class WithRequestCallHierarchy(
         super().check_server_capability(cap)
         assert cap.call_hierarchy_provider
 
-    async def _request_call_hierarchy_prepare(
+    async def request_prepare_call_hierarchy(
         self, params: lsp_type.CallHierarchyPrepareParams
     ) -> lsp_type.CallHierarchyPrepareResult:
+        """`textDocument/prepareCallHierarchy`; the document must already be open."""
         return await self.request(
             lsp_type.CallHierarchyPrepareRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.CallHierarchyPrepareResponse,
         )
 
-    async def _request_call_hierarchy_incoming_calls(
+    async def request_call_hierarchy_item_incoming_calls(
         self, params: lsp_type.CallHierarchyIncomingCallsParams
     ) -> lsp_type.CallHierarchyIncomingCallsResult:
+        """`callHierarchy/incomingCalls` of a prepared item."""
         return await self.request(
             lsp_type.CallHierarchyIncomingCallsRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.CallHierarchyIncomingCallsResponse,
         )
 
-    async def _request_call_hierarchy_outgoing_calls(
+    async def request_call_hierarchy_item_outgoing_calls(
         self, params: lsp_type.CallHierarchyOutgoingCallsParams
     ) -> lsp_type.CallHierarchyOutgoingCallsResult:
+        """`callHierarchy/outgoingCalls` of a prepared item."""
         return await self.request(
             lsp_type.CallHierarchyOutgoingCallsRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.CallHierarchyOutgoingCallsResponse,
@@ -84,7 +87,7 @@ class WithRequestCallHierarchy(
         self, file_path: AnyPath, position: Position
     ) -> Sequence[lsp_type.CallHierarchyItem] | None:
         async with self.open_files(file_path):
-            return await self._request_call_hierarchy_prepare(
+            return await self.request_prepare_call_hierarchy(
                 lsp_type.CallHierarchyPrepareParams(
                     text_document=lsp_type.TextDocumentIdentifier(
                         uri=self.as_uri(file_path)
@@ -102,7 +105,7 @@ class WithRequestCallHierarchy(
         """
 
         async with self.open_files(file_path):
-            prepared = await self._request_call_hierarchy_prepare(
+            prepared = await self.request_prepare_call_hierarchy(
                 lsp_type.CallHierarchyPrepareParams(
                     text_document=lsp_type.TextDocumentIdentifier(
                         uri=self.as_uri(file_path)
@@ -117,7 +120,7 @@ class WithRequestCallHierarchy(
             calls: list[lsp_type.CallHierarchyIncomingCall] = []
 
             async def request(item: lsp_type.CallHierarchyItem) -> None:
-                if resp := await self._request_call_hierarchy_incoming_calls(
+                if resp := await self.request_call_hierarchy_item_incoming_calls(
                     lsp_type.CallHierarchyIncomingCallsParams(item=item)
                 ):
                     calls.extend(resp)
@@ -139,7 +142,7 @@ class WithRequestCallHierarchy(
         """
 
         async with self.open_files(file_path):
-            prepared = await self._request_call_hierarchy_prepare(
+            prepared = await self.request_prepare_call_hierarchy(
                 lsp_type.CallHierarchyPrepareParams(
                     text_document=lsp_type.TextDocumentIdentifier(
                         uri=self.as_uri(file_path)
@@ -154,7 +157,7 @@ class WithRequestCallHierarchy(
             calls: list[lsp_type.CallHierarchyOutgoingCall] = []
 
             async def append_calls(item: lsp_type.CallHierarchyItem) -> None:
-                if resp := await self._request_call_hierarchy_outgoing_calls(
+                if resp := await self.request_call_hierarchy_item_outgoing_calls(
                     lsp_type.CallHierarchyOutgoingCallsParams(item=item)
                 ):
                     calls.extend(resp)
@@ -4,7 +4,7 @@ from collections.abc import Iterator, Sequence
 from typing import Protocol, override, runtime_checkable
 
 from lsp_client.capability.request.workspace_edit import WithApplyWorkspaceEdit
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import TextDocumentCapabilityProtocol
 from lsp_client.utils.types import AnyPath, Range, lsp_type
 
@@ -60,7 +60,7 @@ class WithRequestCodeAction(
     ) -> lsp_type.CodeActionResult:
         return await self.request(
             lsp_type.CodeActionRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.CodeActionResponse,
@@ -71,7 +71,7 @@ class WithRequestCodeAction(
     ) -> lsp_type.CodeAction:
         return await self.request(
             lsp_type.CodeActionResolveRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.CodeActionResolveResponse,
@@ -5,7 +5,7 @@ from typing import Protocol, override, runtime_checkable
 
 import asyncer
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import CapabilityClientProtocol, TextDocumentCapabilityProtocol
 from lsp_client.utils.type_guard import is_completion_items
 from lsp_client.utils.types import AnyPath, Position, lsp_type
@@ -58,7 +58,7 @@ class WithRequestCompletion(
     ) -> lsp_type.CompletionResult:
         return await self.request(
             lsp_type.CompletionRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.CompletionResponse,
@@ -69,7 +69,7 @@ class WithRequestCompletion(
     ) -> lsp_type.CompletionItem:
         return await self.request(
             lsp_type.CompletionResolveRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.CompletionResolveResponse,
@@ -5,7 +5,7 @@ from typing import Protocol, override, runtime_checkable
 
 from loguru import logger
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import CapabilityClientProtocol, TextDocumentCapabilityProtocol
 from lsp_client.utils.type_guard import is_document_symbols, is_symbol_information_seq
 from lsp_client.utils.types import AnyPath, lsp_type
@@ -56,7 +56,7 @@ class WithRequestDocumentSymbol(
     ) -> lsp_type.DocumentSymbolResult | None:
         return await self.request(
             lsp_type.DocumentSymbolRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.DocumentSymbolResponse,
@@ -3,7 +3,7 @@ from __future__ import annotations
 from collections.abc import Iterator
 from typing import Any, Protocol, override, runtime_checkable
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import CapabilityClientProtocol, WorkspaceCapabilityProtocol
 from lsp_client.utils.types import lsp_type
 
@@ -43,7 +43,7 @@ class WithRequestExecuteCommand(
     ) -> Any:  # noqa: ANN401
         return await self.request(
             lsp_type.ExecuteCommandRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.ExecuteCommandResponse,
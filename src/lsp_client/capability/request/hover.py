@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator, Sequence
+from contextlib import AbstractAsyncContextManager
 from typing import Protocol, override, runtime_checkable
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import CapabilityClientProtocol, TextDocumentCapabilityProtocol
+from lsp_client.utils.batch import (
+    DEFAULT_MAX_CONCURRENCY,
+    gather_at_positions,
+    stream_at_positions,
+)
 from lsp_client.utils.types import AnyPath, Position, lsp_type
 
 
@@ -48,7 +54,7 @@ class WithRequestHover(
     ) -> lsp_type.HoverResult:
         return await self.request(
             lsp_type.HoverRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.HoverResponse,
@@ -67,30 +73,76 @@ class WithRequestHover(
                 )
             )
 
-        if hover is None:
-            return None
-
-        def to_block(item: str | lsp_type.MarkedStringWithLanguage) -> str:
-            match item:
-                case lsp_type.MarkedStringWithLanguage(
-                    language=str() as lang, value=str() as val
-                ):
-                    return f"```{lang}\n{val}\n```"
-                case str() as s:
-                    return f"```plaintext\n{s}\n```"
-                case _:
-                    raise ValueError(f"Unsupported hover content type: {item!r}")
-
-        match hover.contents:
-            case lsp_type.MarkupContent() as mc:
-                return mc
-            case lsp_type.MarkedStringWithLanguage() | str() as content:
-                return lsp_type.MarkupContent(
-                    kind=lsp_type.MarkupKind.Markdown,
-                    value=to_block(content),
-                )
-            case contents:
-                return lsp_type.MarkupContent(
-                    kind=lsp_type.MarkupKind.Markdown,
-                    value="\n\n".join(to_block(content) for content in contents),
-                )
+        return _markup_content(hover)
+
+    async def request_hovers(
+        self,
+        file_path: AnyPath,
+        positions: Sequence[Position],
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> list[lsp_type.MarkupContent | None]:
+        """The hovers at several positions of a file; see `gather_at_positions`."""
+        return await gather_at_positions(
+            self,
+            file_path,
+            positions,
+            self._request_hover_at,
+            max_concurrency=max_concurrency,
+        )
+
+    def stream_hovers(
+        self,
+        file_path: AnyPath,
+        positions: Sequence[Position],
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> AbstractAsyncContextManager[
+        AsyncIterator[tuple[int, Position, lsp_type.MarkupContent | None]]
+    ]:
+        """The hovers at several positions, as they arrive; see `stream_at_positions`."""
+        return stream_at_positions(
+            self,
+            file_path,
+            positions,
+            self._request_hover_at,
+            max_concurrency=max_concurrency,
+        )
+
+    async def _request_hover_at(
+        self, text_document: lsp_type.TextDocumentIdentifier, position: Position
+    ) -> lsp_type.MarkupContent | None:
+        hover = await self._request_hover(
+            lsp_type.HoverParams(text_document=text_document, position=position)
+        )
+        return _markup_content(hover)
+
+
+def _markup_content(hover: lsp_type.Hover | None) -> lsp_type.MarkupContent | None:
+    if hover is None:
+        return None
+
+    def to_block(item: str | lsp_type.MarkedStringWithLanguage) -> str:
+        match item:
+            case lsp_type.MarkedStringWithLanguage(
+                language=str() as lang, value=str() as val
+            ):
+                return f"```{lang}\n{val}\n```"
+            case str() as s:
+                return f"```plaintext\n{s}\n```"
+            case _:
+                raise ValueError(f"Unsupported hover content type: {item!r}")
+
+    match hover.contents:
+        case lsp_type.MarkupContent() as mc:
+            return mc
+        case lsp_type.MarkedStringWithLanguage() | str() as content:
+            return lsp_type.MarkupContent(
+                kind=lsp_type.MarkupKind.Markdown,
+                value=to_block(content),
+            )
+        case contents:
+            return lsp_type.MarkupContent(
+                kind=lsp_type.MarkupKind.Markdown,
+                value="\n\n".join(to_block(content) for content in contents),
+            )
@@ -5,7 +5,7 @@ from typing import Protocol, override, runtime_checkable
 
 import asyncer
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import CapabilityClientProtocol, TextDocumentCapabilityProtocol
 from lsp_client.utils.types import AnyPath, Range, lsp_type
 
@@ -72,7 +72,7 @@ class WithRequestInlayHint(
     ) -> lsp_type.InlayHintResult:
         return await self.request(
             lsp_type.InlayHintRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.InlayHintResponse,
@@ -83,7 +83,7 @@ class WithRequestInlayHint(
     ) -> lsp_type.InlayHint:
         return await self.request(
             lsp_type.InlayHintResolveRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.InlayHintResolveResponse,
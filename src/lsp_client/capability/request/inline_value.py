@@ -3,7 +3,7 @@ from __future__ import annotations
 from collections.abc import Iterator, Sequence
 from typing import Protocol, override, runtime_checkable
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import CapabilityClientProtocol, TextDocumentCapabilityProtocol
 from lsp_client.utils.types import AnyPath, Range, lsp_type
 
@@ -43,7 +43,7 @@ class WithRequestInlineValue(
     ) -> lsp_type.InlineValueResult:
         return await self.request(
             lsp_type.InlineValueRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.InlineValueResponse,
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
-from collections.abc import Iterator, Sequence
+from collections.abc import AsyncGenerator, AsyncIterator, Iterator, Sequence
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from functools import partial
 from typing import Protocol, override, runtime_checkable
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.convert import value_deserialize
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import CapabilityClientProtocol, TextDocumentCapabilityProtocol
+from lsp_client.utils.batch import (
+    DEFAULT_MAX_CONCURRENCY,
+    gather_at_positions,
+    stream_at_positions,
+)
 from lsp_client.utils.types import AnyPath, Position, lsp_type
 
 
@@ -39,14 +47,15 @@ class WithRequestReferences(
         assert cap.references_provider
 
     async def _request_references(
-        self, params: lsp_type.ReferenceParams
+        self, params: lsp_type.ReferenceParams, *, lazy: bool = False
     ) -> lsp_type.ReferencesResult:
         return await self.request(
             lsp_type.ReferencesRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.ReferencesResponse,
+            lazy=lazy,
         )
 
     async def request_references(
@@ -55,6 +64,7 @@ class WithRequestReferences(
         position: Position,
         *,
         include_declaration: bool = True,
+        lazy: bool = False,
     ) -> Sequence[lsp_type.Location] | None:
         async with self.open_files(file_path):
             return await self._request_references(
@@ -66,5 +76,120 @@ class WithRequestReferences(
                         uri=self.as_uri(file_path)
                     ),
                     position=position,
+                ),
+                lazy=lazy,
+            )
+
+    async def request_references_at(
+        self,
+        file_path: AnyPath,
+        positions: Sequence[Position],
+        *,
+        include_declaration: bool = True,
+        lazy: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> list[Sequence[lsp_type.Location] | None]:
+        """The references at several positions of a file; see `gather_at_positions`."""
+        return await gather_at_positions(
+            self,
+            file_path,
+            positions,
+            partial(
+                self._request_references_at,
+                include_declaration=include_declaration,
+                lazy=lazy,
+            ),
+            max_concurrency=max_concurrency,
+        )
+
+    def stream_references_at(
+        self,
+        file_path: AnyPath,
+        positions: Sequence[Position],
+        *,
+        include_declaration: bool = True,
+        lazy: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> AbstractAsyncContextManager[
+        AsyncIterator[tuple[int, Position, Sequence[lsp_type.Location] | None]]
+    ]:
+        """
+        The references at several positions, as they arrive; see `stream_at_positions`.
+
+        Unlike `stream_references`, each item is the whole result at a position.
+        """
+        return stream_at_positions(
+            self,
+            file_path,
+            positions,
+            partial(
+                self._request_references_at,
+                include_declaration=include_declaration,
+                lazy=lazy,
+            ),
+            max_concurrency=max_concurrency,
+        )
+
+    async def _request_references_at(
+        self,
+        text_document: lsp_type.TextDocumentIdentifier,
+        position: Position,
+        *,
+        include_declaration: bool,
+        lazy: bool,
+    ) -> Sequence[lsp_type.Location] | None:
+        return await self._request_references(
+            lsp_type.ReferenceParams(
+                context=lsp_type.ReferenceContext(
+                    include_declaration=include_declaration
+                ),
+                text_document=text_document,
+                position=position,
+            ),
+            lazy=lazy,
+        )
+
+    @asynccontextmanager
+    async def stream_references(
+        self,
+        file_path: AnyPath,
+        position: Position,
+        *,
+        include_declaration: bool = True,
+    ) -> AsyncGenerator[AsyncIterator[lsp_type.Location]]:
+        """
+        Stream references as the server reports partial results.
+
+        Example:
+            async with client.stream_references(path, position) as references:
+                async for location in references:
+                    ...
+        """
+
+        async def send_request(
+            token: lsp_type.ProgressToken,
+        ) -> lsp_type.ReferencesResult:
+            return await self._request_references(
+                lsp_type.ReferenceParams(
+                    context=lsp_type.ReferenceContext(
+                        include_declaration=include_declaration
+                    ),
+                    text_document=lsp_type.TextDocumentIdentifier(
+                        uri=self.as_uri(file_path)
+                    ),
+                    position=position,
+                    partial_result_token=token,
                 )
             )
+
+        async with (
+            self.open_files(file_path),
+            self.get_progress_dispatcher().partial_results(
+                send_request,
+                partial_items=lambda value: value_deserialize(
+                    value, Sequence[lsp_type.Location]
+                ),
+                result_items=lambda result: result or (),
+            ) as references,
+        ):
+            yield references
@@ -3,7 +3,7 @@ from __future__ import annotations
 from collections.abc import Iterator
 from typing import Protocol, override, runtime_checkable
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import TextDocumentCapabilityProtocol
 from lsp_client.utils.types import AnyPath, Position, lsp_type
 
@@ -51,7 +51,7 @@ class WithRequestRename(
     ) -> lsp_type.PrepareRenameResult | None:
         return await self.request(
             lsp_type.PrepareRenameRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.PrepareRenameResponse,
@@ -62,7 +62,7 @@ class WithRequestRename(
     ) -> lsp_type.RenameResult | None:
         return await self.request(
             lsp_type.RenameRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.RenameResponse,
@@ -5,7 +5,7 @@ from typing import Protocol, override, runtime_checkable
 
 import attrs
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import CapabilityClientProtocol, TextDocumentCapabilityProtocol
 from lsp_client.utils.types import AnyPath, Position, lsp_type
 
@@ -57,7 +57,7 @@ class WithRequestSignatureHelp(
     ) -> lsp_type.SignatureHelpResult:
         return await self.request(
             lsp_type.SignatureHelpRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.SignatureHelpResponse,
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
-from collections.abc import Iterator, Sequence
+from collections.abc import AsyncIterator, Iterator, Sequence
+from contextlib import AbstractAsyncContextManager
 from typing import Protocol, override, runtime_checkable
 
 from loguru import logger
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import CapabilityClientProtocol, TextDocumentCapabilityProtocol
+from lsp_client.utils.batch import (
+    DEFAULT_MAX_CONCURRENCY,
+    gather_at_positions,
+    stream_at_positions,
+)
 from lsp_client.utils.type_guard import is_location_links, is_locations
 from lsp_client.utils.types import AnyPath, Position, lsp_type
 from lsp_client.utils.warn import deprecated
@@ -49,7 +55,7 @@ class WithRequestTypeDefinition(
     ) -> lsp_type.TypeDefinitionResult:
         return await self.request(
             lsp_type.TypeDefinitionRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.TypeDefinitionResponse,
@@ -73,6 +79,49 @@ class WithRequestTypeDefinition(
                 )
             )
 
+    async def request_type_definitions(
+        self,
+        file_path: AnyPath,
+        positions: Sequence[Position],
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> list[lsp_type.TypeDefinitionResult]:
+        """The type definitions at several positions of a file; see `gather_at_positions`."""
+        return await gather_at_positions(
+            self,
+            file_path,
+            positions,
+            self._request_type_definition_at,
+            max_concurrency=max_concurrency,
+        )
+
+    def stream_type_definitions(
+        self,
+        file_path: AnyPath,
+        positions: Sequence[Position],
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> AbstractAsyncContextManager[
+        AsyncIterator[tuple[int, Position, lsp_type.TypeDefinitionResult]]
+    ]:
+        """The type definitions at several positions, as they arrive; see `stream_at_positions`."""
+        return stream_at_positions(
+            self,
+            file_path,
+            positions,
+            self._request_type_definition_at,
+            max_concurrency=max_concurrency,
+        )
+
+    async def _request_type_definition_at(
+        self, text_document: lsp_type.TextDocumentIdentifier, position: Position
+    ) -> lsp_type.TypeDefinitionResult:
+        return await self._request_type_definition(
+            lsp_type.TypeDefinitionParams(
+                text_document=text_document, position=position
+            )
+        )
+
     @deprecated(
         "Prefer using 'request_type_definition_links' for LocationLink support."
     )
@@ -5,7 +5,7 @@ from typing import Protocol, override, runtime_checkable
 
 import asyncer
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import CapabilityClientProtocol, TextDocumentCapabilityProtocol
 from lsp_client.utils.types import AnyPath, Position, lsp_type
 
@@ -44,34 +44,37 @@ class WithRequestTypeHierarchy(
         super().check_server_capability(cap)
         assert cap.type_hierarchy_provider
 
-    async def _request_type_hierarchy_prepare(
+    async def request_prepare_type_hierarchy(
         self, params: lsp_type.TypeHierarchyPrepareParams
     ) -> lsp_type.TypeHierarchyPrepareResult:
+        """`textDocument/prepareTypeHierarchy`; the document must already be open."""
         return await self.request(
             lsp_type.TypeHierarchyPrepareRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.TypeHierarchyPrepareResponse,
         )
 
-    async def _request_type_hierarchy_supertypes(
+    async def request_type_hierarchy_item_supertypes(
         self, params: lsp_type.TypeHierarchySupertypesParams
     ) -> lsp_type.TypeHierarchySupertypesResult:
+        """`typeHierarchy/supertypes` of a prepared item."""
         return await self.request(
             lsp_type.TypeHierarchySupertypesRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.TypeHierarchySupertypesResponse,
         )
 
-    async def _request_type_hierarchy_subtypes(
+    async def request_type_hierarchy_item_subtypes(
         self, params: lsp_type.TypeHierarchySubtypesParams
     ) -> lsp_type.TypeHierarchySubtypesResult:
+        """`typeHierarchy/subtypes` of a prepared item."""
         return await self.request(
             lsp_type.TypeHierarchySubtypesRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.TypeHierarchySubtypesResponse,
@@ -81,7 +84,7 @@ class WithRequestTypeHierarchy(
         self, file_path: AnyPath, position: Position
     ) -> Sequence[lsp_type.TypeHierarchyItem] | None:
         async with self.open_files(file_path):
-            return await self._request_type_hierarchy_prepare(
+            return await self.request_prepare_type_hierarchy(
                 lsp_type.TypeHierarchyPrepareParams(
                     text_document=lsp_type.TextDocumentIdentifier(
                         uri=self.as_uri(file_path)
@@ -94,7 +97,7 @@ class WithRequestTypeHierarchy(
         self, file_path: AnyPath, position: Position
     ) -> list[lsp_type.TypeHierarchyItem] | None:
         async with self.open_files(file_path):
-            prepared = await self._request_type_hierarchy_prepare(
+            prepared = await self.request_prepare_type_hierarchy(
                 lsp_type.TypeHierarchyPrepareParams(
                     text_document=lsp_type.TextDocumentIdentifier(
                         uri=self.as_uri(file_path)
@@ -109,7 +112,7 @@ class WithRequestTypeHierarchy(
             items: list[lsp_type.TypeHierarchyItem] = []
 
             async def append_items(item: lsp_type.TypeHierarchyItem) -> None:
-                if resp := await self._request_type_hierarchy_supertypes(
+                if resp := await self.request_type_hierarchy_item_supertypes(
                     lsp_type.TypeHierarchySupertypesParams(item=item)
                 ):
                     items.extend(resp)
@@ -126,7 +129,7 @@ class WithRequestTypeHierarchy(
         self, file_path: AnyPath, position: Position
     ) -> list[lsp_type.TypeHierarchyItem] | None:
         async with self.open_files(file_path):
-            prepared = await self._request_type_hierarchy_prepare(
+            prepared = await self.request_prepare_type_hierarchy(
                 lsp_type.TypeHierarchyPrepareParams(
                     text_document=lsp_type.TextDocumentIdentifier(
                         uri=self.as_uri(file_path)
@@ -141,7 +144,7 @@ class WithRequestTypeHierarchy(
             items: list[lsp_type.TypeHierarchyItem] = []
 
             async def append_items(item: lsp_type.TypeHierarchyItem) -> None:
-                if resp := await self._request_type_hierarchy_subtypes(
+                if resp := await self.request_type_hierarchy_item_subtypes(
                     lsp_type.TypeHierarchySubtypesParams(item=item)
                 ):
                     items.extend(resp)
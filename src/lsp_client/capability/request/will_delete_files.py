@@ -3,7 +3,7 @@ from __future__ import annotations
 from collections.abc import Iterator
 from typing import Protocol, override, runtime_checkable
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import WorkspaceCapabilityProtocol
 from lsp_client.utils.types import lsp_type
 
@@ -49,7 +49,7 @@ class WithRequestWillDeleteFiles(
     ) -> lsp_type.WorkspaceEdit | None:
         return await self.request(
             lsp_type.WillDeleteFilesRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.WillDeleteFilesResponse,
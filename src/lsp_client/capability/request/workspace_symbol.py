@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from collections.abc import Iterator, Sequence
+from collections.abc import AsyncGenerator, AsyncIterator, Iterator, Sequence
+from contextlib import asynccontextmanager
 from typing import Protocol, override, runtime_checkable
 
 import asyncer
 from loguru import logger
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.convert import value_deserialize
+from lsp_client.jsonrpc.id import jsonrpc_id
+from lsp_client.jsonrpc.lazy import LazySequence
 from lsp_client.protocol import CapabilityClientProtocol, WorkspaceCapabilityProtocol
 from lsp_client.utils.type_guard import is_symbol_information_seq, is_workspace_symbols
 from lsp_client.utils.types import lsp_type
@@ -51,25 +54,57 @@ class WithRequestWorkspaceSymbol(
         assert cap.workspace_symbol_provider
 
     async def _request_workspace_symbol(
-        self, params: lsp_type.WorkspaceSymbolParams
+        self, params: lsp_type.WorkspaceSymbolParams, *, lazy: bool = False
     ) -> lsp_type.WorkspaceSymbolResult:
         return await self.request(
             lsp_type.WorkspaceSymbolRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.WorkspaceSymbolResponse,
+            lazy=lazy,
         )
 
     async def request_workspace_symbol(
-        self, query: str
+        self, query: str, *, lazy: bool = False
     ) -> (
         Sequence[lsp_type.SymbolInformation] | Sequence[lsp_type.WorkspaceSymbol] | None
     ):
         return await self._request_workspace_symbol(
-            lsp_type.WorkspaceSymbolParams(query=query)
+            lsp_type.WorkspaceSymbolParams(query=query), lazy=lazy
         )
 
+    @asynccontextmanager
+    async def stream_workspace_symbols(
+        self, query: str
+    ) -> AsyncGenerator[
+        AsyncIterator[lsp_type.SymbolInformation | lsp_type.WorkspaceSymbol]
+    ]:
+        """
+        Stream workspace symbols as the server reports partial results.
+
+        Example:
+            async with client.stream_workspace_symbols("Foo") as symbols:
+                async for symbol in symbols:
+                    ...
+        """
+
+        async def send_request(
+            token: lsp_type.ProgressToken,
+        ) -> lsp_type.WorkspaceSymbolResult:
+            return await self._request_workspace_symbol(
+                lsp_type.WorkspaceSymbolParams(query=query, partial_result_token=token)
+            )
+
+        async with self.get_progress_dispatcher().partial_results(
+            send_request,
+            partial_items=lambda value: (
+                value_deserialize(value, lsp_type.WorkspaceSymbolResult) or ()
+            ),
+            result_items=lambda result: result or (),
+        ) as symbols:
+            yield symbols
+
     @deprecated("Use 'request_workspace_symbol_list' instead.")
     async def request_workspace_symbol_information_list(
         self, query: str
@@ -89,15 +124,20 @@ class WithRequestWorkspaceSymbol(
                 return []
 
     async def request_workspace_symbol_list(
-        self, query: str, *, resolve: bool = False
+        self, query: str, *, resolve: bool = False, lazy: bool = False
     ) -> Sequence[lsp_type.WorkspaceSymbol]:
         """
         Request workspace symbols as a list of WorkspaceSymbol.
         Automatically converts SymbolInformation to WorkspaceSymbol if needed.
         Returns an empty list if no results are found.
+
+        With `lazy=True` and no `resolve`, WorkspaceSymbol results are returned as
+        a `LazySequence` instead of a list.
         """
-        match await self.request_workspace_symbol(query):
+        match await self.request_workspace_symbol(query, lazy=lazy):
             case result if is_workspace_symbols(result):
+                if isinstance(result, LazySequence) and not resolve:
+                    return result
                 res = list(result)
                 if resolve:
                     if isinstance(self, WithRequestWorkspaceSymbolResolve):
@@ -166,7 +206,7 @@ class WithRequestWorkspaceSymbolResolve(
     ) -> lsp_type.WorkspaceSymbol:
         return await self.request(
             lsp_type.WorkspaceSymbolResolveRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=lsp_type.WorkspaceSymbolResolveResponse,
@@ -9,6 +9,7 @@ from .inlay_hint_refresh import WithRespondInlayHintRefresh
 from .register_capability import WithRespondRegisterCapability
 from .show_document_request import WithRespondShowDocumentRequest
 from .show_message_request import WithRespondShowMessageRequest
+from .work_done_progress import WithRespondWorkDoneProgressCreate
 from .workspace_folders import WithRespondWorkspaceFoldersRequest
 
 capabilities: Final = (
@@ -20,6 +21,7 @@ capabilities: Final = (
     WithRespondRegisterCapability,
     WithRespondShowMessageRequest,
     WithRespondWorkspaceFoldersRequest,
+    WithRespondWorkDoneProgressCreate,
 )
 
 __all__ = [
@@ -29,6 +31,7 @@ __all__ = [
     "WithRespondRegisterCapability",
     "WithRespondShowDocumentRequest",
     "WithRespondShowMessageRequest",
+    "WithRespondWorkDoneProgressCreate",
     "WithRespondWorkspaceFoldersRequest",
     "WithWorkspaceDiagnostic",
     "capabilities",
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Protocol, override, runtime_checkable
+
+from loguru import logger
+
+from lsp_client.protocol import (
+    CapabilityClientProtocol,
+    ServerRequestHook,
+    ServerRequestHookProtocol,
+    ServerRequestHookRegistry,
+    WindowCapabilityProtocol,
+)
+from lsp_client.protocol.hook import ServerNotificationHook
+from lsp_client.utils.types import lsp_type
+
+
+@runtime_checkable
+class WithRespondWorkDoneProgressCreate(
+    WindowCapabilityProtocol,
+    ServerRequestHookProtocol,
+    CapabilityClientProtocol,
+    Protocol,
+):
+    """
+    Server initiated work done progress, used to track whether the server is busy.
+
+    - `window/workDoneProgress/create` - https://microsoft.github.io/language-server-protocol/specifications/lsp/3.17/specification/#window_workDoneProgress_create
+    - `$/progress` - https://microsoft.github.io/language-server-protocol/specifications/lsp/3.17/specification/#progress
+    """
+
+    @override
+    @classmethod
+    def iter_methods(cls) -> Iterator[str]:
+        yield from super().iter_methods()
+        yield lsp_type.WINDOW_WORK_DONE_PROGRESS_CREATE
+        yield lsp_type.PROGRESS
+
+    @override
+    @classmethod
+    def register_window_capability(cls, cap: lsp_type.WindowClientCapabilities) -> None:
+        super().register_window_capability(cap)
+        cap.work_done_progress = True
+
+    @override
+    @classmethod
+    def check_server_capability(cls, cap: lsp_type.ServerCapabilities) -> None:
+        super().check_server_capability(cap)
+
+    async def respond_work_done_progress_create(
+        self, req: lsp_type.WorkDoneProgressCreateRequest
+    ) -> lsp_type.WorkDoneProgressCreateResponse:
+        # the token counts as active until its `end` is reported
+        self.get_progress_dispatcher().work_done.begin(req.params.token)
+        return lsp_type.WorkDoneProgressCreateResponse(id=req.id, result=None)
+
+    async def receive_progress(self, noti: lsp_type.ProgressNotification) -> None:
+        token, value = noti.params.token, noti.params.value
+        work_done = self.get_progress_dispatcher().work_done
+
+        match value:
+            case {"kind": "begin", **rest}:
+                logger.debug("Work done progress {} begin: {}", token, rest)
+                work_done.begin(token, rest.get("title"))
+            case {"kind": "end", **rest}:
+                logger.debug("Work done progress {} end: {}", token, rest)
+                work_done.end(token)
+            case {"kind": "report"}:
+                pass
+            case _:
+                logger.debug("Unhandled progress {}: {}", token, value)
+
+    @override
+    def register_server_request_hooks(
+        self, registry: ServerRequestHookRegistry
+    ) -> None:
+        super().register_server_request_hooks(registry)
+        registry.register(
+            lsp_type.WINDOW_WORK_DONE_PROGRESS_CREATE,
+            ServerRequestHook(
+                cls=lsp_type.WorkDoneProgressCreateRequest,
+                execute=self.respond_work_done_progress_create,
+            ),
+        )
+        registry.register(
+            lsp_type.PROGRESS,
+            ServerNotificationHook(
+                cls=lsp_type.ProgressNotification,
+                execute=self.receive_progress,
+            ),
+        )
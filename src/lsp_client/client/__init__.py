@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from .abc import Client
 from .exception import ClientError, ClientRuntimeError
+from .overlay import Overlay
 
 __all__ = [
     "Client",
     "ClientError",
     "ClientRuntimeError",
+    "Overlay",
 ]
@@ -2,16 +2,16 @@ from __future__ import annotations
 
 import os
 from abc import ABC, abstractmethod
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Iterable, Mapping, Sequence
 from contextlib import asynccontextmanager, suppress
-from functools import cached_property
+from functools import cached_property, partial
 from pathlib import Path
 from typing import Any, Literal, Self, override
 
 import anyio
 import asyncer
 from anyio import AsyncContextManagerMixin
-from attrs import define, field
+from attrs import Factory, define, field
 from loguru import logger
 
 from lsp_client.capability.build import (
@@ -19,9 +19,20 @@ from lsp_client.capability.build import (
     build_server_request_hooks,
 )
 from lsp_client.capability.notification import WithNotifyTextDocumentSynchronize
-from lsp_client.capability.server_request import WithRespondRegisterCapability
-from lsp_client.client.document_state import DocumentStateManager
+from lsp_client.capability.server_request import (
+    WithRespondRegisterCapability,
+    WithRespondWorkDoneProgressCreate,
+)
+from lsp_client.client.cache import ResponseCache, notified_uris
+from lsp_client.client.coalesce import RequestCoalescer, RequestKey, request_key
+from lsp_client.client.document_state import (
+    DEFAULT_MAX_WARM_BYTES,
+    DocumentStateManager,
+)
 from lsp_client.client.exception import ClientRuntimeError
+from lsp_client.client.overlay import Overlay
+from lsp_client.client.store import ResultStore, content_hash, store_key
+from lsp_client.jsonrpc.codec import JsonCodec
 from lsp_client.jsonrpc.convert import (
     notification_serialize,
     request_deserialize,
@@ -29,13 +40,28 @@ from lsp_client.jsonrpc.convert import (
     response_deserialize,
     response_serialize,
 )
-from lsp_client.protocol import CapabilityClientProtocol, CapabilityProtocol
+from lsp_client.jsonrpc.lazy import lazy_response_deserialize
+from lsp_client.jsonrpc.types import RawRequest, RawResponsePackage
+from lsp_client.protocol import (
+    CapabilityClientProtocol,
+    CapabilityProtocol,
+    GeneralCapabilityProtocol,
+)
 from lsp_client.server import DefaultServers, ServerRuntimeError
-from lsp_client.server.abc import Server
+from lsp_client.server.abc import Server, StreamServer
 from lsp_client.server.types import ServerRequest
 from lsp_client.settings import settings
 from lsp_client.utils.channel import Receiver, channel
 from lsp_client.utils.config import ConfigurationMap
+from lsp_client.utils.fs import awrite_text_atomic
+from lsp_client.utils.line_index import (
+    DEFAULT_POSITION_ENCODING,
+    SUPPORTED_POSITION_ENCODINGS,
+    LineIndex,
+    PositionEncoding,
+)
+from lsp_client.utils.progress import ProgressDispatcher
+from lsp_client.utils.text_diff import diff_content_changes
 from lsp_client.utils.types import AnyPath, Notification, Request, Response, lsp_type
 from lsp_client.utils.workspace import (
     WORKSPACE_ROOT_DIR,
@@ -51,6 +77,10 @@ class Client(
     # text sync support is mandatory
     WithNotifyTextDocumentSynchronize,
     WithRespondRegisterCapability,
+    # server readiness tracking, see `wait_until_idle`
+    WithRespondWorkDoneProgressCreate,
+    # negotiates the position encoding, see `register_general_capability`
+    GeneralCapabilityProtocol,
     CapabilityClientProtocol,
     AsyncContextManagerMixin,
     ABC,
@@ -74,6 +104,13 @@ class Client(
         sync_file: Whether to sync file contents with the server
         request_timeout: Timeout in seconds for JSON-RPC requests
         initialization_options: Custom initialization options for the server
+        json_codec: JSON codec used on the wire (defaults to `LSP_CLIENT_JSON_CODEC`)
+        coalesce_requests: Whether identical concurrent read-only requests share
+            one server round-trip
+        response_cache: Opt-in cache of read-only responses
+        result_store: Opt-in on-disk store of structural results
+        max_warm_documents: Number of unused documents kept open on the server
+        max_warm_bytes: Maximum total encoded size of the unused documents kept open
     """
 
     _server_arg: Server | Literal["container", "local"] | None = field(
@@ -93,9 +130,45 @@ class Client(
     initialization_options: dict[str, Any] = field(factory=dict)
     """Custom initialization options for the server."""
 
+    json_codec: JsonCodec | None = None
+    """JSON codec for the wire layer. Overrides the codec of stream-based servers."""
+
+    coalesce_requests: bool = True
+    """Whether identical concurrent read-only requests share one server round-trip."""
+
+    response_cache: ResponseCache | None = None
+    """Opt-in cache of read-only responses, e.g. `ResponseCache(max_bytes=...)`."""
+
+    result_store: ResultStore | None = None
+    """Opt-in on-disk store of structural results, reused across sessions."""
+
+    max_warm_documents: int = 0
+    """Number of unused documents kept open on the server (disabled by default)."""
+
+    max_warm_bytes: int = DEFAULT_MAX_WARM_BYTES
+    """Maximum total size of the unused documents kept open on the server."""
+
     _server: Server = field(init=False)
-    _doc: DocumentStateManager = field(factory=DocumentStateManager, init=False)
+    _doc: DocumentStateManager = field(
+        default=Factory(
+            lambda self: DocumentStateManager(
+                max_warm_documents=self.max_warm_documents,
+                max_warm_bytes=self.max_warm_bytes,
+            ),
+            takes_self=True,
+        ),
+        init=False,
+    )
     _config: ConfigurationMap = field(factory=ConfigurationMap, init=False)
+    _progress: ProgressDispatcher = field(factory=ProgressDispatcher, init=False)
+    _coalescer: RequestCoalescer = field(factory=RequestCoalescer, init=False)
+    _server_info: lsp_type.ServerInfo | None = field(default=None, init=False)
+    _server_capabilities: lsp_type.ServerCapabilities | None = field(
+        default=None, init=False
+    )
+    _position_encoding: PositionEncoding = field(
+        default=DEFAULT_POSITION_ENCODING, init=False
+    )
 
     @cached_property
     def _workspace(self) -> Workspace:
@@ -139,6 +212,10 @@ class Client(
             errors: list[ServerRuntimeError] = []
             async for candidate in self._iter_candidate_servers():
                 logger.debug("Attempting to start server: {}", type(candidate))
+                if isinstance(candidate, StreamServer):
+                    candidate.progress = self._progress
+                    if self.json_codec:
+                        candidate.codec = self.json_codec
                 try:
                     async with candidate.run(self._workspace, sender=sender) as server:
                         logger.info("Successfully started server: {}", type(server))
@@ -164,9 +241,42 @@ class Client(
     def get_config_map(self) -> ConfigurationMap:
         return self._config
 
+    @override
+    def get_progress_dispatcher(self) -> ProgressDispatcher:
+        return self._progress
+
+    @override
+    def get_position_encoding(self) -> PositionEncoding:
+        return self._position_encoding
+
+    @override
+    @classmethod
+    def register_general_capability(
+        cls, cap: lsp_type.GeneralClientCapabilities
+    ) -> None:
+        super().register_general_capability(cap)
+        cap.position_encodings = list(SUPPORTED_POSITION_ENCODINGS)
+
     def get_server(self) -> Server:
         return self._server
 
+    async def wait_until_idle(
+        self, *, timeout: float | None = None, quiet_period: float = 0.1
+    ) -> None:
+        """
+        Wait until the server has finished its background work, e.g. indexing.
+
+        The server is considered busy while it reports work done progress, or a
+        server-specific busy status. Since a server may start its work shortly after
+        `initialized`, the server must stay idle for `quiet_period` seconds.
+
+        Raises:
+            TimeoutError: If the server is still busy after `timeout` seconds.
+        """
+
+        with anyio.fail_after(timeout):
+            await self._progress.work_done.wait_until_idle(quiet_period)
+
     @classmethod
     @abstractmethod
     def create_default_servers(cls) -> DefaultServers:
@@ -193,6 +303,18 @@ class Client(
             yield
             return
 
+        # warm documents are still open: sync the ones changed on disk meanwhile
+        for uri, old_index in (await self._doc.refresh_warm(file_uris)).items():
+            content = self._doc.get_content(uri)
+            version = self._doc.get_version(uri)
+            assert content is not None and version is not None
+            self.invalidate_cached_responses([uri])
+            await self.notify_text_document_changed(
+                file_path=from_local_uri(uri),
+                content_changes=self._content_changes(old_index, content),
+                version=version,
+            )
+
         new_docs = await self._doc.open(file_uris)
         async with asyncer.create_task_group() as tg:
             for uri, state in new_docs.items():
@@ -227,7 +349,9 @@ class Client(
     async def write_file(self, uri: str, content: str) -> None:
         """Write text content to a file and automatically sync document state.
 
-        This method writes the content to disk and automatically handles:
+        This method writes the content to disk (through a temporary file renamed
+        over the target, so the server never reads a partial file) and
+        automatically handles:
         - Updating in-memory document state (for tracked files)
         - Incrementing document version
         - Sending didChange notification to LSP server
@@ -262,26 +386,176 @@ class Client(
                 await client.write_file(client.as_uri("example.py"), new_content)
         """
 
-        path = from_local_uri(uri)
+        if self._doc.overlay_active:
+            await self._write_to_overlay(uri, content)
+            return
+
+        await self._write_to_disk(uri, content)
+        await self._sync_written({uri: content})
+
+    @override
+    async def write_files(
+        self, contents: Mapping[str, str], *, max_concurrency: int = 16
+    ) -> None:
+        """Write several files concurrently and sync their document state.
+
+        At most `max_concurrency` files are written at a time. The didChange
+        notifications are sent together once every file is written.
+
+        Raises:
+            OSError: The first error, if writing some of the files failed. The
+                other files are still written and synced.
+        """
+
+        if self._doc.overlay_active:
+            for uri, content in contents.items():
+                await self._write_to_overlay(uri, content)
+            return
+
+        errors = await self._write_all_to_disk(contents, max_concurrency)
+        # keep the state of the written files in sync, even if others failed
+        await self._sync_written(
+            {uri: content for uri, content in contents.items() if uri not in errors}
+        )
+        if errors:
+            raise next(iter(errors.values()))
+
+    async def _write_all_to_disk(
+        self, contents: Mapping[str, str], max_concurrency: int
+    ) -> dict[str, OSError]:
+        """Write files concurrently, returning the errors by URI."""
+
+        limiter = anyio.CapacityLimiter(max_concurrency)
+        errors: dict[str, OSError] = {}
+
+        async def write(uri: str, content: str) -> None:
+            async with limiter:
+                try:
+                    await self._write_to_disk(uri, content)
+                except OSError as e:
+                    errors[uri] = e
+
+        async with asyncer.create_task_group() as tg:
+            for uri, content in contents.items():
+                tg.soonify(write)(uri, content)
+        return errors
+
+    async def _write_to_disk(self, uri: str, content: str) -> None:
         encoding = self._doc.get_encoding(uri, default="utf-8")
-        await anyio.Path(path).write_text(content, encoding=encoding)
+        await awrite_text_atomic(from_local_uri(uri), content, encoding=encoding)
+
+    async def _sync_written(self, contents: Mapping[str, str]) -> None:
+        self.invalidate_cached_responses(contents)
+
+        changed: list[
+            tuple[str, int, Sequence[lsp_type.TextDocumentContentChangeEvent]]
+        ] = []
+        for uri, content in contents.items():
+            old_index = self._doc.get_line_index(uri)
+            if (new_version := self._doc.update_content(uri, content)) is not None:
+                changed.append(
+                    (uri, new_version, self._content_changes(old_index, content))
+                )
+
+        for uri, version, content_changes in changed:
+            await self.notify_text_document_changed(
+                file_path=self.from_uri(uri, relative=False),
+                content_changes=content_changes,
+                version=version,
+            )
 
-        if (new_version := self._doc.update_content(uri, content)) is not None:
-            file_path = self.from_uri(uri, relative=False)
+    @asynccontextmanager
+    async def overlay(self) -> AsyncGenerator[Overlay]:
+        """Keep file changes in memory while the context is active.
+
+        In overlay mode, `write_file`, `write_files` and workspace edits update
+        the documents in memory and sync them to the server with didOpen and
+        didChange, without touching the disk. `read_file` returns the changed
+        content. Call `Overlay.commit` to write the changes to disk, or
+        `Overlay.discard` to revert them; changes left when the context exits
+        are discarded.
+
+        Examples
+        --------
+        ::
+
+            async with client.overlay() as overlay:
+                edit = await client.request_rename_edits("a.py", position, "new")
+                await client.apply_workspace_edit(edit)
+                ...  # inspect the result, e.g. request diagnostics
+                await overlay.discard()
+        """
+
+        self._doc.begin_overlay()
+        try:
+            yield Overlay(self)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self.discard_overlay()
+                self._doc.end_overlay()
+
+    async def _write_to_overlay(self, uri: str, content: str) -> None:
+        self.invalidate_cached_responses([uri])
+        old_index = self._doc.get_line_index(uri)
+        version, opened = self._doc.overlay_update(uri, content)
+        file_path = self.from_uri(uri, relative=False)
+        if opened:
+            await self.notify_text_document_opened(
+                file_path=file_path, file_content=content
+            )
+        else:
             await self.notify_text_document_changed(
                 file_path=file_path,
-                content_changes=[
-                    lsp_type.TextDocumentContentChangeWholeDocument(text=content)
-                ],
-                version=new_version,
+                content_changes=self._content_changes(old_index, content),
+                version=version,
             )
 
+    async def commit_overlay(self, *, max_concurrency: int = 16) -> None:
+        """Write the documents changed in overlay mode to disk, see `Overlay.commit`."""
+
+        changed = self._doc.take_overlay()
+        contents = {
+            uri: content
+            for uri in changed
+            if (content := self._doc.get_content(uri)) is not None
+        }
+        errors = await self._write_all_to_disk(contents, max_concurrency)
+        self.invalidate_cached_responses(changed)
+        await self._release_overlay(changed)
+        if errors:
+            raise next(iter(errors.values()))
+
+    async def discard_overlay(self) -> None:
+        """Revert the documents changed in overlay mode, see `Overlay.discard`."""
+
+        changed = self._doc.take_overlay()
+        self.invalidate_cached_responses(changed)
+        for uri in await self._release_overlay(changed):
+            # still open elsewhere: revert the server to the content before the overlay
+            if (original := changed[uri]) is not None:
+                content = original.content
+            else:
+                path = from_local_uri(uri)
+                encoding = self._doc.get_encoding(uri, default="utf-8")
+                content = await anyio.Path(path).read_text(encoding=encoding)
+            await self._sync_written({uri: content})
+
+    async def _release_overlay(self, uris: Iterable[str]) -> list[str]:
+        """Drop the references held by the overlay, returning the documents left open."""
+
+        uris = list(uris)
+        closed_uris = self._doc.close(uris)
+        for uri in closed_uris:
+            await self.notify_text_document_closed(from_local_uri(uri))
+        return [uri for uri in uris if uri not in closed_uris]
+
     @override
     @asynccontextmanager
     @logger.catch(reraise=True)
     async def __asynccontextmanager__(self) -> AsyncGenerator[Self]:
         async with (
             asyncer.create_task_group() as tg,
+            self._coalescer.run(),
             self.run_server() as (server, receiver),
         ):
             self._server = server
@@ -323,6 +597,8 @@ class Client(
                 await self.get_server().wait_requests_completed(
                     timeout=self.request_timeout
                 )
+                for uri in self._doc.close_warm():
+                    await self.notify_text_document_closed(from_local_uri(uri))
                 _ = await self._shutdown()
                 await self._exit()
 
@@ -334,6 +610,7 @@ class Client(
 
         async with (
             asyncer.create_task_group() as tg,
+            self._coalescer.run(),
             self.run_server() as (server, receiver),
         ):
             self._server = server
@@ -346,15 +623,137 @@ class Client(
         self,
         req: Request,
         schema: type[Response[R]],
+        *,
+        lazy: bool = False,
     ) -> R:
-        req = request_serialize(req)
+        raw_req = request_serialize(req)
+        deserialize = lazy_response_deserialize if lazy else response_deserialize
         with anyio.fail_after(self.request_timeout):
-            raw_resp = await self.get_server().request(req)
-            return response_deserialize(raw_resp, schema)
+            raw_resp = await self._request_cached(raw_req, _document_uri(raw_req))
+            return deserialize(raw_resp, schema)
+
+    def _text_document_sync_kind(self) -> lsp_type.TextDocumentSyncKind:
+        match self._server_capabilities:
+            case lsp_type.ServerCapabilities(
+                text_document_sync=lsp_type.TextDocumentSyncKind() as kind
+            ):
+                return kind
+            case lsp_type.ServerCapabilities(
+                text_document_sync=lsp_type.TextDocumentSyncOptions(
+                    change=lsp_type.TextDocumentSyncKind() as kind
+                )
+            ):
+                return kind
+            case _:
+                return lsp_type.TextDocumentSyncKind.Full
+
+    def _content_changes(
+        self, old_index: LineIndex | None, new_content: str
+    ) -> Sequence[lsp_type.TextDocumentContentChangeEvent]:
+        """Incremental changes if the server supports them, else the whole content."""
+
+        if (
+            old_index is not None
+            and self._text_document_sync_kind()
+            == lsp_type.TextDocumentSyncKind.Incremental
+        ):
+            return diff_content_changes(old_index, new_content, self._position_encoding)
+        return [lsp_type.TextDocumentContentChangeWholeDocument(text=new_content)]
+
+    async def _request_cached(
+        self, raw_req: RawRequest, uri: str | None
+    ) -> RawResponsePackage:
+        """Answer from the response cache if possible, then from the result store."""
+
+        if (
+            (cache := self.response_cache) is None
+            or uri is None
+            or (key := self._cache_key(cache, raw_req, uri)) is None
+        ):
+            return await self._request_stored(raw_req, uri)
+        if (raw_resp := cache.get(key)) is None:
+            raw_resp = await self._request_stored(raw_req, uri)
+            cache.put(key, uri, raw_resp)
+        return raw_resp
+
+    async def _request_stored(
+        self, raw_req: RawRequest, uri: str | None
+    ) -> RawResponsePackage:
+        if (
+            (store := self.result_store) is None
+            or uri is None
+            or (key := await self._store_key(store, raw_req, uri)) is None
+        ):
+            return await self._send_request(raw_req, uri)
+        if (raw_resp := await store.get(key)) is None:
+            raw_resp = await self._send_request(raw_req, uri)
+            await store.put(key, raw_resp)
+        return raw_resp
+
+    async def _send_request(
+        self, raw_req: RawRequest, uri: str | None
+    ) -> RawResponsePackage:
+        key = (
+            request_key(raw_req, self._doc.get_version(uri) if uri else None)
+            if self.coalesce_requests
+            else None
+        )
+        return await self._coalescer.request(
+            key, partial(self.get_server().request, raw_req)
+        )
+
+    def _cache_key(
+        self, cache: ResponseCache, raw_req: RawRequest, uri: str
+    ) -> RequestKey | None:
+        # keyed by content rather than version: versions restart at 0 when a
+        # document is reopened, possibly after it changed on disk
+        if (digest := self._doc.get_content_hash(uri)) is not None:
+            return request_key(raw_req, ("content", digest), cache.methods)
+        try:
+            # a cheap syscall, not worth a worker thread
+            stat = from_local_uri(uri).stat()
+        except (OSError, ValueError):
+            return None
+        return request_key(
+            raw_req, ("mtime", stat.st_mtime_ns, stat.st_size), cache.methods
+        )
+
+    async def _store_key(
+        self, store: ResultStore, raw_req: RawRequest, uri: str
+    ) -> str | None:
+        if (
+            raw_req["method"] not in store.methods
+            or (info := self._server_info) is None
+        ):
+            # without the server version, results of an upgraded server may be stale
+            return None
+        if (content := self._doc.get_content(uri)) is None:
+            try:
+                content = await anyio.Path(from_local_uri(uri)).read_bytes()
+            except (OSError, ValueError):
+                return None
+        if (req_key := request_key(raw_req, None, store.methods)) is None:
+            return None
+        method, params, _ = req_key
+        return store_key(
+            f"{type(self).__module__}.{type(self).__qualname__}",
+            f"{info.name}@{info.version}",
+            self._workspace.id,
+            method,
+            params,
+            content_hash(content),
+        )
+
+    @override
+    def invalidate_cached_responses(self, uris: Iterable[str]) -> None:
+        if self.response_cache is not None:
+            self.response_cache.invalidate(uris)
 
     @override
     async def notify(self, msg: Notification) -> None:
         noti = notification_serialize(msg)
+        if self.response_cache is not None and (uris := notified_uris(noti)):
+            self.response_cache.invalidate(uris)
         with anyio.fail_after(self.request_timeout):
             await self.get_server().notify(noti)
 
@@ -387,6 +786,21 @@ class Client(
 
         async with asyncer.create_task_group() as tg:
             async for req in receiver:
+                # for servers not routing progress themselves (see
+                # `StreamServer.progress`), dispatch subscribed values inline
+                match req:
+                    case {
+                        "method": "$/progress",
+                        "params": {"token": str() | int() as token, "value": value},
+                    } if self._progress.dispatch(token, value):
+                        continue
+                    case ({"method": str(method)}, _) if (
+                        self.response_cache is not None
+                        and method.startswith("workspace/")
+                        and method.endswith("/refresh")
+                    ):
+                        # e.g. `workspace/inlayHint/refresh`: all results may change
+                        self.response_cache.clear()
                 tg.soonify(dispatch)(req)
 
     async def _initialize(self, params: lsp_type.InitializeParams) -> None:
@@ -394,8 +808,11 @@ class Client(
             lsp_type.InitializeRequest(id="initialize", params=params),
             schema=lsp_type.InitializeResponse,
         )
-        server_capabilities = result.capabilities
-        server_info = result.server_info
+        server_capabilities = self._server_capabilities = result.capabilities
+        self._position_encoding = (
+            server_capabilities.position_encoding or DEFAULT_POSITION_ENCODING
+        )
+        server_info = self._server_info = result.server_info
 
         if __debug__:
             # ensure the server version is compatible with the client
@@ -429,3 +846,11 @@ class Client(
         """
 
         await self.notify(lsp_type.ExitNotification())
+
+
+def _document_uri(raw_req: RawRequest) -> str | None:
+    match raw_req.get("params"):
+        case {"textDocument": {"uri": str(uri)}}:
+            return uri
+        case _:
+            return None
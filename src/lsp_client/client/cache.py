@@ -0,0 +1,192 @@
+"""Bounded cache of raw responses to read-only requests."""
+
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any, Final, cast
+
+from attrs import define, field
+
+from lsp_client.jsonrpc.types import RawNotification, RawResponsePackage
+from lsp_client.utils.types import lsp_type
+
+CACHED_METHODS: Final[frozenset[str]] = frozenset(
+    {
+        lsp_type.TEXT_DOCUMENT_DEFINITION,
+        lsp_type.TEXT_DOCUMENT_DOCUMENT_SYMBOL,
+        lsp_type.TEXT_DOCUMENT_FOLDING_RANGE,
+        lsp_type.TEXT_DOCUMENT_HOVER,
+        lsp_type.TEXT_DOCUMENT_INLAY_HINT,
+    }
+)
+"""Methods cached by default."""
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+SIZE_SAMPLE = 16
+"""Items of a list result encoded by `json_size`."""
+
+
+def json_size(response: RawResponsePackage) -> int:
+    """
+    Approximate memory cost of a response: the size of its JSON encoding.
+
+    Only the first `SIZE_SAMPLE` items of a longer list result are encoded, and
+    their size is extrapolated to the whole list.
+    """
+
+    result = cast(Any, response).get("result")
+    if isinstance(result, list) and len(result) > SIZE_SAMPLE:
+        sample = json.dumps(result[:SIZE_SAMPLE], separators=(",", ":"))
+        return len(sample) * len(result) // SIZE_SAMPLE
+    return len(json.dumps(response, separators=(",", ":")))
+
+
+def notified_uris(noti: RawNotification) -> list[str]:
+    """URIs of documents whose content a client notification reports as changed."""
+
+    match cast(Any, noti):
+        case {
+            "method": "textDocument/didChange" | "textDocument/didSave",
+            "params": {"textDocument": {"uri": str(uri)}},
+        }:
+            return [uri]
+        case {
+            "method": "workspace/didCreateFiles" | "workspace/didDeleteFiles",
+            "params": {"files": files},
+        }:
+            return [file["uri"] for file in files]
+        case {"method": "workspace/didRenameFiles", "params": {"files": files}}:
+            return [uri for file in files for uri in (file["oldUri"], file["newUri"])]
+        case {
+            "method": "workspace/didChangeWatchedFiles",
+            "params": {"changes": changes},
+        }:
+            return [change["uri"] for change in changes]
+        case _:
+            return []
+
+
+@define
+class CacheStats:
+    """Counters of a `ResponseCache`."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    """Entries dropped to stay within the entry or byte budget."""
+    invalidations: int = 0
+    """Entries dropped because their document changed or the server asked to refresh."""
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@define
+class _Entry:
+    uri: str
+    response: RawResponsePackage
+    size: int
+
+
+@define
+class ResponseCache:
+    """
+    LRU cache of raw responses, bounded by entry count and approximate bytes.
+
+    Entries are keyed by the request and the state of the requested document
+    (the content hash of an open document, or the modification time and size of
+    the file on disk), so an edit never yields a stale entry. Entries are additionally dropped
+    by `invalidate` when a document is written, renamed or deleted, and by `clear`
+    when the server requests a refresh.
+
+    Note that results referring to other documents (e.g. a definition in another
+    file) are only invalidated when the requested document changes.
+    """
+
+    max_entries: int = DEFAULT_MAX_ENTRIES
+    max_bytes: int = DEFAULT_MAX_BYTES
+    methods: frozenset[str] = CACHED_METHODS
+    sizeof: Callable[[RawResponsePackage], int] = json_size
+
+    stats: CacheStats = field(factory=CacheStats, init=False)
+
+    _entries: OrderedDict[Hashable, _Entry] = field(factory=OrderedDict, init=False)
+    _by_uri: dict[str, set[Hashable]] = field(factory=dict, init=False)
+    _bytes: int = field(default=0, init=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of all cached responses."""
+        return self._bytes
+
+    def get(self, key: Hashable) -> RawResponsePackage | None:
+        if (entry := self._entries.get(key)) is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry.response
+
+    def put(self, key: Hashable, uri: str, response: RawResponsePackage) -> None:
+        """
+        Cache a successful response.
+
+        Errors, oversized responses and `null` results (e.g. from a server still
+        indexing the workspace) are skipped.
+        """
+
+        if cast(Any, response).get("result") is None:
+            return
+        if (size := self.sizeof(response)) > self.max_bytes:
+            return
+
+        self._discard(key)
+        self._entries[key] = _Entry(uri, response, size)
+        self._by_uri.setdefault(uri, set()).add(key)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self.stats.evictions += 1
+
+    def invalidate(self, uris: Iterable[str]) -> int:
+        """Drop the entries of `uris`, or of documents below them for directories.
+
+        Returns:
+            The number of dropped entries.
+        """
+
+        dropped = 0
+        for uri in uris:
+            prefix = uri.rstrip("/") + "/"
+            for cached in [u for u in self._by_uri if u == uri or u.startswith(prefix)]:
+                for key in self._by_uri.pop(cached):
+                    self._discard(key)
+                    dropped += 1
+        self.stats.invalidations += dropped
+        return dropped
+
+    def clear(self) -> None:
+        self.stats.invalidations += len(self._entries)
+        self._entries.clear()
+        self._by_uri.clear()
+        self._bytes = 0
+
+    def _discard(self, key: Hashable) -> None:
+        if (entry := self._entries.pop(key, None)) is None:
+            return
+        self._bytes -= entry.size
+        if (keys := self._by_uri.get(entry.uri)) is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_uri[entry.uri]
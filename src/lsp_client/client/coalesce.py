@@ -0,0 +1,160 @@
+"""Share one server round-trip among identical concurrent requests."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncGenerator, Awaitable, Callable, Hashable
+from contextlib import asynccontextmanager
+from typing import Final, Self
+
+import anyio
+import anyio.abc
+from attrs import define, field
+
+from lsp_client.jsonrpc.exception import JsonRpcTransportError
+from lsp_client.jsonrpc.types import RawRequest, RawResponsePackage
+from lsp_client.utils.types import lsp_type
+
+COALESCED_METHODS: Final[frozenset[str]] = frozenset(
+    {
+        lsp_type.TEXT_DOCUMENT_DECLARATION,
+        lsp_type.TEXT_DOCUMENT_DEFINITION,
+        lsp_type.TEXT_DOCUMENT_DOCUMENT_HIGHLIGHT,
+        lsp_type.TEXT_DOCUMENT_DOCUMENT_SYMBOL,
+        lsp_type.TEXT_DOCUMENT_FOLDING_RANGE,
+        lsp_type.TEXT_DOCUMENT_HOVER,
+        lsp_type.TEXT_DOCUMENT_IMPLEMENTATION,
+        lsp_type.TEXT_DOCUMENT_INLAY_HINT,
+        lsp_type.TEXT_DOCUMENT_PREPARE_CALL_HIERARCHY,
+        lsp_type.TEXT_DOCUMENT_PREPARE_TYPE_HIERARCHY,
+        lsp_type.TEXT_DOCUMENT_REFERENCES,
+        lsp_type.TEXT_DOCUMENT_SIGNATURE_HELP,
+        lsp_type.TEXT_DOCUMENT_TYPE_DEFINITION,
+    }
+)
+"""Read-only methods whose identical concurrent requests share one response."""
+
+_PROGRESS_KEYS: Final = ("workDoneToken", "partialResultToken")
+
+type RequestKey = tuple[str, str, Hashable]
+
+
+def request_key(
+    raw_req: RawRequest,
+    state: Hashable,
+    methods: frozenset[str] = COALESCED_METHODS,
+) -> RequestKey | None:
+    """Key of a request for coalescing or caching, or `None` if it must be sent.
+
+    `state` identifies the state of the requested document, e.g. its version.
+    Requests reporting progress are never shared, since progress is routed by a
+    token owned by a single caller.
+    """
+
+    method = raw_req["method"]
+    if method not in methods:
+        return None
+    params = raw_req.get("params") or {}
+    if any(key in params for key in _PROGRESS_KEYS):
+        return None
+    return method, json.dumps(params, sort_keys=True, separators=(",", ":")), state
+
+
+@define
+class CoalesceStats:
+    """Counters of a `RequestCoalescer`."""
+
+    sent: int = 0
+    """Requests sent to the server."""
+    shared: int = 0
+    """Requests answered by a round-trip already in flight."""
+
+
+@define
+class _Flight:
+    done: anyio.Event = field(factory=anyio.Event)
+    waiters: int = 0
+    scope: anyio.CancelScope = field(factory=anyio.CancelScope)
+    response: RawResponsePackage | None = None
+    error: BaseException | None = None
+
+
+@define
+class RequestCoalescer:
+    """
+    Deduplicate identical in-flight requests.
+
+    The first request for a key is sent from a task of `task_group`; later
+    requests with the same key wait for its response. The request is cancelled
+    only when all of its waiters have given up, so a waiter timing out does not
+    affect the others.
+
+    Outside of `run` (i.e. the client is not running), every request is sent on
+    its own.
+    """
+
+    task_group: anyio.abc.TaskGroup | None = None
+    stats: CoalesceStats = field(factory=CoalesceStats, init=False)
+
+    _flights: dict[Hashable, _Flight] = field(factory=dict, init=False)
+
+    async def request(
+        self,
+        key: Hashable | None,
+        send: Callable[[], Awaitable[RawResponsePackage]],
+    ) -> RawResponsePackage:
+        if key is None or self.task_group is None:
+            self.stats.sent += 1
+            return await send()
+
+        if (flight := self._flights.get(key)) is None:
+            flight = self._flights[key] = _Flight()
+            self.stats.sent += 1
+            self.task_group.start_soon(self._fly, key, flight, send)
+        else:
+            self.stats.shared += 1
+
+        flight.waiters += 1
+        try:
+            await flight.done.wait()
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.done.is_set():
+                # the last waiter is gone: nobody needs the response anymore
+                flight.scope.cancel()
+                self._forget(key, flight)
+
+        if flight.response is None:
+            raise flight.error or JsonRpcTransportError("Coalesced request abandoned")
+        return flight.response
+
+    @asynccontextmanager
+    async def run(self) -> AsyncGenerator[Self]:
+        """Coalesce requests while the context is active."""
+
+        async with anyio.create_task_group() as tg:
+            self.task_group = tg
+            try:
+                yield self
+            finally:
+                self.task_group = None
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def _fly(
+        self,
+        key: Hashable,
+        flight: _Flight,
+        send: Callable[[], Awaitable[RawResponsePackage]],
+    ) -> None:
+        try:
+            with flight.scope:
+                flight.response = await send()
+        except Exception as e:  # noqa: BLE001
+            # raised to every waiter instead of crashing the task group
+            flight.error = e
+        finally:
+            self._forget(key, flight)
+            flight.done.set()
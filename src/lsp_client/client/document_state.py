@@ -1,15 +1,55 @@
 from __future__ import annotations
 
-from collections import Counter
+import codecs
+import os
+from collections import Counter, OrderedDict
 from collections.abc import Iterable
+from contextlib import suppress
+from functools import cached_property
+from typing import Final
 
-import anyio
+import anyio.to_thread
 import asyncer
 from attrs import Factory, define, frozen
 from charset_normalizer import from_bytes
 
+from lsp_client.client.store import content_hash
+from lsp_client.utils.fs import FileStamp, file_stamp
+from lsp_client.utils.line_index import LineIndex
 from lsp_client.utils.workspace import from_local_uri
 
+_UTF8_ENCODINGS: Final = ("utf-8", "utf-8-sig")
+_READ_BATCH_SIZE: Final = 32
+
+DEFAULT_MAX_WARM_BYTES: Final = 32 * 1024 * 1024
+
+
+def decode_content(content: bytes) -> tuple[str, str]:
+    """
+    Decode the content of a source file.
+
+    Source files are almost always ASCII or UTF-8, so a strict UTF-8 decode is
+    tried first; charset detection, which is orders of magnitude slower, only
+    runs if it fails.
+
+    Returns:
+        The decoded text and its encoding.
+
+    Raises:
+        ValueError: If the encoding cannot be detected.
+    """
+
+    if content.isascii():
+        return content.decode("ascii"), "utf-8"
+    # keep the byte order mark when writing the document back
+    encoding = "utf-8-sig" if content.startswith(codecs.BOM_UTF8) else "utf-8"
+    with suppress(UnicodeDecodeError):
+        return content.decode(encoding), encoding
+
+    if best_match := from_bytes(content).best():
+        return str(best_match), best_match.encoding
+    raise ValueError("charset detection failed")
+
 
 @frozen
 class DocumentState:
@@ -26,6 +66,16 @@ class DocumentState:
     version: int
     encoding: str = "utf-8"
 
+    @cached_property
+    def line_index(self) -> LineIndex:
+        """Line starts of `content`, built on first use."""
+        return LineIndex.from_text(self.content)
+
+    @cached_property
+    def content_hash(self) -> str:
+        """Hash of `content`, computed on first use."""
+        return content_hash(self.content)
+
 
 @define
 class DocumentStateManager:
@@ -35,13 +85,36 @@ class DocumentStateManager:
     Tracks URI -> DocumentState mapping for version increments and content updates.
     Also handles file buffering and reference counting for open files.
 
+    Documents are closed when their reference count reaches zero, unless
+    `max_warm_documents` is set: they then stay open in a warm set, so that
+    sequential requests on the same file do not reopen it every time. The least
+    recently used warm documents are closed once the warm set exceeds
+    `max_warm_documents` or `max_warm_bytes`.
+
     Attributes:
+        max_warm_documents: Maximum number of unused documents kept open
+        max_warm_bytes: Maximum total encoded size of the unused documents kept open
         _states: Maps document URI to its current state
         _ref_counts: Tracks how many times each document is open
+        _warm: Unused open documents, least recently used first, with the stamp
+            of their file when they became unused, and the encoded size of their
+            content
+        _encodings: Detected encodings by URI, with the stamp of the file they
+            were detected for
+        _overlay: Documents changed in overlay mode, mapped to their state before
+            the first change (None if the overlay opened them), or None outside of
+            overlay mode
     """
 
+    max_warm_documents: int = 0
+    max_warm_bytes: int = DEFAULT_MAX_WARM_BYTES
+
     _states: dict[str, DocumentState] = Factory(dict)
     _ref_counts: Counter[str] = Factory(Counter)
+    _warm: OrderedDict[str, tuple[FileStamp | None, int]] = Factory(OrderedDict)
+    _warm_bytes: int = 0
+    _overlay: dict[str, DocumentState | None] | None = None
+    _encodings: dict[str, tuple[FileStamp, str]] = Factory(dict)
 
     async def open(self, uris: Iterable[str]) -> dict[str, DocumentState]:
         """
@@ -60,36 +133,91 @@ class DocumentStateManager:
 
         # Track reference counts for all requested URIs
         self._ref_counts.update(uris)
+        for uri in uris:
+            self._unwarm(uri)
 
         if not new_uris:
             return {}
 
         new_states: dict[str, DocumentState] = {}
 
-        async def read_file(uri: str) -> None:
-            path = from_local_uri(uri)
-            content_bytes = await anyio.Path(path).read_bytes()
-            if best_match := from_bytes(content_bytes).best():
-                content = str(best_match)
-                encoding = best_match.encoding
-            else:
-                raise ValueError(
-                    f"Unable to decode file content for {uri}: charset detection failed"
-                )
-
-            new_states[uri] = DocumentState(content, version=0, encoding=encoding)
+        def read_files(batch: list[str]) -> None:
+            for uri in batch:
+                new_states[uri] = self._read(uri)
 
+        # one worker thread per batch: a thread hop costs more than reading and
+        # decoding a typical source file
         async with asyncer.create_task_group() as tg:
-            for uri in new_uris:
-                tg.soonify(read_file)(uri)
+            for i in range(0, len(new_uris), _READ_BATCH_SIZE):
+                batch = new_uris[i : i + _READ_BATCH_SIZE]
+                tg.soonify(anyio.to_thread.run_sync)(read_files, batch)
 
         self._states.update(new_states)
         return new_states
 
+    def _read(self, uri: str) -> DocumentState:
+        """Read and decode a file, in a worker thread."""
+
+        with from_local_uri(uri).open("rb") as f:
+            stat = os.fstat(f.fileno())
+            content_bytes = f.read()
+
+        file_key: FileStamp = (stat.st_mtime_ns, stat.st_size)
+        if (cached := self._encodings.get(uri)) is not None and cached[0] == file_key:
+            with suppress(UnicodeDecodeError, LookupError):
+                return DocumentState(content_bytes.decode(cached[1]), 0, cached[1])
+
+        try:
+            content, encoding = decode_content(content_bytes)
+        except ValueError as e:
+            raise ValueError(f"Unable to decode file content for {uri}: {e}") from e
+        if encoding not in _UTF8_ENCODINGS:
+            # detected by charset_normalizer, too slow to run again on the same file
+            self._encodings[uri] = (file_key, encoding)
+        return DocumentState(content, version=0, encoding=encoding)
+
+    async def refresh_warm(self, uris: Iterable[str]) -> dict[str, LineIndex]:
+        """
+        Reload warm documents whose file changed on disk since they became unused.
+
+        Args:
+            uris: URIs of the documents about to be opened
+
+        Returns:
+            The line index of the previous content of each reloaded document, by
+            URI. The new content is available from the state manager.
+        """
+        warm = {uri: self._warm[uri][0] for uri in uris if uri in self._warm}
+        if not warm:
+            return {}
+
+        def reload() -> dict[str, DocumentState]:
+            reloaded: dict[str, DocumentState] = {}
+            for uri, stamp in warm.items():
+                try:
+                    if stamp is not None and file_stamp(from_local_uri(uri)) == stamp:
+                        continue
+                    reloaded[uri] = self._read(uri)
+                except (OSError, ValueError):
+                    # the document stays open with its current content
+                    continue
+            return reloaded
+
+        changed: dict[str, LineIndex] = {}
+        for uri, new_state in (await anyio.to_thread.run_sync(reload)).items():
+            state = self._states.get(uri)
+            if state is not None and state.content != new_state.content:
+                changed[uri] = state.line_index
+                self.update_content(uri, new_state.content)
+        return changed
+
     def close(self, uris: Iterable[str]) -> list[str]:
         """
         Close files. Return URIs of files that are really closed (ref count reaches 0).
 
+        Unused documents are kept open in the warm set if it is enabled; the
+        returned URIs then include the warm documents evicted from it.
+
         Args:
             uris: List of file URIs to close
 
@@ -104,12 +232,57 @@ class DocumentStateManager:
             if self._ref_counts[uri] <= 0:
                 # Ensure we don't keep negative counts or zero counts for long
                 del self._ref_counts[uri]
-                if uri in self._states:
+                if uri not in self._states or uri in self._warm:
+                    continue
+                if self.max_warm_documents > 0:
+                    self._warm_up(uri)
+                else:
                     del self._states[uri]
                     closed_uris.append(uri)
 
+        closed_uris.extend(self._evict_warm())
+        return closed_uris
+
+    def close_warm(self) -> list[str]:
+        """
+        Close all warm documents, e.g. before shutting the server down.
+
+        Returns:
+            List of URIs that were removed from the state manager.
+        """
+        closed_uris = list(self._warm)
+        for uri in closed_uris:
+            self._unwarm(uri)
+            del self._states[uri]
         return closed_uris
 
+    def _warm_up(self, uri: str) -> None:
+        try:
+            stamp = file_stamp(from_local_uri(uri))
+        except ValueError:
+            stamp = None
+        state = self._states[uri]
+        # the limit is in bytes, as the document is held by the server as well
+        size = len(state.content.encode(state.encoding, "replace"))
+        self._warm[uri] = (stamp, size)
+        self._warm_bytes += size
+
+    def _unwarm(self, uri: str) -> None:
+        if (entry := self._warm.pop(uri, None)) is not None:
+            self._warm_bytes -= entry[1]
+
+    def _evict_warm(self) -> list[str]:
+        evicted: list[str] = []
+        while self._warm and (
+            len(self._warm) > self.max_warm_documents
+            or self._warm_bytes > self.max_warm_bytes
+        ):
+            uri = next(iter(self._warm))
+            self._unwarm(uri)
+            del self._states[uri]
+            evicted.append(uri)
+        return evicted
+
     def register(
         self, uri: str, content: str, version: int = 0, encoding: str = "utf-8"
     ) -> DocumentState | None:
@@ -144,6 +317,7 @@ class DocumentStateManager:
             The removed DocumentState, or None if the URI was not registered.
         """
         if uri in self._states:
+            self._unwarm(uri)
             state = self._states.pop(uri)
             # Force cleanup ref count
             if uri in self._ref_counts:
@@ -179,6 +353,37 @@ class DocumentStateManager:
             return state.content
         return None
 
+    def get_line_index(self, uri: str) -> LineIndex | None:
+        """
+        Get the line index of a document, for position <-> offset conversion.
+
+        Args:
+            uri: Document URI
+
+        Returns:
+            The line index of the current content, or None if not registered.
+        """
+        if state := self._states.get(uri):
+            return state.line_index
+        return None
+
+    def get_content_hash(self, uri: str) -> str | None:
+        """
+        Get the hash of the current content of a document.
+
+        Unlike the version, which restarts at 0 whenever a document is reopened,
+        the hash tells apart the contents of successive openings.
+
+        Args:
+            uri: Document URI
+
+        Returns:
+            The hash of the current content, or None if not registered.
+        """
+        if state := self._states.get(uri):
+            return state.content_hash
+        return None
+
     def get_encoding(self, uri: str, *, default: str = "utf-8") -> str:
         """
         Get current encoding of a document.
@@ -229,3 +434,83 @@ class DocumentStateManager:
             )
             return new_version
         return None
+
+    @property
+    def overlay_active(self) -> bool:
+        """Whether changes are kept in memory instead of written to disk."""
+        return self._overlay is not None
+
+    @property
+    def overlay_uris(self) -> list[str]:
+        """Documents changed in overlay mode since the overlay was last taken."""
+        return list(self._overlay or ())
+
+    def begin_overlay(self) -> None:
+        """
+        Enter overlay mode.
+
+        Raises:
+            RuntimeError: If overlay mode is already active.
+        """
+        if self._overlay is not None:
+            raise RuntimeError("Overlay mode is already active")
+        self._overlay = {}
+
+    def end_overlay(self) -> dict[str, DocumentState | None]:
+        """
+        Leave overlay mode.
+
+        Returns:
+            The documents changed since the last `take_overlay`, see `take_overlay`.
+        """
+        changed = self.take_overlay()
+        self._overlay = None
+        return changed
+
+    def take_overlay(self) -> dict[str, DocumentState | None]:
+        """
+        Reset the documents changed in overlay mode, staying in overlay mode.
+
+        The documents stay open: the caller is responsible for closing them once
+        it has written or reverted them.
+
+        Returns:
+            The changed documents mapped to their state before the first change,
+            or None for documents opened by the overlay.
+        """
+        if self._overlay is None:
+            return {}
+        changed, self._overlay = self._overlay, {}
+        return changed
+
+    def overlay_update(self, uri: str, content: str) -> tuple[int, bool]:
+        """
+        Update a document in overlay mode, opening it if needed.
+
+        The document is kept open until the overlay is taken, even if all the
+        other references to it are closed in between.
+
+        Args:
+            uri: Document URI
+            content: New document content
+
+        Returns:
+            The new version, and whether the document was opened by this call.
+
+        Raises:
+            RuntimeError: If overlay mode is not active.
+        """
+        if self._overlay is None:
+            raise RuntimeError("Overlay mode is not active")
+
+        if uri not in self._overlay:
+            state = self._overlay[uri] = self._states.get(uri)
+            if state is None:
+                self.register(uri, content)
+                return 0, True
+            self._ref_counts[uri] += 1
+            self._unwarm(uri)
+
+        version = self.update_content(uri, content)
+        assert version is not None
+        return version, False
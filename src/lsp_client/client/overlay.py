@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from attrs import frozen
+
+if TYPE_CHECKING:
+    from .abc import Client
+
+
+@frozen
+class Overlay:
+    """Handle of the overlay mode of a client, see `Client.overlay`."""
+
+    _client: Client
+
+    @property
+    def uris(self) -> list[str]:
+        """Documents changed since the overlay started or was last committed or discarded."""
+        return self._client.get_document_state().overlay_uris
+
+    async def commit(self, *, max_concurrency: int = 16) -> None:
+        """Write the changed documents to disk, staying in overlay mode.
+
+        Raises:
+            OSError: The first error, if writing some of the documents failed.
+        """
+        await self._client.commit_overlay(max_concurrency=max_concurrency)
+
+    async def discard(self) -> None:
+        """Revert the changed documents, in memory and on the server.
+
+        Documents opened by the overlay are closed, so the server reads them from
+        disk again.
+        """
+        await self._client.discard_overlay()
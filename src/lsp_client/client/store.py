@@ -0,0 +1,207 @@
+"""Persistent on-disk store of responses, shared across sessions.
+
+Responses are keyed by the content hash of the requested document instead of its
+version, so a later session over an unchanged file reuses them without starting
+a query on the server.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Final, Self
+
+import anyio.to_thread
+import xxhash
+from attrs import define, field
+
+from lsp_client.jsonrpc.types import RawResponsePackage
+from lsp_client.settings import settings
+from lsp_client.utils.types import lsp_type
+
+STORED_METHODS: Final[frozenset[str]] = frozenset(
+    {
+        lsp_type.TEXT_DOCUMENT_DOCUMENT_SYMBOL,
+        lsp_type.TEXT_DOCUMENT_FOLDING_RANGE,
+    }
+)
+"""
+Structural methods stored by default.
+
+Only methods whose result depends on the requested document alone are safe to key
+by its content hash; diagnostics also depend on the files it imports, so they are
+not stored unless requested through `ResultStore.methods`.
+"""
+
+DEFAULT_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+
+def default_cache_dir() -> Path:
+    """`LSP_CLIENT_CACHE_DIR`, or `lsp-client` in the user cache directory."""
+
+    if settings.cache_dir is not None:
+        return settings.cache_dir
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "lsp-client"
+
+
+def content_hash(content: str | bytes) -> str:
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return xxhash.xxh3_128_hexdigest(content)
+
+
+def store_key(*parts: str) -> str:
+    """Combine the parts of a key into a fixed-size digest."""
+    return xxhash.xxh3_128_hexdigest("\0".join(parts).encode("utf-8"))
+
+
+@define
+class StoreStats:
+    """Counters of a `ResultStore`."""
+
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+
+@define
+class ResultStore:
+    """
+    SQLite-backed store of raw responses with TTL and size-based eviction.
+
+    Keys are built by the client from the client class, the server name and
+    version, the workspace id, the request and the content hash of the requested
+    document (see `store_key`). Entries older than `ttl` seconds are ignored and
+    deleted; once the stored values exceed `max_bytes`, the least recently used
+    entries are evicted.
+
+    Database access runs in a worker thread. The store can be shared by several
+    clients; call `close` (or use it as a context manager) when done.
+    """
+
+    path: Path = field(factory=lambda: default_cache_dir() / "results.sqlite")
+    ttl: float = DEFAULT_TTL
+    max_bytes: int = DEFAULT_MAX_BYTES
+    methods: frozenset[str] = STORED_METHODS
+
+    stats: StoreStats = field(factory=StoreStats, init=False)
+
+    _conn: sqlite3.Connection | None = field(default=None, init=False)
+    _total: int = field(default=0, init=False)
+    """Size of the stored values, as seen by this process."""
+    _lock: threading.Lock = field(factory=threading.Lock, init=False)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @contextmanager
+    def _connect(self) -> Generator[sqlite3.Connection, None, None]:
+        with self._lock:
+            if self._conn is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(
+                    self.path, check_same_thread=False, isolation_level=None
+                )
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                [self._total] = conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM results"
+                ).fetchone()
+                self._conn = conn
+            yield self._conn
+
+    def get_sync(self, key: str) -> RawResponsePackage | None:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, size, created FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            value, size, created = row
+            if now - created > self.ttl:
+                conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._total -= size
+                self.stats.expired += 1
+                self.stats.misses += 1
+                return None
+            conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+            self.stats.hits += 1
+        return json.loads(value)
+
+    def put_sync(self, key: str, response: RawResponsePackage) -> None:
+        """Store a successful response. Errors and oversized responses are skipped."""
+
+        if "result" not in response:
+            return
+        value = json.dumps(response, separators=(",", ":")).encode("utf-8")
+        if len(value) > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._connect() as conn:
+            if row := conn.execute(
+                "SELECT size FROM results WHERE key = ?", (key,)
+            ).fetchone():
+                self._total -= row[0]
+            conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self._total += len(value)
+            if self._total > self.max_bytes:
+                self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM results WHERE created < ?", (now - self.ttl,))
+        # other processes may share the database: recount before evicting
+        [self._total] = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+
+        keys: list[str] = []
+        rows = conn.execute("SELECT key, size FROM results ORDER BY accessed")
+        for key, size in rows:
+            if self._total <= self.max_bytes:
+                break
+            keys.append(key)
+            self._total -= size
+        conn.executemany("DELETE FROM results WHERE key = ?", [(k,) for k in keys])
+        self.stats.evictions += len(keys)
+
+    async def get(self, key: str) -> RawResponsePackage | None:
+        """The stored response of `key`, or `None` if missing or expired."""
+        return await anyio.to_thread.run_sync(self.get_sync, key)
+
+    async def put(self, key: str, response: RawResponsePackage) -> None:
+        await anyio.to_thread.run_sync(self.put_sync, key, response)
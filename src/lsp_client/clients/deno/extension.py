@@ -5,7 +5,7 @@ from typing import Any, Protocol, override, runtime_checkable
 
 from loguru import logger
 
-from lsp_client.jsonrpc.id import jsonrpc_uuid
+from lsp_client.jsonrpc.id import jsonrpc_id
 from lsp_client.protocol import (
     CapabilityClientProtocol,
     CapabilityProtocol,
@@ -88,7 +88,7 @@ class WithRequestDenoCache(
     ) -> None:
         return await self.request(
             DenoCacheRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=DenoCacheParams(
                     referrer=lsp_type.TextDocumentIdentifier(uri=self.as_uri(referrer)),
                     uris=[
@@ -130,7 +130,7 @@ class WithRequestDenoPerformance(
 
     async def request_deno_performance(self) -> Any:  # noqa: ANN401
         return await self.request(
-            DenoPerformanceRequest(id=jsonrpc_uuid()),
+            DenoPerformanceRequest(id=jsonrpc_id()),
             schema=DenoPerformanceResponse,
         )
 
@@ -164,7 +164,7 @@ class WithRequestDenoReloadImportRegistries(
 
     async def request_deno_reload_import_registries(self) -> None:
         return await self.request(
-            DenoReloadImportRegistriesRequest(id=jsonrpc_uuid()),
+            DenoReloadImportRegistriesRequest(id=jsonrpc_id()),
             schema=DenoReloadImportRegistriesResponse,
         )
 
@@ -203,7 +203,7 @@ class WithRequestDenoVirtualTextDocument(
     ) -> str:
         return await self.request(
             DenoVirtualTextDocumentRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=DenoVirtualTextDocumentParams(
                     text_document=lsp_type.TextDocumentIdentifier(uri=uri)
                 ),
@@ -241,7 +241,7 @@ class WithRequestDenoTask(
 
     async def request_deno_task(self) -> list[Any]:
         return await self.request(
-            DenoTaskRequest(id=jsonrpc_uuid()),
+            DenoTaskRequest(id=jsonrpc_id()),
             schema=DenoTaskResponse,
         )
 
@@ -287,7 +287,7 @@ class WithRequestDenoTestRun(
     ) -> DenoTestRunResponseParams:
         return await self.request(
             DenoTestRunRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=params,
             ),
             schema=DenoTestRunResponse,
@@ -327,7 +327,7 @@ class WithRequestDenoTestRunCancel(
     ) -> None:
         return await self.request(
             DenoTestRunCancelRequest(
-                id=jsonrpc_uuid(),
+                id=jsonrpc_id(),
                 params=DenoTestRunCancelParams(id=test_run_id),
             ),
             schema=DenoTestRunCancelResponse,
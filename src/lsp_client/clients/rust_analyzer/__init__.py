@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from .client import (
+    RustAnalyzerClient,
+    RustAnalyzerContainerServer,
+    RustAnalyzerLocalServer,
+)
+
+__all__ = [
+    "RustAnalyzerClient",
+    "RustAnalyzerContainerServer",
+    "RustAnalyzerLocalServer",
+]
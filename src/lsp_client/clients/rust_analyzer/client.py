@@ -56,6 +56,8 @@ from lsp_client.server.container import ContainerServer
 from lsp_client.server.local import LocalServer
 from lsp_client.utils.types import lsp_type
 
+from .extension import WithReceiveRustAnalyzerServerStatus
+
 RustAnalyzerContainerServer = partial(
     ContainerServer, image="ghcr.io/lsp-client/rust-analyzer:latest"
 )
@@ -118,6 +120,7 @@ class RustAnalyzerClient(
     WithRespondShowDocumentRequest,
     WithRespondShowMessageRequest,
     WithRespondWorkspaceFoldersRequest,
+    WithReceiveRustAnalyzerServerStatus,
 ):
     """
     - Language: Rust
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any, Protocol, override, runtime_checkable
+
+from loguru import logger
+
+from lsp_client.protocol import (
+    CapabilityClientProtocol,
+    ExperimentalCapabilityProtocol,
+    ServerNotificationHook,
+    ServerRequestHookProtocol,
+    ServerRequestHookRegistry,
+)
+
+from .models import RUST_ANALYZER_SERVER_STATUS, RustAnalyzerServerStatusNotification
+
+
+@runtime_checkable
+class WithReceiveRustAnalyzerServerStatus(
+    ExperimentalCapabilityProtocol,
+    ServerRequestHookProtocol,
+    CapabilityClientProtocol,
+    Protocol,
+):
+    """
+    `experimental/serverStatus` - https://rust-analyzer.github.io/book/contributing/lsp-extensions.html#server-status
+
+    rust-analyzer reports workspace loading only partially through work done
+    progress, so its status is also used to tell when the server is busy.
+    """
+
+    @override
+    @classmethod
+    def iter_methods(cls) -> Iterator[str]:
+        yield from super().iter_methods()
+        yield from (RUST_ANALYZER_SERVER_STATUS,)
+
+    @override
+    @classmethod
+    def register_experimental_capability(cls, cap: dict[str, Any]) -> None:
+        super().register_experimental_capability(cap)
+        cap["serverStatusNotification"] = True
+
+    async def receive_rust_analyzer_server_status(
+        self, noti: RustAnalyzerServerStatusNotification
+    ) -> None:
+        params = noti.params
+        logger.debug(
+            "rust-analyzer status: health={}, quiescent={}, message={}",
+            params.health,
+            params.quiescent,
+            params.message,
+        )
+        self.get_progress_dispatcher().work_done.set_busy(
+            RUST_ANALYZER_SERVER_STATUS, not params.quiescent
+        )
+
+    @override
+    def register_server_request_hooks(
+        self, registry: ServerRequestHookRegistry
+    ) -> None:
+        super().register_server_request_hooks(registry)
+        registry.register(
+            RUST_ANALYZER_SERVER_STATUS,
+            ServerNotificationHook(
+                cls=RustAnalyzerServerStatusNotification,
+                execute=self.receive_rust_analyzer_server_status,
+            ),
+        )
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from attrs import define, resolve_types
+
+RUST_ANALYZER_SERVER_STATUS: Literal["experimental/serverStatus"] = (
+    "experimental/serverStatus"
+)
+
+
+@define
+class RustAnalyzerServerStatusParams:
+    """
+    https://rust-analyzer.github.io/book/contributing/lsp-extensions.html#server-status
+    """
+
+    health: Literal["ok", "warning", "error"]
+    quiescent: bool
+    """Whether the server has finished loading and analyzing the workspace."""
+    message: str | None = None
+
+
+@define
+class RustAnalyzerServerStatusNotification:
+    params: RustAnalyzerServerStatusParams
+    method: Literal["experimental/serverStatus"] = RUST_ANALYZER_SERVER_STATUS
+    jsonrpc: str = "2.0"
+
+
+resolve_types(RustAnalyzerServerStatusParams)
+resolve_types(RustAnalyzerServerStatusNotification)
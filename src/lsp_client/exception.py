@@ -18,6 +18,13 @@ class EditApplicationError(LSPError):
         return self.message
 
 
+@frozen
+class InvalidTextEditError(EditApplicationError):
+    """Text edits overlap each other or fall outside of the document."""
+
+    edit_index: int | None = None
+
+
 @frozen
 class VersionMismatchError(EditApplicationError):
     """Document version mismatch during edit application."""
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from .call_graph import (
+    CallDirection,
+    CallEdge,
+    CallGraph,
+    CallGraphCrawler,
+    CallRoot,
+)
+from .item import ItemKey, item_key
+from .store import FileStamp, SymbolStore, file_stamp
+from .symbols import IndexStats, SymbolIndexer, SymbolRecord, symbol_records
+from .type_hierarchy import (
+    DocumentStamp,
+    TypeClosure,
+    TypeDirection,
+    TypeHierarchyClosure,
+    TypeRoot,
+)
+
+__all__ = [
+    "CallDirection",
+    "CallEdge",
+    "CallGraph",
+    "CallGraphCrawler",
+    "CallRoot",
+    "DocumentStamp",
+    "FileStamp",
+    "IndexStats",
+    "ItemKey",
+    "SymbolIndexer",
+    "SymbolRecord",
+    "SymbolStore",
+    "TypeClosure",
+    "TypeDirection",
+    "TypeHierarchyClosure",
+    "TypeRoot",
+    "file_stamp",
+    "item_key",
+    "symbol_records",
+]
@@ -0,0 +1,239 @@
+"""Crawl the transitive call graph of symbols through the call hierarchy requests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from typing import Literal
+
+from anyio.abc import ObjectSendStream
+from attrs import define, field, frozen
+
+from lsp_client.capability.request.call_hierarchy import WithRequestCallHierarchy
+from lsp_client.utils.batch import (
+    DEFAULT_MAX_CONCURRENCY,
+    as_completed,
+    gather_limited,
+    stream_from,
+)
+from lsp_client.utils.types import AnyPath, Position, lsp_type
+
+from .item import ItemKey, item_key
+
+type CallDirection = Literal["incoming", "outgoing", "both"]
+
+type CallRoot = lsp_type.CallHierarchyItem | tuple[AnyPath, Position]
+"""A prepared item, or the file and position of a symbol to prepare."""
+
+
+@frozen
+class CallEdge:
+    """A call from `caller` to `callee`."""
+
+    caller: lsp_type.CallHierarchyItem
+    callee: lsp_type.CallHierarchyItem
+    from_ranges: Sequence[lsp_type.Range]
+    """The ranges of the calls, in the document of `caller`."""
+
+
+@define
+class CallGraph:
+    """Items and calls found by a `CallGraphCrawler`, in discovery order."""
+
+    nodes: list[lsp_type.CallHierarchyItem] = field(factory=list)
+    edges: list[CallEdge] = field(factory=list)
+
+    _index: dict[ItemKey, int] = field(factory=dict, init=False)
+
+    def index_of(self, item: lsp_type.CallHierarchyItem) -> int | None:
+        """The index of `item` in `nodes`, or `None` if not in the graph."""
+        return self._index.get(item_key(item))
+
+    def add_node(self, item: lsp_type.CallHierarchyItem) -> int:
+        key = item_key(item)
+        if (i := self._index.get(key)) is None:
+            i = self._index[key] = len(self.nodes)
+            self.nodes.append(item)
+        return i
+
+    def to_edge_list(self) -> list[tuple[int, int]]:
+        """The `(caller, callee)` node indices of every edge."""
+
+        return [
+            (self._index[item_key(e.caller)], self._index[item_key(e.callee)])
+            for e in self.edges
+        ]
+
+    def to_adjacency(self) -> tuple[list[int], list[int]]:
+        """
+        The callees of every node, in compressed sparse row form.
+
+        Returns:
+            `(offsets, targets)`: the callees of node `i` are
+            `targets[offsets[i]:offsets[i + 1]]`, in discovery order.
+        """
+
+        callees: list[list[int]] = [[] for _ in self.nodes]
+        for caller, callee in self.to_edge_list():
+            callees[caller].append(callee)
+
+        offsets = [0]
+        targets: list[int] = []
+        for row in callees:
+            targets.extend(row)
+            offsets.append(len(targets))
+        return offsets, targets
+
+
+@define
+class CallGraphCrawler:
+    """
+    Breadth-first crawl of the call graph reachable from some root symbols.
+
+    Items are deduplicated by URI and selection range, so every item is
+    queried once. At most `max_concurrency` requests are in flight; documents
+    are only opened to prepare roots given by position, as the calls of an
+    item are requested from the item itself.
+
+    The crawl stops after `max_depth` levels of calls from the roots, and
+    stops adding items once the graph holds `max_nodes` (calls to items left
+    out are not recorded).
+
+    Example:
+        crawler = CallGraphCrawler(client, direction="incoming", max_depth=3)
+        async with crawler.stream([("src/app.py", position)]) as edges:
+            async for edge in edges:
+                ...
+        offsets, targets = crawler.graph.to_adjacency()
+    """
+
+    client: WithRequestCallHierarchy
+    direction: CallDirection = "outgoing"
+    max_depth: int | None = None
+    max_nodes: int | None = None
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+
+    graph: CallGraph = field(factory=CallGraph, init=False)
+
+    @asynccontextmanager
+    async def stream(
+        self, roots: Sequence[CallRoot]
+    ) -> AsyncGenerator[AsyncIterator[CallEdge]]:
+        """
+        Crawl from `roots`, streaming the edges as they are found.
+
+        The graph is reset at the start of the crawl and filled as it goes.
+        Leaving the context early cancels the crawl.
+        """
+
+        self.graph = CallGraph()
+        async with stream_from(
+            lambda send: self._crawl(roots, send),
+            max_buffer_size=self.max_concurrency,
+        ) as edges:
+            yield edges
+
+    async def crawl(self, roots: Sequence[CallRoot]) -> CallGraph:
+        """Crawl from `roots` and return the whole graph."""
+
+        async with self.stream(roots) as edges:
+            async for _ in edges:
+                pass
+        return self.graph
+
+    async def _crawl(
+        self, roots: Sequence[CallRoot], send: ObjectSendStream[CallEdge]
+    ) -> None:
+        graph = self.graph
+        frontier = [
+            item
+            for item in await self._prepare(roots)
+            # a root prepared twice is only crawled once
+            if graph.index_of(item) is None and self._add(item) is not None
+        ]
+        seen_edges: set[tuple[int, int]] = set()
+
+        depth = 0
+        while frontier and (self.max_depth is None or depth < self.max_depth):
+            depth += 1
+            next_frontier: list[lsp_type.CallHierarchyItem] = []
+            async with as_completed(
+                frontier, self._calls, max_concurrency=self.max_concurrency
+            ) as completed:
+                async for _, _, calls in completed:
+                    for other, edge in calls:
+                        known = graph.index_of(other) is not None
+                        if self._add(other) is None:
+                            continue
+                        if not known:
+                            next_frontier.append(other)
+
+                        # with both directions, a call is found from both ends
+                        key = (graph.add_node(edge.caller), graph.add_node(edge.callee))
+                        if key not in seen_edges:
+                            seen_edges.add(key)
+                            graph.edges.append(edge)
+                            await send.send(edge)
+            frontier = next_frontier
+
+    def _add(self, item: lsp_type.CallHierarchyItem) -> int | None:
+        """Add `item` to the graph, or return `None` if over the node budget."""
+
+        if (i := self.graph.index_of(item)) is not None:
+            return i
+        if self.max_nodes is not None and len(self.graph.nodes) >= self.max_nodes:
+            return None
+        return self.graph.add_node(item)
+
+    async def _prepare(
+        self, roots: Sequence[CallRoot]
+    ) -> list[lsp_type.CallHierarchyItem]:
+        items = [r for r in roots if isinstance(r, lsp_type.CallHierarchyItem)]
+        positions = [r for r in roots if not isinstance(r, lsp_type.CallHierarchyItem)]
+        if not positions:
+            return items
+
+        async def prepare(root: tuple[AnyPath, Position]) -> list:
+            file_path, position = root
+            return list(
+                await self.client.request_prepare_call_hierarchy(
+                    lsp_type.CallHierarchyPrepareParams(
+                        text_document=lsp_type.TextDocumentIdentifier(
+                            uri=self.client.as_uri(file_path)
+                        ),
+                        position=position,
+                    )
+                )
+                or ()
+            )
+
+        files = dict.fromkeys(file_path for file_path, _ in positions)
+        async with self.client.open_files(*files):
+            prepared = await gather_limited(
+                positions, prepare, max_concurrency=self.max_concurrency
+            )
+        return items + [item for result in prepared for item in result]
+
+    async def _calls(
+        self, item: lsp_type.CallHierarchyItem
+    ) -> list[tuple[lsp_type.CallHierarchyItem, CallEdge]]:
+        """The items called by or calling `item`, with the edge to each."""
+
+        calls: list[tuple[lsp_type.CallHierarchyItem, CallEdge]] = []
+        if self.direction in ("outgoing", "both"):
+            outgoing = await self.client.request_call_hierarchy_item_outgoing_calls(
+                lsp_type.CallHierarchyOutgoingCallsParams(item=item)
+            )
+            calls.extend(
+                (call.to, CallEdge(item, call.to, call.from_ranges))
+                for call in outgoing or ()
+            )
+        if self.direction in ("incoming", "both"):
+            incoming = await self.client.request_call_hierarchy_item_incoming_calls(
+                lsp_type.CallHierarchyIncomingCallsParams(item=item)
+            )
+            calls.extend(
+                (call.from_, CallEdge(call.from_, item, call.from_ranges))
+                for call in incoming or ()
+            )
+        return calls
@@ -0,0 +1,13 @@
+"""Identity of the items of the call and type hierarchies."""
+
+from __future__ import annotations
+
+from lsp_client.utils.types import lsp_type
+
+type ItemKey = tuple[str, int, int, int, int]
+"""Identity of a hierarchy item: its URI and selection range."""
+
+
+def item_key(item: lsp_type.CallHierarchyItem | lsp_type.TypeHierarchyItem) -> ItemKey:
+    start, end = item.selection_range.start, item.selection_range.end
+    return (item.uri, start.line, start.character, end.line, end.character)
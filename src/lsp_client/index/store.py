@@ -0,0 +1,278 @@
+"""Persistent on-disk symbol index of a workspace.
+
+Each indexed file is recorded with its modification time and size, so a later
+run only re-queries the files that changed since. Lookups by name, name prefix
+and container are answered from the database alone, without a language server.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+import threading
+from collections.abc import Generator, Iterable, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Final, Self
+
+import anyio.to_thread
+from attrs import define, field
+
+from lsp_client.client.store import default_cache_dir
+from lsp_client.utils.fs import FileStamp, file_stamp
+from lsp_client.utils.symbol import DocumentSymbolPath
+from lsp_client.utils.types import lsp_type
+from lsp_client.utils.workspace import Workspace
+
+from .symbols import SymbolRecord
+
+_SCHEMA_VERSION: Final = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    container TEXT NOT NULL,
+    kind INTEGER NOT NULL,
+    start_line INTEGER NOT NULL,
+    start_character INTEGER NOT NULL,
+    end_line INTEGER NOT NULL,
+    end_character INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols (name);
+CREATE INDEX IF NOT EXISTS symbols_container ON symbols (container);
+CREATE INDEX IF NOT EXISTS symbols_path ON symbols (path);
+"""
+
+_COLUMNS = (
+    "path, name, container, kind, start_line, start_character, end_line, end_character"
+)
+
+
+def _container_key(symbols: Sequence[str]) -> str:
+    # names may contain dots (e.g. Java packages), so they are not joined
+    return json.dumps(list(symbols))
+
+
+def _row(record: SymbolRecord) -> tuple:
+    *container, name = record.symbol_path.symbols
+    start, end = record.range.start, record.range.end
+    return (
+        str(record.path),
+        name,
+        _container_key(container),
+        record.kind.value,
+        start.line,
+        start.character,
+        end.line,
+        end.character,
+    )
+
+
+def _record(row: tuple) -> SymbolRecord:
+    path, name, container, kind, *pos = row
+    symbols = (*json.loads(container), name)
+    return SymbolRecord(
+        Path(path),
+        DocumentSymbolPath(symbols),
+        lsp_type.SymbolKind(kind),
+        lsp_type.Range(
+            start=lsp_type.Position(line=pos[0], character=pos[1]),
+            end=lsp_type.Position(line=pos[2], character=pos[3]),
+        ),
+    )
+
+
+@define
+class SymbolStore:
+    """
+    SQLite-backed symbol index of a workspace.
+
+    Filled by `SymbolIndexer.update`, which only re-indexes the files whose
+    stamp changed since they were stored. Lookups are indexed queries and
+    cheap enough to run synchronously; updates run in a worker thread.
+
+    Example:
+        with SymbolStore.for_workspace(client.get_workspace()) as store:
+            await SymbolIndexer(client).update(store)
+            store.lookup("MyClass")
+    """
+
+    path: Path
+
+    _conn: sqlite3.Connection | None = field(default=None, init=False)
+    _lock: threading.Lock = field(factory=threading.Lock, init=False)
+
+    @classmethod
+    def for_workspace(
+        cls, workspace: Workspace, cache_dir: Path | None = None
+    ) -> SymbolStore:
+        """The store of `workspace`, in `cache_dir` (the default cache directory)."""
+
+        cache_dir = cache_dir or default_cache_dir()
+        return cls(path=cache_dir / "symbols" / f"{workspace.id}.sqlite")
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @contextmanager
+    def _connect(self) -> Generator[sqlite3.Connection, None, None]:
+        with self._lock:
+            if self._conn is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(
+                    self.path, check_same_thread=False, isolation_level=None
+                )
+                conn.execute("PRAGMA journal_mode=WAL")
+                [version] = conn.execute("PRAGMA user_version").fetchone()
+                if version != _SCHEMA_VERSION:
+                    # an index is cheap to rebuild: drop it rather than migrate
+                    conn.executescript(
+                        "DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS symbols;"
+                    )
+                    conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+                conn.executescript(_SCHEMA)
+                self._conn = conn
+            yield self._conn
+
+    def stale_files(self, files: Iterable[Path]) -> dict[Path, FileStamp]:
+        """
+        The files of `files` that are new or changed since they were stored.
+
+        Stored files missing from `files` are forgotten, so `files` should be the
+        complete set of source files of the workspace.
+
+        Returns:
+            The current stamp of each stale file, to pass on to `put`.
+        """
+
+        current = {path: stamp for path in files if (stamp := file_stamp(path))}
+        with self._connect() as conn:
+            stored = {
+                Path(path): (mtime_ns, size)
+                for path, mtime_ns, size in conn.execute("SELECT * FROM files")
+            }
+            if removed := [str(p) for p in stored.keys() - current.keys()]:
+                with _transaction(conn):
+                    _delete(conn, removed)
+        return {
+            path: stamp for path, stamp in current.items() if stored.get(path) != stamp
+        }
+
+    def put(
+        self, path: Path, stamp: FileStamp, records: Sequence[SymbolRecord]
+    ) -> None:
+        """Replace the symbols of `path`, indexed when the file had `stamp`."""
+
+        with self._connect() as conn, _transaction(conn):
+            _delete(conn, [str(path)])
+            conn.execute("INSERT INTO files VALUES (?, ?, ?)", (str(path), *stamp))
+            conn.executemany(
+                f"INSERT INTO symbols ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                map(_row, records),
+            )
+
+    async def aput(
+        self, path: Path, stamp: FileStamp, records: Sequence[SymbolRecord]
+    ) -> None:
+        await anyio.to_thread.run_sync(self.put, path, stamp, records)
+
+    def lookup(
+        self, name: str, *, kind: lsp_type.SymbolKind | None = None
+    ) -> list[SymbolRecord]:
+        """The symbols named `name`, optionally of the given `kind`."""
+        return self._select("name = ?", (name,), kind)
+
+    def lookup_prefix(
+        self,
+        prefix: str,
+        *,
+        kind: lsp_type.SymbolKind | None = None,
+        limit: int | None = None,
+    ) -> list[SymbolRecord]:
+        """The symbols whose name starts with `prefix` (case-sensitive), by name."""
+
+        if not prefix:
+            return self._select("1", (), kind, limit=limit)
+        # a range scan on the name index, unlike `LIKE`; trailing maximal code
+        # points cannot be incremented, and do not narrow the range anyway
+        if not (stem := prefix.rstrip(chr(sys.maxunicode))):
+            return self._select("name >= ?", (prefix,), kind, limit)
+        code = ord(stem[-1]) + 1
+        if 0xD800 <= code <= 0xDFFF:
+            # surrogates cannot be encoded to UTF-8
+            code = 0xE000
+        upper = stem[:-1] + chr(code)
+        return self._select("name >= ? AND name < ?", (prefix, upper), kind, limit)
+
+    def members(
+        self,
+        container: DocumentSymbolPath | str,
+        *,
+        kind: lsp_type.SymbolKind | None = None,
+    ) -> list[SymbolRecord]:
+        """
+        The symbols declared directly in `container` (e.g. the methods of a class).
+
+        A string container is a dot-separated path; pass a `DocumentSymbolPath`
+        when the names themselves contain dots.
+        """
+
+        if isinstance(container, str):
+            container = DocumentSymbolPath(container.split(".") if container else ())
+        return self._select("container = ?", (_container_key(container.symbols),), kind)
+
+    def symbols_of(self, path: Path) -> list[SymbolRecord]:
+        """The stored symbols of the file at `path`."""
+        return self._select("path = ?", (str(path),), None)
+
+    def _select(
+        self,
+        where: str,
+        params: tuple,
+        kind: lsp_type.SymbolKind | None,
+        limit: int | None = None,
+    ) -> list[SymbolRecord]:
+        if kind is not None:
+            where += " AND kind = ?"
+            params = (*params, kind.value)
+        query = (
+            f"SELECT {_COLUMNS} FROM symbols WHERE {where} "
+            "ORDER BY name, path, start_line, start_character"
+        )
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        with self._connect() as conn:
+            return [_record(row) for row in conn.execute(query, params)]
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Generator[None, None, None]:
+    conn.execute("BEGIN")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _delete(conn: sqlite3.Connection, paths: list[str]) -> None:
+    params = [(p,) for p in paths]
+    conn.executemany("DELETE FROM symbols WHERE path = ?", params)
+    conn.executemany("DELETE FROM files WHERE path = ?", params)
@@ -0,0 +1,193 @@
+"""Index the symbols of every source file of a workspace."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Iterable, Sequence
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import anyio.to_thread
+from attrs import define, field, frozen
+from loguru import logger
+
+from lsp_client.capability.request.document_symbol import WithRequestDocumentSymbol
+from lsp_client.utils.batch import DEFAULT_MAX_CONCURRENCY, as_completed
+from lsp_client.utils.ignore import DEFAULT_IGNORE_FILES, iter_source_files
+from lsp_client.utils.symbol import DocumentSymbolHierarchy, DocumentSymbolPath
+from lsp_client.utils.types import lsp_type
+
+if TYPE_CHECKING:
+    from .store import SymbolStore
+
+
+@frozen
+class SymbolRecord:
+    """A symbol found by the indexer."""
+
+    path: Path
+    """The file declaring the symbol."""
+    symbol_path: DocumentSymbolPath
+    kind: lsp_type.SymbolKind
+    range: lsp_type.Range
+    """The range of the whole declaration (e.g. including the body of a function)."""
+
+
+@define
+class IndexStats:
+    """Progress of a `SymbolIndexer` run."""
+
+    files_total: int = 0
+    files_done: int = 0
+    """Files indexed, including the failed ones."""
+    errors: int = 0
+    """Files whose symbols could not be requested."""
+    symbols: int = 0
+    started: float = field(factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files_done / elapsed if (elapsed := self.elapsed) else 0.0
+
+
+def symbol_records(
+    path: Path,
+    symbols: Iterable[lsp_type.DocumentSymbol] | Iterable[lsp_type.SymbolInformation],
+) -> list[SymbolRecord]:
+    """Flatten a `textDocument/documentSymbol` result into records."""
+
+    records: list[SymbolRecord] = []
+    for symbol in symbols:
+        match symbol:
+            case lsp_type.DocumentSymbol():
+                hierarchy = DocumentSymbolHierarchy(symbol)
+                records.extend(
+                    SymbolRecord(path, symbol_path, s.kind, s.range)
+                    for symbol_path, s in hierarchy.flattened.items()
+                )
+            case lsp_type.SymbolInformation(container_name=container):
+                names = (container, symbol.name) if container else (symbol.name,)
+                records.append(
+                    SymbolRecord(
+                        path,
+                        DocumentSymbolPath(names),
+                        symbol.kind,
+                        symbol.location.range,
+                    )
+                )
+    return records
+
+
+@define
+class SymbolIndexer:
+    """
+    Index the symbols of a workspace with `textDocument/documentSymbol`.
+
+    The workspace folders of the client are walked for files with one of the
+    suffixes of its language, skipping files matched by `ignore_files`. Symbols
+    are requested for at most `max_concurrency` files at a time.
+
+    A file whose symbols cannot be requested is logged and counted in
+    `stats.errors`, without stopping the run.
+
+    Example:
+        indexer = SymbolIndexer(client, on_progress=print)
+        async with indexer.stream() as records:
+            async for record in records:
+                ...
+    """
+
+    client: WithRequestDocumentSymbol
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ignore_files: Sequence[str] = DEFAULT_IGNORE_FILES
+    on_progress: Callable[[IndexStats], None] | None = None
+    """Called after each indexed file."""
+
+    stats: IndexStats = field(factory=IndexStats, init=False)
+
+    def iter_files(self) -> Iterable[Path]:
+        """The source files of the workspace folders of the client."""
+
+        suffixes = self.client.get_language_config().suffixes
+        for folder in self.client.get_workspace().values():
+            yield from iter_source_files(
+                folder.path, suffixes, ignore_files=self.ignore_files
+            )
+
+    @asynccontextmanager
+    async def stream(
+        self, files: Sequence[Path] | None = None
+    ) -> AsyncGenerator[AsyncIterator[SymbolRecord]]:
+        """
+        Stream the symbols of `files` (the whole workspace by default).
+
+        Records of a file are yielded together, in the order files complete.
+        Leaving the context early cancels the remaining requests.
+        """
+
+        if files is None:
+            files = await anyio.to_thread.run_sync(lambda: list(self.iter_files()))
+        self.stats = IndexStats(files_total=len(files))
+
+        async with as_completed(
+            files, self._index_file, max_concurrency=self.max_concurrency
+        ) as completed:
+
+            async def records() -> AsyncIterator[SymbolRecord]:
+                async for _, _, file_records in completed:
+                    for record in file_records or ():
+                        yield record
+
+            yield records()
+
+    async def index(self, files: Sequence[Path] | None = None) -> list[SymbolRecord]:
+        """The symbols of `files` (the whole workspace by default)."""
+
+        async with self.stream(files) as records:
+            return [record async for record in records]
+
+    async def update(self, store: SymbolStore) -> IndexStats:
+        """
+        Bring `store` up to date with the workspace.
+
+        Only new files and files whose modification time or size changed since
+        they were stored are re-indexed; deleted files are dropped from the store.
+        Failed files are not stored, so the next update retries them.
+        """
+
+        files = await anyio.to_thread.run_sync(lambda: list(self.iter_files()))
+        stale = await anyio.to_thread.run_sync(store.stale_files, files)
+        self.stats = IndexStats(files_total=len(stale))
+
+        async with as_completed(
+            list(stale), self._index_file, max_concurrency=self.max_concurrency
+        ) as completed:
+            async for _, path, records in completed:
+                if records is not None:
+                    # the stamp was taken before the request: a file changed
+                    # meanwhile is stale again on the next update
+                    await store.aput(path, stale[path], records)
+        return self.stats
+
+    async def _index_file(self, path: Path) -> list[SymbolRecord] | None:
+        """The records of `path`, or `None` if its symbols could not be requested."""
+
+        try:
+            symbols = await self.client.request_document_symbol(path)
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Failed to index {}: {}", path, e)
+            self.stats.errors += 1
+            records = None
+        else:
+            records = symbol_records(path, symbols or ())
+            self.stats.symbols += len(records)
+
+        self.stats.files_done += 1
+        if self.on_progress is not None:
+            self.on_progress(self.stats)
+        return records
@@ -0,0 +1,237 @@
+"""Transitive supertypes and subtypes through the type hierarchy requests."""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable, Mapping, Sequence
+from typing import Literal
+
+import anyio.to_thread
+from attrs import define, field, frozen
+
+from lsp_client.capability.request.type_hierarchy import WithRequestTypeHierarchy
+from lsp_client.utils.batch import DEFAULT_MAX_CONCURRENCY, gather_limited
+from lsp_client.utils.fs import FileStamp, file_stamp
+from lsp_client.utils.types import AnyPath, Position, lsp_type
+from lsp_client.utils.uri import from_local_uri
+
+from .item import ItemKey, item_key
+
+type TypeDirection = Literal["supertypes", "subtypes"]
+
+type TypeRoot = lsp_type.TypeHierarchyItem | tuple[AnyPath, Position]
+"""A prepared item, or the file and position of a type to prepare."""
+
+type DocumentStamp = tuple[str | None, FileStamp | None]
+"""The content hash of a document open in the client and the stamp of its file."""
+
+
+def _disk_stamp(uri: str) -> FileStamp | None:
+    if not uri.startswith("file:"):
+        # e.g. `jdt://` class files of jdtls, which do not change in a session
+        return None
+    return file_stamp(from_local_uri(uri))
+
+
+@frozen
+class _Memo:
+    items: Sequence[lsp_type.TypeHierarchyItem]
+    stamps: Mapping[str, DocumentStamp]
+    """The documents the result was computed from."""
+
+
+@frozen
+class TypeClosure:
+    """The types transitively reached from some roots in one direction."""
+
+    direction: TypeDirection
+    roots: Sequence[lsp_type.TypeHierarchyItem]
+    items: Sequence[lsp_type.TypeHierarchyItem]
+    """The types reached from the roots, excluding them, in breadth-first order."""
+    edges: Sequence[tuple[int, int]]
+    """`(type, supertype or subtype)` indices into `nodes`."""
+    truncated: bool
+    """Whether a limit stopped the query, so the closure may be incomplete."""
+    stamps: Mapping[str, DocumentStamp] = field(repr=False)
+    """The documents involved, as they were when the closure was computed."""
+
+    @property
+    def nodes(self) -> Sequence[lsp_type.TypeHierarchyItem]:
+        return [*self.roots, *self.items]
+
+
+@define
+class TypeHierarchyClosure:
+    """
+    Transitive closure queries over the type hierarchy, memoized in a session.
+
+    The supertypes or subtypes of every visited item are requested once, with
+    the items of a level expanded concurrently (at most `max_concurrency`
+    requests in flight). A query stops after `max_depth` levels or once
+    `max_items` types are found, and flags the result as truncated.
+
+    Results are reused until a document involved changes: its content in the
+    client, or its file on disk. A type added in a document not involved in a
+    result (e.g. a new subclass in a new file) is only seen after `invalidate`.
+
+    Example:
+        closure = TypeHierarchyClosure(client, max_items=10_000)
+        subtypes = await closure.subtypes([("src/Shape.java", position)])
+    """
+
+    client: WithRequestTypeHierarchy
+    max_depth: int | None = None
+    max_items: int | None = None
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+
+    _memo: dict[Hashable, _Memo] = field(factory=dict, init=False)
+    _closures: dict[Hashable, TypeClosure] = field(factory=dict, init=False)
+
+    def invalidate(self) -> None:
+        """Forget every memoized result."""
+
+        self._memo.clear()
+        self._closures.clear()
+
+    async def supertypes(self, roots: Sequence[TypeRoot]) -> TypeClosure:
+        """All the supertypes of `roots`."""
+        return await self.closure(roots, "supertypes")
+
+    async def subtypes(self, roots: Sequence[TypeRoot]) -> TypeClosure:
+        """All the subtypes of `roots`."""
+        return await self.closure(roots, "subtypes")
+
+    async def closure(
+        self, roots: Sequence[TypeRoot], direction: TypeDirection
+    ) -> TypeClosure:
+        """All the types reached from `roots` in `direction`."""
+
+        items = await self._prepare(roots)
+        key = (direction, tuple(dict.fromkeys(map(item_key, items))))
+        if (cached := self._closures.get(key)) and await self._is_fresh(cached.stamps):
+            return cached
+
+        closure = await self._compute(items, direction)
+        self._closures[key] = closure
+        return closure
+
+    async def _compute(
+        self, roots: Sequence[lsp_type.TypeHierarchyItem], direction: TypeDirection
+    ) -> TypeClosure:
+        index: dict[ItemKey, int] = {}
+        nodes: list[lsp_type.TypeHierarchyItem] = []
+        for item in roots:
+            if item_key(item) not in index:
+                index[item_key(item)] = len(nodes)
+                nodes.append(item)
+        root_count = len(nodes)
+
+        edges: list[tuple[int, int]] = []
+        stamps: dict[str, DocumentStamp] = {}
+        truncated = False
+
+        async def expand(item: lsp_type.TypeHierarchyItem) -> _Memo:
+            return await self._expand(item, direction)
+
+        frontier = list(nodes)
+        depth = 0
+        while frontier:
+            if self.max_depth is not None and depth >= self.max_depth:
+                truncated = True
+                break
+            depth += 1
+
+            expanded = await gather_limited(
+                frontier, expand, max_concurrency=self.max_concurrency
+            )
+            next_frontier: list[lsp_type.TypeHierarchyItem] = []
+            for item, memo in zip(frontier, expanded, strict=True):
+                stamps.update(memo.stamps)
+                source = index[item_key(item)]
+                for other in memo.items:
+                    if (target := index.get(item_key(other))) is None:
+                        if (
+                            self.max_items is not None
+                            and len(nodes) - root_count >= self.max_items
+                        ):
+                            truncated = True
+                            continue
+                        target = index[item_key(other)] = len(nodes)
+                        nodes.append(other)
+                        next_frontier.append(other)
+                    edges.append((source, target))
+            frontier = next_frontier
+
+        return TypeClosure(
+            direction=direction,
+            roots=nodes[:root_count],
+            items=nodes[root_count:],
+            edges=edges,
+            truncated=truncated,
+            stamps=stamps,
+        )
+
+    async def _expand(
+        self, item: lsp_type.TypeHierarchyItem, direction: TypeDirection
+    ) -> _Memo:
+        key = (direction, item_key(item))
+        if (memo := self._memo.get(key)) and await self._is_fresh(memo.stamps):
+            return memo
+
+        if direction == "supertypes":
+            result = await self.client.request_type_hierarchy_item_supertypes(
+                lsp_type.TypeHierarchySupertypesParams(item=item)
+            )
+        else:
+            result = await self.client.request_type_hierarchy_item_subtypes(
+                lsp_type.TypeHierarchySubtypesParams(item=item)
+            )
+        items = list(result or ())
+        memo = self._memo[key] = _Memo(
+            items, await self._stamps([item.uri, *(i.uri for i in items)])
+        )
+        return memo
+
+    async def _prepare(
+        self, roots: Sequence[TypeRoot]
+    ) -> list[lsp_type.TypeHierarchyItem]:
+        async def prepare(root: TypeRoot) -> Sequence[lsp_type.TypeHierarchyItem]:
+            if isinstance(root, lsp_type.TypeHierarchyItem):
+                return [root]
+
+            file_path, position = root
+            uri = self.client.as_uri(file_path)
+            key = ("prepare", uri, position.line, position.character)
+            if (memo := self._memo.get(key)) and await self._is_fresh(memo.stamps):
+                return memo.items
+
+            # the document is only opened when the position is not memoized
+            async with self.client.open_files(file_path):
+                result = await self.client.request_prepare_type_hierarchy(
+                    lsp_type.TypeHierarchyPrepareParams(
+                        text_document=lsp_type.TextDocumentIdentifier(uri=uri),
+                        position=position,
+                    )
+                )
+            items = list(result or ())
+            self._memo[key] = _Memo(
+                items, await self._stamps([uri, *(i.uri for i in items)])
+            )
+            return items
+
+        prepared = await gather_limited(
+            roots, prepare, max_concurrency=self.max_concurrency
+        )
+        return [item for items in prepared for item in items]
+
+    async def _stamps(self, uris: Iterable[str]) -> dict[str, DocumentStamp]:
+        uris = list(dict.fromkeys(uris))
+        state = self.client.get_document_state()
+        # versions restart at 0 on reopen, the content hash does not
+        hashes = {uri: state.get_content_hash(uri) for uri in uris}
+        disk = await anyio.to_thread.run_sync(lambda: list(map(_disk_stamp, uris)))
+        return {
+            uri: (hashes[uri], stamp) for uri, stamp in zip(uris, disk, strict=True)
+        }
+
+    async def _is_fresh(self, stamps: Mapping[str, DocumentStamp]) -> bool:
+        return await self._stamps(stamps) == stamps
@@ -0,0 +1,106 @@
+"""JSON codecs for the JSON-RPC wire layer.
+
+The codec encodes raw packages straight to bytes and decodes the content part of
+a frame from bytes. The stdlib backend is always available; `orjson` and
+`msgspec` backends are provided by the extras of the same name.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+from types import ModuleType
+from typing import Any, Protocol, runtime_checkable
+
+from attrs import field, frozen
+
+from lsp_client.settings import JsonCodecName, settings
+
+type Buffer = bytes | bytearray | memoryview
+
+
+@runtime_checkable
+class JsonCodec(Protocol):
+    """Encode and decode JSON-RPC packages."""
+
+    def encode(self, obj: object) -> bytes:
+        """Encode an object to UTF-8 JSON bytes."""
+        ...
+
+    def decode(self, data: Buffer) -> Any:  # noqa: ANN401
+        """Decode UTF-8 JSON bytes to an object."""
+        ...
+
+
+@frozen
+class StdlibJsonCodec:
+    """Codec based on the standard library `json` module."""
+
+    def encode(self, obj: object) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    def decode(self, data: Buffer) -> Any:  # noqa: ANN401
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+@frozen
+class OrjsonCodec:
+    """Codec based on `orjson`. Requires the `orjson` extra."""
+
+    _orjson: ModuleType = field(init=False, factory=lambda: _require("orjson"))
+
+    def encode(self, obj: object) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def decode(self, data: Buffer) -> Any:  # noqa: ANN401
+        return self._orjson.loads(data)
+
+
+@frozen
+class MsgspecCodec:
+    """Codec based on `msgspec`. Requires the `msgspec` extra."""
+
+    _encoder: Any = field(
+        init=False, factory=lambda: _require("msgspec").json.Encoder()
+    )
+    _decoder: Any = field(
+        init=False, factory=lambda: _require("msgspec").json.Decoder()
+    )
+
+    def encode(self, obj: object) -> bytes:
+        return self._encoder.encode(obj)
+
+    def decode(self, data: Buffer) -> Any:  # noqa: ANN401
+        return self._decoder.decode(data)
+
+
+def _require(module: str) -> ModuleType:
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"JSON codec '{module}' requires the '{module}' package. "
+            f"Install it with `pip install lsp-client[{module}]`."
+        ) from e
+
+
+def get_json_codec(name: JsonCodecName) -> JsonCodec:
+    """Create a codec by backend name."""
+
+    match name:
+        case "stdlib":
+            return StdlibJsonCodec()
+        case "orjson":
+            return OrjsonCodec()
+        case "msgspec":
+            return MsgspecCodec()
+        case _:
+            raise ValueError(f"Unknown JSON codec: {name}")
+
+
+def default_json_codec() -> JsonCodec:
+    """Create the codec selected by `LSP_CLIENT_JSON_CODEC` (stdlib by default)."""
+
+    return get_json_codec(settings.json_codec)
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
-import json
-from typing import cast
+import threading
+from collections.abc import Callable, Sequence
+from enum import Enum
+from functools import cache, partial
+from types import NoneType, UnionType
+from typing import Any, Final, Union, cast, get_args, get_origin, overload
 
+import attrs
+import cattrs
+from attrs import NOTHING
+from cattrs.errors import ClassValidationError
 from lsprotocol import converters
 
 from lsp_client.utils.types import Notification, Request, Response, lsp_type
 
+from .codec import JsonCodec, StdlibJsonCodec
 from .exception import JsonRpcParseError, JsonRpcResponseError
 from .types import (
     RawNotification,
@@ -16,33 +25,230 @@ from .types import (
     RawResponsePackage,
 )
 
+
+def _patch_notebook_document_filter(conv: cattrs.Converter) -> None:
+    @conv.register_structure_hook
+    def _(
+        object_: object, _: object
+    ) -> (
+        str
+        | lsp_type.NotebookDocumentFilterNotebookType
+        | lsp_type.NotebookDocumentFilterScheme
+        | lsp_type.NotebookDocumentFilterPattern
+        | None
+    ):
+        """HACK patch from <https://github.com/microsoft/lsprotocol/issues/430#issuecomment-3582108388> for `lsprotocol` bug"""
+
+        if object_ is None:
+            return None
+        if isinstance(object_, str):
+            return str(object_)
+        if isinstance(object_, dict) and "notebookType" in object_:
+            return conv.structure(object_, lsp_type.NotebookDocumentFilterNotebookType)
+        if isinstance(object_, dict) and "scheme" in object_:
+            return conv.structure(object_, lsp_type.NotebookDocumentFilterScheme)
+        return conv.structure(object_, lsp_type.NotebookDocumentFilterPattern)
+
+
 converter = converters.get_converter()
+_patch_notebook_document_filter(converter)
+
+_stdlib_codec = StdlibJsonCodec()
+
+# ------------------------------ fast structuring ----------------------------- #
+
+_PRIMITIVES: Final = frozenset({str, int, bool, float, NoneType, Any})
+
+
+def _is_passthrough(t: object) -> bool:
+    """Whether a decoded JSON value of type `t` can be used as-is."""
+    if t in _PRIMITIVES:
+        return True
+    if get_origin(t) in (Union, UnionType):
+        return all(arg in _PRIMITIVES for arg in get_args(t))
+    return False
+
+
+def _to_camel_case(name: str) -> str:
+    """Same key mapping as the `lsprotocol` converter."""
+    parts = name.removesuffix("_").split("_")
+    return parts[0] + "".join(p.title() for p in parts[1:])
+
+
+_generating: set[type] = set()
+_generation_lock = threading.RLock()
+
+
+def _sequence_item_type(t: object) -> type | None:
+    """Return `X` if `t` is `Sequence[X]` for an attrs class `X`."""
+    if get_origin(t) is Sequence and (args := get_args(t)) and attrs.has(args[0]):
+        return args[0]
+    return None
+
+
+def _optional_inner_type(t: object) -> object | None:
+    """Return `X` if `t` is `X | None`."""
+    if get_origin(t) in (Union, UnionType):
+        args = [arg for arg in get_args(t) if arg is not NoneType]
+        if len(args) == 1 and len(get_args(t)) == 2:
+            return args[0]
+    return None
+
+
+def _item_hook(cls: type, item: type, globs: dict[str, Any], name: str) -> str:
+    if item is cls:
+        # self reference, e.g. `DocumentSymbol.children`
+        return "structure"
+    try:
+        globs[name] = fast_converter.get_structure_hook(item, cache_result=False)
+    except RecursionError:
+        # indirect reference cycle: use late binding
+        globs[name] = partial(_late_structure, schema=item)
+    return name
+
+
+def _late_structure(raw: object, _: object = None, *, schema: type) -> object:
+    return fast_converter.structure(raw, schema)
+
+
+def _value_expr(
+    cls: type, t: object, src: str, globs: dict[str, Any], suffix: str
+) -> str:
+    """Python expression structuring the JSON value `src` into type `t`."""
+
+    if _is_passthrough(t):
+        return src
+
+    if isinstance(t, type) and issubclass(t, Enum):
+        globs[f"__e{suffix}"] = t
+        return f"__e{suffix}({src})"
+
+    if (item := _sequence_item_type(t)) is not None:
+        hook = _item_hook(cls, item, globs, f"__i{suffix}")
+        return f"__tuple([{hook}(x) for x in {src}])"
+
+    if (inner := _optional_inner_type(t)) is not None and (
+        (item := _sequence_item_type(inner)) is not None
+    ):
+        hook = _item_hook(cls, item, globs, f"__i{suffix}")
+        return f"(None if (v := {src}) is None else __tuple([{hook}(x) for x in v]))"
+
+    try:
+        globs[f"__s{suffix}"] = fast_converter.get_structure_hook(t, cache_result=False)
+    except RecursionError:
+        globs[f"__s{suffix}"] = fast_converter.structure
+    globs[f"__t{suffix}"] = t
+    return f"__s{suffix}({src}, __t{suffix})"
+
+
+def _validation_error(cls: type, exc: Exception) -> ClassValidationError:
+    # `cl` is taken by `ClassValidationError.__new__`, which ty checks against
+    # the `__init__` of `ExceptionGroup`
+    return ClassValidationError(
+        f"While structuring {cls.__name__}",
+        [exc],
+        cls,  # ty: ignore[too-many-positional-arguments]
+    )
+
+
+def _make_fast_structure_fn(cls: type) -> Callable[..., Any]:
+    """Generate a structure function for an `lsprotocol` attrs class.
+
+    Compared to the generic `cattrs` function, the generated code builds the
+    instance without going through `__init__` (and thus attrs validators),
+    assigns primitive JSON values directly, inlines enums and lists of nested
+    classes, and binds every other nested hook once at generation time.
+
+    Missing keys and invalid values raise a `ClassValidationError`, as with the
+    generic converter.
+    """
+
+    with _generation_lock:
+        if cls in _generating:
+            raise RecursionError
+        _generating.add(cls)
+
+        try:
+            globs: dict[str, Any] = {
+                "__cl": cls,
+                "__new": object.__new__,
+                "__setattr": object.__setattr__,
+                "__tuple": tuple,
+                "__error": partial(_validation_error, cls),
+            }
+            lines = ["def structure(o, _=None):", "  try:", "    inst = __new(__cl)"]
+            for i, a in enumerate(attrs.fields(cls)):
+                key = _to_camel_case(a.name)
+                value = _value_expr(cls, a.type, f"o[{key!r}]", globs, str(i))
+                assign = f"__setattr(inst, {a.name!r}, {{}})"
+
+                if a.default is NOTHING:
+                    lines.append("    " + assign.format(value))
+                    continue
+
+                # `attrs.Factory` is typed as a function: no `isinstance` check
+                if (factory := getattr(a.default, "factory", None)) is not None:
+                    globs[f"__d{i}"] = factory
+                    default = f"__d{i}()"
+                else:
+                    globs[f"__d{i}"] = a.default
+                    default = f"__d{i}"
+                lines += [
+                    f"    if {key!r} in o:",
+                    "      " + assign.format(value),
+                    "    else:",
+                    "      " + assign.format(default),
+                ]
+            lines += [
+                # malformed input: same error as the generic `cattrs` converter
+                "  except (KeyError, TypeError, ValueError, AttributeError) as e:",
+                "    raise __error(e) from None",
+                "  return inst",
+            ]
+        finally:
+            _generating.discard(cls)
+
+    script = "\n".join(lines)
+    exec(compile(script, f"<fast structure {cls.__name__}>", "exec"), globs)
+    return globs["structure"]
+
+
+fast_converter = converters.get_converter(cattrs.Converter(detailed_validation=False))
+_patch_notebook_document_filter(fast_converter)
+fast_converter.register_structure_hook_factory(attrs.has, _make_fast_structure_fn)
+
+
+@cache
+def get_structure_fn[R](schema: type[R]) -> Callable[[object], R]:
+    """Return the specialized structure function for `schema`.
+
+    The function is generated on first use and cached, so hot schemas (e.g.
+    `ReferencesResponse`, `DocumentSymbolResponse`, `CompletionResponse` or
+    `PublishDiagnosticsNotification`) skip converter dispatch entirely. Input is
+    trusted to be a valid decoded LSP message: attrs validators are not run.
+    """
+
+    hook = fast_converter.get_structure_hook(schema)
+
+    def structure(raw: object) -> R:
+        return hook(raw, schema)
+
+    return structure
+
+
+@cache
+def get_unstructure_fn(schema: type) -> Callable[[Any], Any]:
+    """Return the cached unstructure function for `schema`."""
+
+    return fast_converter.get_unstructure_hook(schema)
 
 
-@converter.register_structure_hook
-def _(
-    object_: object, _: object
-) -> (
-    str
-    | lsp_type.NotebookDocumentFilterNotebookType
-    | lsp_type.NotebookDocumentFilterScheme
-    | lsp_type.NotebookDocumentFilterPattern
-    | None
-):
-    """HACK patch from <https://github.com/microsoft/lsprotocol/issues/430#issuecomment-3582108388> for `lsprotocol` bug"""
-
-    if object_ is None:
-        return None
-    if isinstance(object_, str):
-        return str(object_)
-    if isinstance(object_, dict) and "notebookType" in object_:
-        return converter.structure(object_, lsp_type.NotebookDocumentFilterNotebookType)
-    if isinstance(object_, dict) and "scheme" in object_:
-        return converter.structure(object_, lsp_type.NotebookDocumentFilterScheme)
-    return converter.structure(object_, lsp_type.NotebookDocumentFilterPattern)
-
-
-def value_deserialize[R](raw_value: object, schema: type[R]) -> R:
+@overload
+def value_deserialize[R](raw_value: object, schema: type[R]) -> R: ...
+@overload
+def value_deserialize(raw_value: object, schema: object) -> Any: ...  # noqa: ANN401
+def value_deserialize(raw_value: object, schema: Any) -> Any:
+    """Structure a decoded JSON value. `schema` may also be a union type alias."""
     return converter.structure(raw_value, schema)
 
 
@@ -50,20 +256,20 @@ def value_serialize(value: object) -> object:
     return converter.unstructure(value)
 
 
-def package_serialize(package: RawPackage) -> str:
-    return json.dumps(package)
+def package_serialize(package: RawPackage, codec: JsonCodec = _stdlib_codec) -> bytes:
+    return codec.encode(package)
 
 
 def request_deserialize[R](raw_req: RawRequestPackage, schema: type[R]) -> R:
-    return converter.structure(raw_req, schema)
+    return get_structure_fn(schema)(raw_req)
 
 
 def request_serialize(request: Request) -> RawRequest:
-    return cast(RawRequest, converter.unstructure(request))
+    return cast(RawRequest, get_unstructure_fn(type(request))(request))
 
 
 def notification_serialize(notification: Notification) -> RawNotification:
-    return cast(RawNotification, converter.unstructure(notification))
+    return cast(RawNotification, get_unstructure_fn(type(notification))(notification))
 
 
 def response_deserialize[R](
@@ -78,11 +284,11 @@ def response_deserialize[R](
                 raise JsonRpcResponseError(err.code, err.message, err.data)
             raise JsonRpcParseError(f"Invalid Error Response: {err_resp}")
         case {"result": _} as raw_resp:
-            resp = converter.structure(raw_resp, schema)
+            resp = get_structure_fn(schema)(raw_resp)
             return resp.result
         case unexpected:
             raise JsonRpcParseError(f"Unexpected response: {unexpected}")
 
 
 def response_serialize(response: Response[object]) -> RawResponsePackage:
-    return cast(RawResponsePackage, converter.unstructure(response))
+    return cast(RawResponsePackage, get_unstructure_fn(type(response))(response))
@@ -1,9 +1,23 @@
 from __future__ import annotations
 
+import itertools
 from uuid import uuid4
 
+from lsp_client.utils.warn import deprecated
+
 type ID = str | int
 
+_next_id = itertools.count(1).__next__
+
+
+def jsonrpc_id() -> ID:
+    """Return a new request ID, unique within the process.
+
+    IDs are increasing integers: cheaper to create, encode and hash than UUIDs.
+    """
+    return _next_id()
+
 
+@deprecated("Use 'jsonrpc_id' instead.")
 def jsonrpc_uuid() -> ID:
     return uuid4().hex
@@ -0,0 +1,140 @@
+"""Lazy views over decoded JSON-RPC results.
+
+A `LazySequence` wraps the raw list of a response result and structures each
+element only when it is accessed. Callers that only count results or read a few
+raw fields never pay for building the full `lsprotocol` objects.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Sequence
+from functools import cache
+from types import UnionType
+from typing import Any, Union, cast, get_args, get_origin, overload, override
+
+import attrs
+
+from lsp_client.utils.types import Response
+
+from .convert import get_structure_fn, response_deserialize
+from .types import RawResponsePackage
+
+type RawItem = Any
+
+
+class LazySequence[T](Sequence[T]):
+    """Read-only sequence that structures elements on access.
+
+    Structured elements are cached, so indexing the same element twice returns
+    the same object. `item_type` is the declared element type of the array and
+    may itself be a union (e.g. `Command | CodeAction`).
+    """
+
+    __slots__ = ("_items", "_raw", "_structure", "item_type")
+
+    def __init__(self, raw: Sequence[RawItem], item_type: type[T] | Any) -> None:  # noqa: ANN401
+        self._raw = raw
+        self._structure: Callable[[object], T] = get_structure_fn(item_type)
+        self._items: list[T | None] | None = None
+        self.item_type = item_type
+
+    @property
+    def raw(self) -> Sequence[RawItem]:
+        """The decoded JSON elements, as received from the server."""
+        return self._raw
+
+    def raw_at(self, index: int) -> RawItem:
+        """Return the decoded JSON of an element without structuring it."""
+        return self._raw[index]
+
+    def iter_raw(self) -> Iterator[RawItem]:
+        """Iterate over the decoded JSON elements without structuring them."""
+        return iter(self._raw)
+
+    def materialize(self) -> tuple[T, ...]:
+        """Structure all elements and return them as a tuple."""
+        return tuple(self)
+
+    def _get(self, index: int) -> T:
+        if self._items is None:
+            self._items = [None] * len(self._raw)
+        elif (item := self._items[index]) is not None:
+            return item
+        item = self._items[index] = self._structure(self._raw[index])
+        return item
+
+    @override
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+    @overload
+    def __getitem__(self, index: slice) -> LazySequence[T]: ...
+    @override
+    def __getitem__(self, index: int | slice) -> T | LazySequence[T]:
+        if isinstance(index, slice):
+            return LazySequence(self._raw[index], self.item_type)
+        return self._get(range(len(self._raw))[index])
+
+    @override
+    def __iter__(self) -> Iterator[T]:
+        for i in range(len(self._raw)):
+            yield self._get(i)
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str | bytes):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other, strict=True)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    @override
+    def __repr__(self) -> str:
+        name = getattr(self.item_type, "__name__", repr(self.item_type))
+        return f"LazySequence[{name}](len={len(self._raw)})"
+
+
+@cache
+def _result_item_types(schema: type) -> tuple[Any, ...]:
+    """Element types of the array alternatives of a response `result` type."""
+
+    result_type = attrs.fields_dict(cast(Any, schema))["result"].type
+    alternatives = (
+        get_args(result_type)
+        if get_origin(result_type) in (Union, UnionType)
+        else (result_type,)
+    )
+    return tuple(
+        get_args(alt)[0] for alt in alternatives if get_origin(alt) is Sequence
+    )
+
+
+def lazy_response_deserialize[R](
+    raw_resp: RawResponsePackage, schema: type[Response[R]]
+) -> R:
+    """Like `response_deserialize`, but return array results as a `LazySequence`.
+
+    When `schema` allows several array types (e.g. `SymbolInformation[]` or
+    `WorkspaceSymbol[]`), the first element is structured through `schema` to pick
+    the alternative, the same way as in the eager path. Non-array results are
+    structured eagerly.
+    """
+
+    match raw_resp:
+        case {"result": [first, *_] as raw_result} if item_types := _result_item_types(
+            schema
+        ):
+            if len(item_types) == 1:
+                return cast(R, LazySequence(raw_result, item_types[0]))
+            resp = response_deserialize(
+                cast(RawResponsePackage, {**raw_resp, "result": [first]}), schema
+            )
+            [head] = cast(Sequence[object], resp)
+            item_type = next(t for t in item_types if isinstance(head, t))
+            return cast(R, LazySequence(raw_result, item_type))
+        case _:
+            return response_deserialize(raw_resp, schema)
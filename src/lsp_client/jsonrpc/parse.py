@@ -2,10 +2,16 @@ from __future__ import annotations
 
 import json
 import re
+from collections.abc import Callable
 
-from anyio.abc import AnyByteSendStream
+import anyio
+import anyio.abc
+import anyio.lowlevel
+from anyio.abc import AnyByteReceiveStream, AnyByteSendStream
 from anyio.streams.buffered import BufferedByteReceiveStream
+from attrs import define, field
 
+from .codec import JsonCodec, StdlibJsonCodec
 from .convert import package_serialize
 from .exception import JsonRpcParseError, JsonRpcTransportError
 from .types import RawPackage
@@ -13,6 +19,19 @@ from .types import RawPackage
 HEADER_RE = re.compile(r"Content-Length:\s*(?P<length>\d+)")
 """match lsp header line: `Content-Length: ...\r\n`"""
 
+HEADER_END = b"\r\n\r\n"
+"""separator between the header part and the content part of a frame"""
+
+MAX_HEADER_SIZE = 65536
+
+FLUSH_THRESHOLD = 65536
+"""pending bytes at which the writer flushes without waiting for the next tick"""
+
+MAX_PENDING_SIZE = 4 * 1024 * 1024
+"""pending bytes at which `FrameWriter.write` blocks until a flush completes"""
+
+_stdlib_codec = StdlibJsonCodec()
+
 
 async def read_raw_package(receiver: BufferedByteReceiveStream) -> RawPackage:
     # when process is closed, the reader will always return b''
@@ -31,9 +50,252 @@ async def read_raw_package(receiver: BufferedByteReceiveStream) -> RawPackage:
     return json.loads(body_bytes.decode("utf-8"))
 
 
-async def write_raw_package(sender: AnyByteSendStream, package: RawPackage) -> None:
-    dumped = package_serialize(package).encode("utf-8")
-    length = len(dumped)
+def parse_content_length(header: bytes | bytearray) -> int:
+    """Extract `Content-Length` from a raw header block.
+
+    Header fields may appear in any order and names are matched
+    case-insensitively. Other fields (e.g. `Content-Type`) are ignored.
+    """
+
+    length: int | None = None
+    for line in header.split(b"\r\n"):
+        name, sep, value = line.partition(b":")
+        if not sep:
+            raise JsonRpcParseError(f"Invalid LSP header line: {line!r}")
+        if name.strip().lower() == b"content-length":
+            try:
+                length = int(value)
+            except ValueError as e:
+                raise JsonRpcParseError(f"Invalid Content-Length: {value!r}") from e
+
+    if not length or length < 0:
+        raise JsonRpcParseError("Invalid LSP response header")
+    return length
+
+
+@define
+class FrameReader:
+    """Read `Content-Length` framed messages from a byte stream.
+
+    Incoming chunks are accumulated into a single reusable buffer and headers are
+    parsed in place. The content part of each frame is returned as a `bytearray`
+    that can be handed to the JSON decoder directly, without an intermediate `str`.
+    Large bodies are received straight into a pre-sized buffer.
+    """
+
+    receive_stream: AnyByteReceiveStream
+    max_header_size: int = MAX_HEADER_SIZE
+
+    _buffer: bytearray = field(factory=bytearray, init=False)
+
+    async def _fill(self) -> None:
+        try:
+            chunk = await self.receive_stream.receive()
+        except anyio.EndOfStream:
+            if self._buffer:
+                raise anyio.IncompleteRead from None
+            raise
+        self._buffer += chunk
+
+    async def receive_frame(self) -> bytearray:
+        """Receive the content part of the next frame.
+
+        Raises:
+            anyio.EndOfStream: If the stream is closed at a frame boundary.
+            anyio.IncompleteRead: If the stream is closed in the middle of a frame.
+            JsonRpcParseError: If the header is malformed.
+        """
+
+        buf = self._buffer
+        searched = 0
+        while (header_end := buf.find(HEADER_END, searched)) < 0:
+            if len(buf) > self.max_header_size:
+                raise JsonRpcParseError("LSP header exceeds maximum size")
+            searched = max(len(buf) - len(HEADER_END) + 1, 0)
+            await self._fill()
+
+        length = parse_content_length(buf[:header_end])
+        body_start = header_end + len(HEADER_END)
+        body_end = body_start + length
+
+        if len(buf) >= body_end:
+            if len(buf) == body_end:
+                # the buffer holds exactly one frame: hand it over without copying
+                del buf[:body_start]
+                self._buffer = bytearray()
+                return buf
+            body = buf[body_start:body_end]
+            del buf[:body_end]
+            return body
+
+        # the body is only partially buffered: receive the rest in place
+        body = bytearray(length)
+        view = memoryview(body)
+        filled = len(buf) - body_start
+        view[:filled] = memoryview(buf)[body_start:]
+        buf.clear()
+
+        while filled < length:
+            try:
+                chunk = await self.receive_stream.receive()
+            except anyio.EndOfStream:
+                raise anyio.IncompleteRead from None
+            take = min(len(chunk), length - filled)
+            view[filled : filled + take] = memoryview(chunk)[:take]
+            filled += take
+            if take < len(chunk):
+                buf += memoryview(chunk)[take:]
+
+        return body
+
+
+async def read_package(
+    reader: FrameReader, codec: JsonCodec = _stdlib_codec
+) -> RawPackage:
+    return codec.decode(await reader.receive_frame())
+
+
+def frame_header(length: int) -> bytes:
+    return f"Content-Length: {length}\r\n\r\n".encode()
+
+
+async def write_raw_package(
+    sender: AnyByteSendStream, package: RawPackage, codec: JsonCodec = _stdlib_codec
+) -> None:
+    dumped = package_serialize(package, codec)
+    await sender.send(frame_header(len(dumped)) + dumped)
+
+
+@define
+class WriteStats:
+    """Counters of a `FrameWriter`."""
+
+    flushes: int = 0
+    frames: int = 0
+    bytes: int = 0
+    max_frames_per_flush: int = 0
+
+    @property
+    def frames_per_flush(self) -> float:
+        return self.frames / self.flushes if self.flushes else 0.0
+
+    def record(self, frames: int, size: int) -> None:
+        self.flushes += 1
+        self.frames += frames
+        self.bytes += size
+        self.max_frames_per_flush = max(self.max_frames_per_flush, frames)
+
+
+@define
+class FrameWriter:
+    """Write `Content-Length` framed messages to a byte stream in batches.
+
+    `write` queues a frame and returns; the task running `run` writes all frames
+    queued within one event loop tick (or once `flush_threshold` bytes are
+    pending) with a single `send` call, in the order they were queued. Writers
+    block while more than `max_pending_size` bytes are waiting to be flushed.
+
+    While `run` is not active, frames are written directly. A failed flush
+    stops `run`; it is raised by later calls and passed to `on_error`, as the
+    writers of the lost frames have already returned.
+    """
+
+    send_stream: AnyByteSendStream
+    flush_threshold: int = FLUSH_THRESHOLD
+    max_pending_size: int = MAX_PENDING_SIZE
+    on_error: Callable[[JsonRpcTransportError], None] | None = None
+
+    stats: WriteStats = field(factory=WriteStats, init=False)
+
+    _pending: list[bytes] = field(factory=list, init=False)
+    _pending_frames: int = field(default=0, init=False)
+    _pending_size: int = field(default=0, init=False)
+    _wakeup: anyio.Event = field(factory=anyio.Event, init=False)
+    _flushed: anyio.Event = field(factory=anyio.Event, init=False)
+    _running: bool = field(default=False, init=False)
+    _sending: bool = field(default=False, init=False)
+    _closing: bool = field(default=False, init=False)
+    _error: BaseException | None = field(default=None, init=False)
+
+    def _transport_error(self) -> JsonRpcTransportError:
+        error = JsonRpcTransportError("Failed to write to LSP server")
+        error.__cause__ = self._error
+        return error
+
+    def _check_error(self) -> None:
+        if self._error is not None:
+            raise self._transport_error()
+
+    async def write(self, body: bytes) -> None:
+        """Queue the content part of a frame for writing."""
+
+        self._check_error()
+        header = frame_header(len(body))
+
+        if not self._running:
+            await self.send_stream.send(header + body)
+            self.stats.record(1, len(header) + len(body))
+            return
+
+        self._pending += (header, body)
+        self._pending_frames += 1
+        self._pending_size += len(header) + len(body)
+        self._wakeup.set()
+
+        while self._pending_size > self.max_pending_size:
+            await self._flushed.wait()
+            self._check_error()
+            if not self._running:
+                # `run` was cancelled: the queued frames are never written
+                raise JsonRpcTransportError("Stopped writing to LSP server")
+
+    async def flush(self) -> None:
+        """Wait until all frames queued so far have been written."""
+
+        while (self._pending or self._sending) and self._running:
+            await self._flushed.wait()
+        self._check_error()
+
+    async def _flush_pending(self) -> None:
+        pending, frames, size = self._pending, self._pending_frames, self._pending_size
+        self._pending, self._pending_frames, self._pending_size = [], 0, 0
+        self._wakeup = anyio.Event()
+
+        self._sending = True
+        try:
+            await self.send_stream.send(b"".join(pending))
+        finally:
+            self._sending = False
+            flushed, self._flushed = self._flushed, anyio.Event()
+            flushed.set()
+        self.stats.record(frames, size)
+
+    async def run(
+        self, *, task_status: anyio.abc.TaskStatus[None] = anyio.TASK_STATUS_IGNORED
+    ) -> None:
+        """Flush queued frames until `aclose` is called or a write fails."""
+
+        self._running = True
+        task_status.started()
+        try:
+            while not (self._closing and not self._pending):
+                await self._wakeup.wait()
+                if self._pending_size < self.flush_threshold:
+                    # let other tasks ready in this tick queue their frames
+                    await anyio.lowlevel.checkpoint()
+                if self._pending:
+                    await self._flush_pending()
+        except Exception as e:  # noqa: BLE001
+            self._error = e
+            if self.on_error is not None:
+                self.on_error(self._transport_error())
+        finally:
+            self._running = False
+            self._flushed.set()
+
+    async def aclose(self) -> None:
+        """Flush queued frames and stop `run`."""
 
-    header = f"Content-Length: {length}\r\n\r\n".encode()
-    await sender.send(header + dumped)
+        self._closing = True
+        self._wakeup.set()
+        await self.flush()
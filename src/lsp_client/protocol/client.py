@@ -6,20 +6,26 @@ workspace management, configuration access, file operations, and LSP message han
 
 from __future__ import annotations
 
+import weakref
 from abc import abstractmethod
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Iterable, Mapping
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Protocol, runtime_checkable
 
 from lsp_client.client.document_state import DocumentStateManager
 from lsp_client.utils.config import ConfigurationMap
+from lsp_client.utils.line_index import DEFAULT_POSITION_ENCODING, PositionEncoding
+from lsp_client.utils.progress import ProgressDispatcher
 from lsp_client.utils.types import AnyPath, Notification, Request, Response
 from lsp_client.utils.uri import from_local_uri
 from lsp_client.utils.workspace import WORKSPACE_ROOT_DIR, Workspace
 
 from .lang import LanguageConfig
 
+_progress_dispatchers: dict[int, ProgressDispatcher] = {}
+"""Default dispatchers of the clients, by `id`."""
+
 
 @runtime_checkable
 class CapabilityClientProtocol(Protocol):
@@ -39,6 +45,30 @@ class CapabilityClientProtocol(Protocol):
     def get_config_map(self) -> ConfigurationMap:
         """Get the configuration map of the client."""
 
+    def get_progress_dispatcher(self) -> ProgressDispatcher:
+        """Get the dispatcher routing `$/progress` notifications by token.
+
+        Not abstract, for compatibility with existing implementations: a dispatcher
+        of the client by default, to which no notification is routed, so partial
+        results only arrive with the final response.
+        """
+
+        if (dispatcher := _progress_dispatchers.get(id(self))) is None:
+            dispatcher = _progress_dispatchers[id(self)] = ProgressDispatcher()
+            weakref.finalize(self, _progress_dispatchers.pop, id(self), None)
+        return dispatcher
+
+    def get_position_encoding(self) -> PositionEncoding:
+        """The position encoding negotiated with the server (UTF-16 by default)."""
+        return DEFAULT_POSITION_ENCODING
+
+    def invalidate_cached_responses(self, uris: Iterable[str]) -> None:
+        """Drop cached responses for documents changed outside of the client.
+
+        A no-op for clients without a response cache.
+        """
+        return
+
     @classmethod
     @abstractmethod
     def get_language_config(cls) -> LanguageConfig:
@@ -54,7 +84,15 @@ class CapabilityClientProtocol(Protocol):
         """
 
     @abstractmethod
-    async def request[R](self, req: Request, schema: type[Response[R]]) -> R: ...
+    async def request[R](
+        self, req: Request, schema: type[Response[R]], *, lazy: bool = False
+    ) -> R:
+        """Send a request and deserialize the response with `schema`.
+
+        Args:
+            lazy (bool): Return array results as a `LazySequence`, which
+                structures each element only when it is accessed.
+        """
 
     @abstractmethod
     async def notify(self, msg: Notification) -> None: ...
@@ -67,6 +105,17 @@ class CapabilityClientProtocol(Protocol):
     async def write_file(self, uri: str, content: str) -> None:
         """Write file content by URI."""
 
+    async def write_files(
+        self, contents: Mapping[str, str], *, max_concurrency: int = 16
+    ) -> None:
+        """Write the content of several files by URI.
+
+        Not abstract, for compatibility with existing implementations: writes the
+        files one at a time with `write_file` by default.
+        """
+        for uri, content in contents.items():
+            await self.write_file(uri, content)
+
     def as_uri(self, file_path: AnyPath) -> str:
         """
         Turn a file path into a URI.
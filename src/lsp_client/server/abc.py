@@ -9,12 +9,15 @@ from typing import Self, override
 import anyio
 import asyncer
 from anyio.abc import AnyByteReceiveStream, AnyByteSendStream
-from anyio.streams.buffered import BufferedByteReceiveStream
 from attrs import define, field
 from loguru import logger
 
 from lsp_client.jsonrpc.channel import ResponseTable, response_channel
-from lsp_client.jsonrpc.parse import read_raw_package, write_raw_package
+from lsp_client.jsonrpc.codec import JsonCodec, default_json_codec
+from lsp_client.jsonrpc.convert import package_serialize
+from lsp_client.jsonrpc.exception import JsonRpcTransportError
+from lsp_client.jsonrpc.id import ID
+from lsp_client.jsonrpc.parse import FrameReader, FrameWriter, WriteStats, read_package
 from lsp_client.jsonrpc.types import (
     RawNotification,
     RawPackage,
@@ -23,8 +26,12 @@ from lsp_client.jsonrpc.types import (
 )
 from lsp_client.server.types import ServerRequest
 from lsp_client.utils.channel import Sender
+from lsp_client.utils.progress import ProgressDispatcher
 from lsp_client.utils.workspace import Workspace
 
+CANCEL_REQUEST_TIMEOUT = 1.0
+"""Seconds to spend on sending `$/cancelRequest` for an abandoned request."""
+
 
 @define
 class Server(ABC):
@@ -74,6 +81,12 @@ class Server(ABC):
 class StreamServer(Server):
     """Server based on byte streams with JSON-RPC protocol handling."""
 
+    codec: JsonCodec = field(factory=default_json_codec, kw_only=True)
+    """JSON codec used to encode and decode packages on the wire."""
+
+    progress: ProgressDispatcher | None = field(default=None, kw_only=True)
+    """Receives subscribed `$/progress` values in the order they are read."""
+
     _resp_table: ResponseTable = field(factory=ResponseTable, init=False)
     """Dispatch response by response ID."""
 
@@ -137,20 +150,33 @@ class StreamServer(Server):
                 await self._resp_table.wait_until_empty()
 
     @cached_property
-    def _buffered_receive_stream(self) -> BufferedByteReceiveStream:
-        return BufferedByteReceiveStream(self.receive_stream)
+    def _frame_reader(self) -> FrameReader:
+        return FrameReader(self.receive_stream)
+
+    @cached_property
+    def _frame_writer(self) -> FrameWriter:
+        # requests whose frame was lost get no response
+        return FrameWriter(self.send_stream, on_error=self._resp_table.fail_all)
+
+    @property
+    def write_stats(self) -> WriteStats:
+        """Batching statistics of outgoing frames (e.g. frames per flush)."""
+        return self._frame_writer.stats
 
     async def kill(self) -> None:
         await self.receive_stream.aclose()
 
     async def send(self, package: RawPackage) -> None:
-        """Send a package to the runtime."""
-        await write_raw_package(self.send_stream, package)
+        """Queue a package to be sent to the runtime.
+
+        Packages sent within one event loop tick are written together.
+        """
+        await self._frame_writer.write(package_serialize(package, self.codec))
         logger.debug("Package sent: {}", package)
 
     async def receive(self) -> RawPackage | None:
         try:
-            package = await read_raw_package(self._buffered_receive_stream)
+            package = await read_package(self._frame_reader, self.codec)
             logger.debug("Received package: {}", package)
         except (anyio.EndOfStream, anyio.IncompleteRead, anyio.ClosedResourceError):
             logger.debug("Stream closed")
@@ -163,6 +189,9 @@ class StreamServer(Server):
     ) -> None:
         match package:
             case {"result": _, "id": id} | {"error": _, "id": id} as resp:
+                if id not in self._resp_table:
+                    logger.debug("Dropping response of abandoned request {}", id)
+                    return
                 await self._resp_table.send(id, resp)
             case {"id": id, "method": _} as server_req:
                 tx, rx = response_channel.create()
@@ -175,13 +204,45 @@ class StreamServer(Server):
     async def _dispatch(self, sender: Sender[ServerRequest]) -> None:
         async with asyncer.create_task_group() as tg:
             while package := await self.receive():
+                match package:
+                    case {
+                        "method": "$/progress",
+                        "params": {"token": str() | int() as token, "value": value},
+                    } if self.progress and self.progress.dispatch(token, value):
+                        # delivered before the response that follows it is read
+                        continue
                 tg.soonify(self._handle_package)(sender, package)
 
     @override
     async def request(self, request: RawRequest) -> RawResponsePackage:
-        rx = self._resp_table.reserve(request["id"])
-        await self.send(request)
-        return await rx.receive()
+        id = request["id"]
+        rx = self._resp_table.reserve(id)
+        try:
+            await self.send(request)
+            return await rx.receive()
+        except anyio.get_cancelled_exc_class():
+            with anyio.move_on_after(CANCEL_REQUEST_TIMEOUT, shield=True):
+                await self._abandon_request(id)
+            raise
+        except BaseException:
+            # e.g. the transport failed: no response will come for `id`
+            await self._resp_table.release(id)
+            raise
+
+    async def _abandon_request(self, id: ID | None) -> None:
+        """Release the response slot of `id` and ask the server to stop working on it."""
+
+        await self._resp_table.release(id)
+        try:
+            await self.notify(
+                {"jsonrpc": "2.0", "method": "$/cancelRequest", "params": {"id": id}}
+            )
+        except (
+            JsonRpcTransportError,
+            anyio.BrokenResourceError,
+            anyio.ClosedResourceError,
+        ):
+            logger.debug("Failed to cancel request {}, server is gone", id)
 
     @override
     async def notify(self, notification: RawNotification) -> None:
@@ -198,6 +259,7 @@ class StreamServer(Server):
             self.manage_resources(workspace),
             asyncer.create_task_group() as tg,
         ):
+            await tg.start(self._frame_writer.run)
             await self.on_started(workspace, sender)
             tg.soonify(self._dispatch)(sender)
 
@@ -205,3 +267,4 @@ class StreamServer(Server):
                 yield self
             finally:
                 await self.on_shutdown()
+                await self._frame_writer.aclose()
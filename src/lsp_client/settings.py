@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+from pathlib import Path
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+type JsonCodecName = Literal["stdlib", "orjson", "msgspec"]
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -12,6 +17,9 @@ class Settings(BaseSettings):
 
     disable_auto_installation: bool = False
     enable_container: bool = False
+    json_codec: JsonCodecName = "stdlib"
+    # the on-disk result store and symbol index, see `client.store.default_cache_dir`
+    cache_dir: Path | None = None
 
 
 settings = Settings()
@@ -0,0 +1,198 @@
+"""Run many requests with a bound on how many are in flight."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable, Sequence
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import TYPE_CHECKING, Final
+
+import anyio
+from anyio.streams.memory import MemoryObjectSendStream
+
+from lsp_client.utils.types import AnyPath, Position, lsp_type
+
+if TYPE_CHECKING:
+    from lsp_client.protocol import CapabilityClientProtocol
+
+DEFAULT_MAX_CONCURRENCY: Final = 32
+"""Requests in flight at a time, unless specified otherwise."""
+
+type PositionRequest[R] = Callable[
+    [lsp_type.TextDocumentIdentifier, Position], Awaitable[R]
+]
+"""A request at a position of a document."""
+
+
+async def gather_limited[T, R](
+    items: Sequence[T],
+    fn: Callable[[T], Awaitable[R]],
+    *,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> list[R]:
+    """
+    Call `fn` on every item, with at most `max_concurrency` calls in flight.
+
+    Returns:
+        The results, in the order of `items`.
+
+    Raises:
+        Exception: The first error raised by `fn`; the other calls are cancelled.
+    """
+
+    async with as_completed(items, fn, max_concurrency=max_concurrency) as completed:
+        results = {i: result async for i, _, result in completed}
+    return [results[i] for i in range(len(items))]
+
+
+@asynccontextmanager
+async def as_completed[T, R](
+    items: Sequence[T],
+    fn: Callable[[T], Awaitable[R]],
+    *,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> AsyncGenerator[AsyncIterator[tuple[int, T, R]]]:
+    """
+    Call `fn` on every item and stream the results as the calls complete.
+
+    At most `max_concurrency` calls are in flight; a call only starts once the
+    results of the previous ones are consumed or buffered. Leaving the context
+    early cancels the remaining calls.
+
+    Yields:
+        An iterator of `(index, item, result)`, in completion order. It raises
+        the first error raised by `fn`, once the remaining calls are cancelled.
+
+    Example:
+        async with as_completed(positions, query) as results:
+            async for i, position, result in results:
+                ...
+    """
+
+    pending = iter(enumerate(items))
+
+    async def produce(send: MemoryObjectSendStream[tuple[int, T, R]]) -> None:
+        async with anyio.create_task_group() as tg:
+
+            async def worker() -> None:
+                # the workers share `pending`, so every item is taken exactly once
+                async with send.clone() as tx:
+                    for i, item in pending:
+                        await tx.send((i, item, await fn(item)))
+
+            for _ in range(max(1, min(max_concurrency, len(items)))):
+                tg.start_soon(worker)
+
+    async with stream_from(produce, max_buffer_size=max_concurrency) as results:
+        yield results
+
+
+async def gather_at_positions[R](
+    client: CapabilityClientProtocol,
+    file_path: AnyPath,
+    positions: Sequence[Position],
+    request: PositionRequest[R],
+    *,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> list[R]:
+    """
+    Send `request` at every position of a file, opening it once.
+
+    At most `max_concurrency` requests are in flight at a time.
+
+    Returns:
+        The result at each position, in the order of `positions`.
+    """
+
+    async with client.open_files(file_path):
+        text_document = lsp_type.TextDocumentIdentifier(uri=client.as_uri(file_path))
+        return await gather_limited(
+            positions,
+            partial(request, text_document),
+            max_concurrency=max_concurrency,
+        )
+
+
+@asynccontextmanager
+async def stream_at_positions[R](
+    client: CapabilityClientProtocol,
+    file_path: AnyPath,
+    positions: Sequence[Position],
+    request: PositionRequest[R],
+    *,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> AsyncGenerator[AsyncIterator[tuple[int, Position, R]]]:
+    """
+    Like `gather_at_positions`, streaming the results as they arrive.
+
+    The file stays open until the context is left.
+
+    Yields:
+        An iterator of `(index, position, result)`, in completion order, as
+        `as_completed`.
+    """
+
+    async with client.open_files(file_path):
+        text_document = lsp_type.TextDocumentIdentifier(uri=client.as_uri(file_path))
+        async with as_completed(
+            positions,
+            partial(request, text_document),
+            max_concurrency=max_concurrency,
+        ) as results:
+            yield results
+
+
+@asynccontextmanager
+async def stream_from[T](
+    produce: Callable[[MemoryObjectSendStream[T]], Awaitable[None]],
+    *,
+    max_buffer_size: float = 0,
+) -> AsyncGenerator[AsyncIterator[T]]:
+    """
+    Run `produce` in the background and stream the values it sends.
+
+    The stream ends once `produce` returns; it does not need to close the send
+    stream itself. Leaving the context early cancels `produce`.
+
+    Yields:
+        An iterator of the values sent by `produce`. It raises the error raised
+        by `produce` after the values sent before it, rather than an exception
+        group of the task running it.
+    """
+
+    send, receive = anyio.create_memory_object_stream[T](max_buffer_size)
+    error: list[BaseException] = []
+
+    async def run() -> None:
+        async with send:
+            try:
+                await produce(send)
+            except Exception as e:  # noqa: BLE001
+                # raised to the consumer instead of in an exception group
+                error.append(_unwrap(e))
+
+    async def values() -> AsyncIterator[T]:
+        async for value in receive:
+            yield value
+        if error:
+            raise error[0]
+
+    try:
+        async with receive, anyio.create_task_group() as tg:
+            tg.start_soon(run)
+            yield values()
+            tg.cancel_scope.cancel()
+    except ExceptionGroup as eg:
+        # errors of the consumer are the only ones in the group
+        exc = _unwrap(eg)
+        if exc is eg:
+            raise
+        raise exc from exc.__cause__
+
+
+def _unwrap(exc: BaseException) -> BaseException:
+    """The single error of a (nested) exception group, or `exc` itself."""
+
+    while isinstance(exc, BaseExceptionGroup) and len(exc.exceptions) == 1:
+        exc = exc.exceptions[0]
+    return exc
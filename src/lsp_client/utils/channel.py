@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections.abc import AsyncGenerator, Hashable
 from contextlib import asynccontextmanager
-from typing import NamedTuple, Self
+from typing import NamedTuple, Self, cast
 
 import anyio
 from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
@@ -45,45 +45,109 @@ class oneshot_channel[T](NamedTuple):
         )
 
 
+@define
+class OneShotSlot[T]:
+    """Single-use slot receiving one item, lighter than a memory stream pair."""
+
+    _event: anyio.Event = field(factory=anyio.Event, init=False)
+    _item: T | None = field(default=None, init=False)
+    _closed: bool = field(default=False, init=False)
+    _error: BaseException | None = field(default=None, init=False)
+
+    def set(self, item: T) -> None:
+        self._item = item
+        self._event.set()
+
+    def close(self) -> None:
+        self._closed = True
+        self._event.set()
+
+    def fail(self, error: BaseException) -> None:
+        """Raise `error` to the receiver instead of an item."""
+
+        self._error = error
+        self._event.set()
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise self._error
+        if self._closed:
+            raise anyio.EndOfStream
+
+    async def receive(self) -> T:
+        await self._event.wait()
+        self._check()
+        return cast(T, self._item)
+
+    def try_receive(self) -> T | None:
+        if not self._event.is_set():
+            raise anyio.WouldBlock
+        self._check()
+        return self._item
+
+
 @define
 class OneShotTable[T]:
-    """Dispatch data to one-shot senders by ID."""
+    """Dispatch data to one-shot slots by ID."""
+
+    _pending: dict[Hashable, OneShotSlot[T]] = Factory(dict)
+    _empty: anyio.Event | None = field(default=None, init=False)
+    """Set when the table becomes empty, created lazily by `wait_until_empty`."""
 
-    _pending: dict[Hashable, OneShotSender[T]] = Factory(dict)
-    _condition: anyio.Condition = field(factory=anyio.Condition, init=False)
+    def __contains__(self, id: Hashable) -> bool:
+        return id in self._pending
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _pop(self, id: Hashable) -> OneShotSlot[T] | None:
+        slot = self._pending.pop(id, None)
+        if not self._pending and self._empty is not None:
+            self._empty.set()
+            self._empty = None
+        return slot
 
     async def send(self, id: Hashable, data: T) -> None:
-        if id not in self._pending:
-            raise ValueError(f"Pending request of id {id} not found")
+        self.send_nowait(id, data)
 
-        await self._pending[id].send(data)
-        self._pending.pop(id)
-        if not self._pending:
-            async with self._condition:
-                self._condition.notify_all()
+    def send_nowait(self, id: Hashable, data: T) -> None:
+        if (slot := self._pop(id)) is None:
+            raise ValueError(f"Pending request of id {id} not found")
+        slot.set(data)
 
-    def reserve(self, id: Hashable) -> OneShotReceiver[T]:
+    def reserve(self, id: Hashable) -> OneShotSlot[T]:
         if id in self._pending:
             raise ValueError(f"Sender with id {id} already registered")
 
-        tx, rx = oneshot_channel.create()
-        self._pending[id] = tx
-        return rx
+        slot = self._pending[id] = OneShotSlot[T]()
+        return slot
+
+    async def release(self, id: Hashable) -> None:
+        """Drop a reservation. Data sent to `id` afterwards is rejected."""
+
+        if (slot := self._pop(id)) is not None:
+            slot.close()
+
+    def fail_all(self, error: BaseException) -> None:
+        """Raise `error` to every pending receiver, e.g. when the transport fails."""
+
+        for id in list(self._pending):
+            if (slot := self._pop(id)) is not None:
+                slot.fail(error)
 
     async def receive(self, id: Hashable) -> T:
-        rx = self.reserve(id)
+        slot = self.reserve(id)
         try:
-            return await rx.receive()
+            return await slot.receive()
         finally:
-            self._pending.pop(id, None)
-            if not self._pending:
-                async with self._condition:
-                    self._condition.notify_all()
+            if self._pending.get(id) is slot:
+                self._pop(id)
 
     async def wait_until_empty(self) -> None:
-        async with self._condition:
-            while self._pending:
-                await self._condition.wait()
+        while self._pending:
+            if self._empty is None:
+                self._empty = anyio.Event()
+            await self._empty.wait()
 
     @property
     def completed(self) -> bool:
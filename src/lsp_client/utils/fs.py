@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+import secrets
+import stat
+from pathlib import Path
+
+import anyio.to_thread
+
+type FileStamp = tuple[int, int]
+"""The `(mtime_ns, size)` of a file, used to detect changes."""
+
+
+def file_stamp(path: Path) -> FileStamp | None:
+    """The stamp of the file at `path`, or `None` if it cannot be read."""
+
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def write_text_atomic(path: Path, content: str, *, encoding: str = "utf-8") -> None:
+    """
+    Write `content` to `path` through a temporary file renamed over it.
+
+    Readers (including the language server) see either the old or the new content,
+    never a partially written file. The permissions of an existing file are kept.
+    """
+
+    # replace the target of a symlink, not the link itself
+    path = Path(os.path.realpath(path))
+    try:
+        mode: int | None = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = None
+
+    fd, tmp = _create_temp(path)
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            f.write(content)
+        if mode is not None:
+            tmp.chmod(mode)
+        tmp.replace(path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _create_temp(path: Path) -> tuple[int, Path]:
+    """Create a temporary file next to `path`, with the mode a new `path` would get."""
+
+    while True:
+        tmp = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+        try:
+            # unlike `mkstemp` (0o600), the umask applies as for any new file
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
+            continue
+        return fd, tmp
+
+
+async def awrite_text_atomic(
+    path: Path, content: str, *, encoding: str = "utf-8"
+) -> None:
+    """Async version of `write_text_atomic`, running in a worker thread."""
+
+    await anyio.to_thread.run_sync(
+        lambda: write_text_atomic(path, content, encoding=encoding)
+    )
@@ -0,0 +1,154 @@
+"""Conversion between LSP positions and offsets into a Python `str`.
+
+LSP positions count columns in the negotiated position encoding (UTF-16 unless
+the server picks another one), while Python strings are indexed by code point.
+A `LineIndex` records where each line starts, so converting a position costs a
+list lookup plus a scan of a single line, and converting an offset a bisection.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from collections.abc import Sequence
+from typing import Final
+
+from attrs import field, frozen
+
+from lsp_client.utils.types import lsp_type
+
+type PositionEncoding = lsp_type.PositionEncodingKind | str
+
+DEFAULT_POSITION_ENCODING: Final = lsp_type.PositionEncodingKind.Utf16
+"""The encoding every server supports, used unless another one is negotiated."""
+
+SUPPORTED_POSITION_ENCODINGS: Final[Sequence[lsp_type.PositionEncodingKind]] = (
+    # Python strings are indexed by code point: UTF-32 columns need no conversion
+    lsp_type.PositionEncodingKind.Utf32,
+    lsp_type.PositionEncodingKind.Utf16,
+    lsp_type.PositionEncodingKind.Utf8,
+)
+"""Encodings offered to the server, in order of preference."""
+
+_LINE_BREAK = re.compile(r"\r\n?|\n")
+
+
+def _char_units(char: str, encoding: PositionEncoding) -> int:
+    code = ord(char)
+    match encoding:
+        case lsp_type.PositionEncodingKind.Utf16:
+            return 2 if code > 0xFFFF else 1
+        case lsp_type.PositionEncodingKind.Utf8:
+            return (
+                1 if code < 0x80 else 2 if code < 0x800 else 3 if code < 0x10000 else 4
+            )
+        case _:
+            return 1
+
+
+def encoded_length(text: str, encoding: PositionEncoding) -> int:
+    """Length of `text` in code units of `encoding`."""
+
+    if text.isascii():
+        return len(text)
+    match encoding:
+        case lsp_type.PositionEncodingKind.Utf16:
+            return len(text.encode("utf-16-le")) // 2
+        case lsp_type.PositionEncodingKind.Utf8:
+            return len(text.encode("utf-8"))
+        case _:
+            return len(text)
+
+
+@frozen
+class LineIndex:
+    """Line starts of a text, for position <-> offset conversion.
+
+    Lines end with `\\n`, `\\r\\n` or `\\r`, as in the LSP specification. Positions
+    past the end of a line resolve to the end of that line, and positions past the
+    last line to the end of the text.
+    """
+
+    text: str
+    line_starts: Sequence[int] = field(repr=False)
+    """Offset of the first character of each line."""
+    line_ends: Sequence[int] = field(repr=False)
+    """Offset of the line break (or end of text) of each line."""
+
+    @classmethod
+    def from_text(cls, text: str) -> LineIndex:
+        starts = [0]
+        ends: list[int] = []
+        for m in _LINE_BREAK.finditer(text):
+            ends.append(m.start())
+            starts.append(m.end())
+        ends.append(len(text))
+        return cls(text, starts, ends)
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_starts)
+
+    def offset_at(
+        self,
+        position: lsp_type.Position,
+        encoding: PositionEncoding = DEFAULT_POSITION_ENCODING,
+    ) -> int:
+        """The offset of an LSP `position`, with columns counted in `encoding`."""
+
+        if position.line >= len(self.line_starts):
+            return len(self.text)
+
+        start = self.line_starts[position.line]
+        end = self.line_ends[position.line]
+        if encoding == lsp_type.PositionEncodingKind.Utf32:
+            return min(start + position.character, end)
+
+        line = self.text[start:end]
+        if line.isascii():
+            return min(start + position.character, end)
+
+        units = 0
+        for i, char in enumerate(line):
+            if units >= position.character:
+                return start + i
+            units += _char_units(char, encoding)
+        return end
+
+    def position_at(
+        self, offset: int, encoding: PositionEncoding = DEFAULT_POSITION_ENCODING
+    ) -> lsp_type.Position:
+        """The LSP position of `offset`, with columns counted in `encoding`."""
+
+        offset = max(0, min(offset, len(self.text)))
+        line = bisect_right(self.line_starts, offset) - 1
+        # an offset inside a `\r\n` line break belongs to the end of the line
+        column_end = min(offset, self.line_ends[line])
+        start = self.line_starts[line]
+        return lsp_type.Position(
+            line=line,
+            character=encoded_length(self.text[start:column_end], encoding),
+        )
+
+    def range_offsets(
+        self,
+        range: lsp_type.Range,
+        encoding: PositionEncoding = DEFAULT_POSITION_ENCODING,
+    ) -> tuple[int, int]:
+        """The `(start, end)` offsets of an LSP `range`."""
+        return (
+            self.offset_at(range.start, encoding),
+            self.offset_at(range.end, encoding),
+        )
+
+    def range_of(
+        self,
+        start: int,
+        end: int,
+        encoding: PositionEncoding = DEFAULT_POSITION_ENCODING,
+    ) -> lsp_type.Range:
+        """The LSP range between the offsets `start` and `end`."""
+        return lsp_type.Range(
+            start=self.position_at(start, encoding),
+            end=self.position_at(end, encoding),
+        )
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import math
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generator,
+    Iterable,
+)
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+import anyio
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from attrs import define, field
+
+from lsp_client.jsonrpc.id import jsonrpc_id
+from lsp_client.utils.batch import stream_from
+from lsp_client.utils.types import lsp_type
+
+
+def new_progress_token(kind: str) -> lsp_type.ProgressToken:
+    """Create a progress token that cannot collide with server-created tokens."""
+    return f"lsp-client/{kind}/{jsonrpc_id()}"
+
+
+@define
+class WorkDoneProgressTracker:
+    """
+    Track whether the server is busy, e.g. indexing the workspace.
+
+    The server is busy while it has active work done progress tokens, or while a
+    server-specific status (e.g. rust-analyzer's `experimental/serverStatus`)
+    reports it is not quiescent.
+    """
+
+    _active: dict[lsp_type.ProgressToken, str | None] = field(factory=dict)
+    _busy: set[str] = field(factory=set)
+    _changed: anyio.Event | None = field(default=None, init=False)
+
+    @property
+    def idle(self) -> bool:
+        return not self._active and not self._busy
+
+    @property
+    def active(self) -> dict[lsp_type.ProgressToken, str | None]:
+        """Titles of the active progress tokens."""
+        return dict(self._active)
+
+    def _notify(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    async def _wait_changed(self) -> None:
+        if self._changed is None:
+            self._changed = anyio.Event()
+        await self._changed.wait()
+
+    def begin(self, token: lsp_type.ProgressToken, title: str | None = None) -> None:
+        self._active[token] = title
+        self._notify()
+
+    def end(self, token: lsp_type.ProgressToken) -> None:
+        if token in self._active:
+            del self._active[token]
+            self._notify()
+
+    def set_busy(self, source: str, busy: bool) -> None:
+        """Report a server-specific busy state, identified by `source`."""
+
+        if busy:
+            self._busy.add(source)
+        else:
+            self._busy.discard(source)
+        self._notify()
+
+    async def wait_until_idle(self, quiet_period: float = 0.0) -> None:
+        """Wait until the server is idle, and stays so for `quiet_period` seconds."""
+
+        while True:
+            while not self.idle:
+                await self._wait_changed()
+            if quiet_period <= 0:
+                return
+            with anyio.move_on_after(quiet_period) as scope:
+                await self._wait_changed()
+            if scope.cancelled_caught and self.idle:
+                return
+
+
+@define
+class ProgressDispatcher:
+    """
+    Route `$/progress` notifications to subscribers by token.
+
+    Values are delivered in the order the notifications are received. A value
+    for a token without subscriber is left to the regular notification hooks,
+    e.g. work done progress is recorded in `work_done`.
+    """
+
+    work_done: WorkDoneProgressTracker = field(factory=WorkDoneProgressTracker)
+
+    _subscribers: dict[lsp_type.ProgressToken, MemoryObjectSendStream[Any]] = field(
+        factory=dict
+    )
+
+    @contextmanager
+    def subscribe(
+        self, token: lsp_type.ProgressToken
+    ) -> Generator[MemoryObjectReceiveStream[Any], None, None]:
+        """Receive the progress values of `token` until `finish` is called."""
+
+        if token in self._subscribers:
+            raise ValueError(f"Progress token {token!r} already subscribed")
+
+        tx, rx = anyio.create_memory_object_stream[Any](math.inf)
+        self._subscribers[token] = tx
+        try:
+            with rx:
+                yield rx
+        finally:
+            self.finish(token)
+
+    def finish(self, token: lsp_type.ProgressToken) -> None:
+        """End the subscription of `token`; values already received are kept."""
+
+        if (tx := self._subscribers.pop(token, None)) is not None:
+            tx.close()
+
+    def dispatch(self, token: lsp_type.ProgressToken, value: Any) -> bool:  # noqa: ANN401
+        """Deliver a progress value. Return whether `token` has a subscriber."""
+
+        if (tx := self._subscribers.get(token)) is None:
+            return False
+        tx.send_nowait(value)
+        return True
+
+    @asynccontextmanager
+    async def partial_results[R, T](
+        self,
+        send_request: Callable[[lsp_type.ProgressToken], Awaitable[R]],
+        *,
+        partial_items: Callable[[Any], Iterable[T]],
+        result_items: Callable[[R], Iterable[T]],
+    ) -> AsyncGenerator[AsyncIterator[T]]:
+        """
+        Send a request with a `partialResultToken` and stream its items.
+
+        Items of each partial result are yielded as soon as the server reports
+        them, followed by the items of the final response. If the request fails,
+        its error is raised after the items of the partial results received.
+        Leaving the context before the response arrives cancels the request.
+
+        Args:
+            send_request: Send the request with the given partial result token.
+            partial_items: Extract items from a raw `$/progress` value.
+            result_items: Extract items from the final response.
+        """
+
+        token = new_progress_token("partial")
+
+        async def produce(send: MemoryObjectSendStream[T]) -> None:
+            result: list[R] = []
+            error: list[Exception] = []
+
+            async def run() -> None:
+                try:
+                    result.append(await send_request(token))
+                except Exception as e:  # noqa: BLE001
+                    # raised once the partial results received so far are sent
+                    error.append(e)
+                finally:
+                    # partial results are sent before the response
+                    self.finish(token)
+
+            with self.subscribe(token) as partials:
+                async with anyio.create_task_group() as tg:
+                    tg.start_soon(run)
+                    async for value in partials:
+                        for item in partial_items(value):
+                            await send.send(item)
+            if error:
+                raise error[0]
+            for item in result_items(result[0]):
+                await send.send(item)
+
+        async with stream_from(produce) as items:
+            yield items
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from collections import deque
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from functools import cached_property
 
 from attrs import field, frozen
@@ -80,14 +81,72 @@ class DocumentSymbolHierarchy:
         # This provides efficient O(1) reverse lookup for symbols obtained from this hierarchy.
         return {id(s): path for path, s in self.flattened.items()}
 
+    @cached_property
+    def _children_by_name(self) -> dict[int, dict[str, lsp_type.DocumentSymbol]]:
+        # keyed by id(node) like `_symbol_to_path`; the first child of a name wins
+        result: dict[int, dict[str, lsp_type.DocumentSymbol]] = {}
+        for node in self.iter_dfs():
+            if node.children:
+                by_name = result[id(node)] = {}
+                for child in node.children:
+                    by_name.setdefault(child.name, child)
+        return result
+
+    @cached_property
+    def _interval_index(
+        self,
+    ) -> tuple[list[tuple[int, int]], list[lsp_type.DocumentSymbol | None]]:
+        """Split the document at every range boundary, with the owner of each segment.
+
+        The symbol found for a position is the same across a segment, so a position
+        lookup is a bisection over the boundaries.
+        """
+
+        boundaries = sorted(
+            {as_pos(s.range.start) for s in self.iter_dfs()}
+            | {as_pos(s.range.end) for s in self.iter_dfs()}
+        )
+        segment = {pos: i for i, pos in enumerate(boundaries)}
+        owners: list[lsp_type.DocumentSymbol | None] = [None] * len(boundaries)
+
+        def span(symbol: lsp_type.DocumentSymbol) -> range:
+            return range(
+                segment[as_pos(symbol.range.start)], segment[as_pos(symbol.range.end)]
+            )
+
+        for i in span(self.root):
+            owners[i] = self.root
+
+        # hand the segments of each symbol over to its children, which are thus
+        # clipped to it; as in a scan of the children in order, the first sibling
+        # containing a segment keeps it unless a later one nests inside it
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if not node.children:
+                continue
+            siblings = {id(child) for child in node.children}
+            for child in node.children:
+                for i in span(child):
+                    owner = owners[i]
+                    if owner is node or (
+                        owner is not None
+                        and id(owner) in siblings
+                        and is_narrower(child.range, owner.range)
+                    ):
+                        owners[i] = child
+            stack.extend(node.children)
+        return boundaries, owners
+
     def at_path(self, path: DocumentSymbolPath) -> lsp_type.DocumentSymbol | None:
         """Return the symbol at the given path, or None if not found."""
         if not path.symbols or path.symbols[0] != self.root.name:
             return None
 
+        children_by_name = self._children_by_name
         current = self.root
         for name in path.symbols[1:]:
-            child = next((c for c in current.children or () if c.name == name), None)
+            child = children_by_name.get(id(current), {}).get(name)
             if child is None:
                 return None
             current = child
@@ -96,22 +155,35 @@ class DocumentSymbolHierarchy:
     def at_position(
         self, position: lsp_type.Position
     ) -> lsp_type.DocumentSymbol | None:
-        """Return the narrowest symbol containing the given position."""
-        if not contains(self.root.range, position):
-            return None
-
-        current = self.root
-        while True:
-            best_child = None
-            for child in current.children or ():
-                if contains(child.range, position) and (
-                    best_child is None or is_narrower(child.range, best_child.range)
-                ):
-                    best_child = child
-
-            if best_child is None:
-                return current
-            current = best_child
+        """Return the narrowest symbol containing the given position.
+
+        The first lookup indexes the ranges of all symbols: each symbol visits
+        the segments of its range, so this takes O(n log n) for shallow trees
+        and up to O(n * depth) for deeply nested ones. Each lookup then takes
+        O(log n).
+        """
+        boundaries, owners = self._interval_index
+        i = bisect_right(boundaries, as_pos(position)) - 1
+        return owners[i] if i >= 0 else None
+
+    def at_positions(
+        self, positions: Iterable[lsp_type.Position]
+    ) -> list[lsp_type.DocumentSymbol | None]:
+        """Return the narrowest symbol containing each of the given positions.
+
+        Sorted positions are resolved in a single forward pass over the index.
+        """
+        boundaries, owners = self._interval_index
+        result: list[lsp_type.DocumentSymbol | None] = []
+        lo, last = 0, (-1, -1)
+        for position in positions:
+            pos = as_pos(position)
+            if pos < last:
+                lo = 0
+            i = bisect_right(boundaries, pos, lo) - 1
+            result.append(owners[i] if i >= 0 else None)
+            lo, last = max(i, 0), pos
+        return result
 
     def get_path(self, symbol: lsp_type.DocumentSymbol) -> DocumentSymbolPath | None:
         """Return the path to the given symbol object, or None if not in hierarchy."""
@@ -0,0 +1,75 @@
+"""Minimal `textDocument/didChange` events between two versions of a document."""
+
+from __future__ import annotations
+
+from lsp_client.utils.line_index import (
+    DEFAULT_POSITION_ENCODING,
+    LineIndex,
+    PositionEncoding,
+)
+from lsp_client.utils.types import lsp_type
+
+
+def common_prefix_length(a: str, b: str) -> int:
+    """Length of the common prefix of `a` and `b`.
+
+    Compares slices by binary search, which runs in C instead of a Python-level
+    loop over characters.
+    """
+
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def common_suffix_length(a: str, b: str, limit: int) -> int:
+    """Length of the common suffix of `a` and `b`, at most `limit`."""
+
+    lo, hi = 0, min(len(a), len(b), limit)
+    la, lb = len(a), len(b)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[la - mid : la - lo] == b[lb - mid : lb - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def diff_content_changes(
+    old: str | LineIndex,
+    new: str,
+    encoding: PositionEncoding = DEFAULT_POSITION_ENCODING,
+) -> list[lsp_type.TextDocumentContentChangePartial]:
+    """Describe the change from `old` to `new` as a single range replacement.
+
+    The range covers everything between the common prefix and the common suffix,
+    so localized edits (e.g. a rename in a large file) produce a small event. A
+    `\\r\\n` line break is never split by the range boundaries.
+
+    `old` may be given as a `LineIndex`, e.g. the cached index of a document state.
+    """
+
+    index = old if isinstance(old, LineIndex) else LineIndex.from_text(old)
+    text = index.text
+
+    start = common_prefix_length(text, new)
+    if start and text[start - 1] == "\r":
+        start -= 1
+    suffix = common_suffix_length(text, new, min(len(text), len(new)) - start)
+    end = len(text) - suffix
+    if suffix and text[end - 1 : end + 1] == "\r\n":
+        suffix -= 1
+        end += 1
+
+    return [
+        lsp_type.TextDocumentContentChangePartial(
+            range=index.range_of(start, end, encoding),
+            text=new[start : len(new) - suffix],
+        )
+    ]
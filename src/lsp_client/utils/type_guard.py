@@ -1,78 +1,58 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
-from typing import TypeGuard
+from types import UnionType
+from typing import TypeGuard, get_args
 
+from lsp_client.jsonrpc.lazy import LazySequence
 from lsp_client.utils.types import lsp_type
 
 
-def is_locations(result: object) -> TypeGuard[Iterable[lsp_type.Location]]:
+def _is_iterable_of(result: object, item_type: type | UnionType) -> bool:
+    if isinstance(result, LazySequence):
+        # decide from the declared element type, without structuring elements
+        declared = get_args(result.item_type) or (result.item_type,)
+        return all(issubclass(t, item_type) for t in declared)
     return (
         result is not None
         and isinstance(result, Iterable)
-        and all(isinstance(item, lsp_type.Location) for item in result)
+        and all(isinstance(item, item_type) for item in result)
     )
 
 
+def is_locations(result: object) -> TypeGuard[Iterable[lsp_type.Location]]:
+    return _is_iterable_of(result, lsp_type.Location)
+
+
 def is_definition_links(result: object) -> TypeGuard[Iterable[lsp_type.DefinitionLink]]:
-    return (
-        result is not None
-        and isinstance(result, Iterable)
-        and all(isinstance(item, lsp_type.LocationLink) for item in result)
-    )
+    return _is_iterable_of(result, lsp_type.LocationLink)
 
 
 def is_location_links(result: object) -> TypeGuard[Iterable[lsp_type.LocationLink]]:
-    return (
-        result is not None
-        and isinstance(result, Iterable)
-        and all(isinstance(item, lsp_type.LocationLink) for item in result)
-    )
+    return _is_iterable_of(result, lsp_type.LocationLink)
 
 
 def is_workspace_symbols(
     result: object,
 ) -> TypeGuard[Iterable[lsp_type.WorkspaceSymbol]]:
-    return (
-        result is not None
-        and isinstance(result, Iterable)
-        and all(isinstance(item, lsp_type.WorkspaceSymbol) for item in result)
-    )
+    return _is_iterable_of(result, lsp_type.WorkspaceSymbol)
 
 
 def is_document_symbols(result: object) -> TypeGuard[Iterable[lsp_type.DocumentSymbol]]:
-    return (
-        result is not None
-        and isinstance(result, Iterable)
-        and all(isinstance(item, lsp_type.DocumentSymbol) for item in result)
-    )
+    return _is_iterable_of(result, lsp_type.DocumentSymbol)
 
 
 def is_symbol_information_seq(
     result: object,
 ) -> TypeGuard[Iterable[lsp_type.SymbolInformation]]:
-    return (
-        result is not None
-        and isinstance(result, Iterable)
-        and all(isinstance(item, lsp_type.SymbolInformation) for item in result)
-    )
+    return _is_iterable_of(result, lsp_type.SymbolInformation)
 
 
 def is_completion_items(result: object) -> TypeGuard[Iterable[lsp_type.CompletionItem]]:
-    return (
-        result is not None
-        and isinstance(result, Iterable)
-        and all(isinstance(item, lsp_type.CompletionItem) for item in result)
-    )
+    return _is_iterable_of(result, lsp_type.CompletionItem)
 
 
 def is_code_actions(
     result: object,
 ) -> TypeGuard[Iterable[lsp_type.Command | lsp_type.CodeAction]]:
-    return (
-        result is not None
-        and isinstance(result, Iterable)
-        and all(
-            isinstance(item, lsp_type.Command | lsp_type.CodeAction) for item in result
-        )
-    )
+    return _is_iterable_of(result, lsp_type.Command | lsp_type.CodeAction)
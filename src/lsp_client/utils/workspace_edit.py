@@ -5,11 +5,21 @@ from collections.abc import Iterator, Mapping, Sequence
 
 import anyio
 import anyio.to_thread
-from attrs import define
+import asyncer
+from attrs import define, evolve
 from loguru import logger
 
-from lsp_client.exception import EditApplicationError, VersionMismatchError
+from lsp_client.exception import (
+    EditApplicationError,
+    InvalidTextEditError,
+    VersionMismatchError,
+)
 from lsp_client.protocol import CapabilityClientProtocol
+from lsp_client.utils.line_index import (
+    DEFAULT_POSITION_ENCODING,
+    LineIndex,
+    PositionEncoding,
+)
 from lsp_client.utils.types import lsp_type
 from lsp_client.utils.uri import from_local_uri
 
@@ -28,69 +38,80 @@ def get_edit_text(edit: AnyTextEdit) -> str:
             return edit.new_text
 
 
-def apply_text_edits(content: str, edits: Sequence[AnyTextEdit]) -> str:
+def _edit_offset(
+    index: LineIndex,
+    position: lsp_type.Position,
+    encoding: PositionEncoding,
+    edit_index: int,
+) -> int:
+    # the position right after the last line is a common way to express the end
+    last_line = index.line_count - 1
+    if position.line > last_line and (
+        position.line > last_line + 1 or position.character > 0
+    ):
+        raise InvalidTextEditError(
+            message=(
+                f"Text edit {edit_index} is out of range: line {position.line} "
+                f"of a document with {index.line_count} lines"
+            ),
+            edit_index=edit_index,
+        )
+    return index.offset_at(position, encoding)
+
+
+def apply_text_edits(
+    content: str | LineIndex,
+    edits: Sequence[AnyTextEdit],
+    encoding: PositionEncoding = DEFAULT_POSITION_ENCODING,
+) -> str:
     """
     Apply a list of text edits to content.
 
+    All edit ranges are converted to offsets once, then the result is assembled
+    in a single pass, in time linear in the size of the content and the edits.
+
     Args:
-        content: Original document content
+        content: Original document content, or its `LineIndex`
         edits: List of text edits to apply
+        encoding: Position encoding of the edit ranges (UTF-16 unless negotiated)
 
     Returns:
         Updated content after applying all edits
 
+    Raises:
+        InvalidTextEditError: If edits overlap or a range falls outside of the
+            document. Columns past the end of a line refer to the line end.
+
     Note:
-        Edits can be provided in any order. They are automatically sorted in
-        reverse order (last to first) to maintain correct positions during
-        application.
+        Edits can be provided in any order. Insertions at the same position are
+        applied in the order they are given.
     """
-    lines = content.splitlines(keepends=True)
-
-    # Sort edits in reverse order to apply from end to start
-    sorted_edits = sorted(
-        edits, key=lambda e: (e.range.start.line, e.range.start.character), reverse=True
-    )
-
-    for edit in sorted_edits:
-        new_text = get_edit_text(edit)
-        start_line = edit.range.start.line
-        start_char = edit.range.start.character
-        end_line = edit.range.end.line
-        end_char = edit.range.end.character
-
-        # Handle start line
-        if start_line >= len(lines):
-            # Beyond end of file, append newlines if needed
-            while len(lines) <= start_line:
-                lines.append("\n")
-            lines[start_line] = new_text
-            continue
-
-        start_line_content = lines[start_line]
-
-        # Handle end line
-        end_line_content = "" if end_line >= len(lines) else lines[end_line]
-
-        # Build new content
-        if start_line == end_line:
-            # Single line edit
-            new_line = (
-                start_line_content[:start_char]
-                + new_text
-                + start_line_content[end_char:]
+    index = content if isinstance(content, LineIndex) else LineIndex.from_text(content)
+    text = index.text
+
+    spans: list[tuple[int, int, int, str]] = []
+    for i, edit in enumerate(edits):
+        start = _edit_offset(index, edit.range.start, encoding, i)
+        end = _edit_offset(index, edit.range.end, encoding, i)
+        if start > end:
+            raise InvalidTextEditError(
+                message=f"Text edit {i} has its start after its end", edit_index=i
             )
-            lines[start_line] = new_line
-        else:
-            # Multi-line edit
-            new_line = (
-                start_line_content[:start_char] + new_text + end_line_content[end_char:]
+        spans.append((start, end, i, get_edit_text(edit)))
+    spans.sort()
+
+    parts: list[str] = []
+    copied = 0
+    for start, end, i, new_text in spans:
+        if start < copied:
+            raise InvalidTextEditError(
+                message=f"Text edit {i} overlaps another edit", edit_index=i
             )
-            lines[start_line] = new_line
-            # Remove lines in between
-            if end_line < len(lines):
-                del lines[start_line + 1 : end_line + 1]
+        parts += (text[copied:start], new_text)
+        copied = end
+    parts.append(text[copied:])
 
-    return "".join(lines)
+    return "".join(parts)
 
 
 def iter_text_document_edits(
@@ -119,16 +140,27 @@ def iter_text_document_edits(
         yield from edit.changes.items()
 
 
+type _TextEdits = tuple[str, int | None, Sequence[AnyTextEdit]]
+"""The URI, expected version (if any) and edits of a text document edit."""
+
+
 @define
 class WorkspaceEditApplicator:
     """
     Applies workspace edits to documents with version validation.
 
+    Text edits are grouped by document and applied concurrently: the documents
+    are read, edited in memory and only then written, so an invalid edit leaves
+    every file untouched. Resource operations (create, rename, delete) run in
+    order, after the text edits preceding them and before the ones following them.
+
     Attributes:
         client: Client instance with document state and file I/O operations
+        max_concurrency: Maximum number of files read or written at a time
     """
 
     client: CapabilityClientProtocol
+    max_concurrency: int = 16
 
     async def apply_workspace_edit(self, edit: lsp_type.WorkspaceEdit) -> None:
         """
@@ -147,6 +179,11 @@ class WorkspaceEditApplicator:
         elif edit.changes:
             await self._apply_changes(edit.changes)
 
+    def _indexed(self, uri: str, content: str) -> str | LineIndex:
+        """The cached line index of an open document, if it matches `content`."""
+        index = self.client.get_document_state().get_line_index(uri)
+        return index if index is not None and index.text is content else content
+
     async def _apply_document_changes(
         self,
         changes: Sequence[
@@ -157,59 +194,115 @@ class WorkspaceEditApplicator:
         ],
     ) -> None:
         """Apply document changes with version validation."""
+        if self.client.get_document_state().overlay_active and any(
+            not isinstance(change, lsp_type.TextDocumentEdit) for change in changes
+        ):
+            # the overlay only holds document contents
+            raise EditApplicationError(
+                message="Resource operations are not supported in overlay mode"
+            )
+
+        pending: list[_TextEdits] = []
         for change in changes:
             match change:
-                case lsp_type.TextDocumentEdit():
-                    await self._apply_text_document_edit(change)
+                case lsp_type.TextDocumentEdit(text_document=doc, edits=edits):
+                    pending.append((doc.uri, doc.version, edits))
+                    continue
+            # resource operations may affect the paths of the pending edits
+            await self._apply_text_edits(pending)
+            pending = []
+            match change:
                 case lsp_type.CreateFile():
                     await self._apply_create_file(change)
                 case lsp_type.RenameFile():
                     await self._apply_rename_file(change)
                 case lsp_type.DeleteFile():
                     await self._apply_delete_file(change)
-
-    async def _apply_text_document_edit(self, edit: lsp_type.TextDocumentEdit) -> None:
-        """Apply text document edit with version validation."""
-        uri = edit.text_document.uri
-        expected_version = edit.text_document.version
-
-        # Validate version if specified
-        if expected_version is not None:
-            if (
-                actual_version := self.client.get_document_state().get_version(uri)
-            ) is None:
-                raise EditApplicationError(
-                    message=f"Document {uri} not open in client",
-                    uri=uri,
-                )
-
-            if actual_version != expected_version:
-                raise VersionMismatchError(
-                    message=(
-                        f"Version mismatch for {uri}: "
-                        f"expected {expected_version}, got {actual_version}"
-                    ),
-                    uri=uri,
-                    expected_version=expected_version,
-                    actual_version=actual_version,
-                )
-
-        # Read, apply, and write edits (state sync handled automatically by write_file)
-        file_path = self.client.from_uri(uri, relative=False)
-        content = await self.client.read_file(file_path)
-        new_content = apply_text_edits(content, edit.edits)
-        await self.client.write_file(uri, new_content)
+        await self._apply_text_edits(pending)
 
     async def _apply_changes(
         self, changes: Mapping[str, Sequence[lsp_type.TextEdit]]
     ) -> None:
         """Apply changes map (deprecated format)."""
-        for uri, edits in changes.items():
-            # Read, apply, and write edits (state sync handled automatically by write_file)
-            file_path = self.client.from_uri(uri, relative=False)
-            content = await self.client.read_file(file_path)
-            new_content = apply_text_edits(content, edits)
-            await self.client.write_file(uri, new_content)
+        await self._apply_text_edits(
+            [(uri, None, edits) for uri, edits in changes.items()]
+        )
+
+    def _check_version(self, uri: str, expected_version: int | None) -> None:
+        if expected_version is None:
+            return
+
+        if (
+            actual_version := self.client.get_document_state().get_version(uri)
+        ) is None:
+            raise EditApplicationError(
+                message=f"Document {uri} not open in client",
+                uri=uri,
+            )
+
+        if actual_version != expected_version:
+            raise VersionMismatchError(
+                message=(
+                    f"Version mismatch for {uri}: "
+                    f"expected {expected_version}, got {actual_version}"
+                ),
+                uri=uri,
+                expected_version=expected_version,
+                actual_version=actual_version,
+            )
+
+    async def _apply_text_edits(self, text_edits: Sequence[_TextEdits]) -> None:
+        """Apply the text edits of several documents as one batch."""
+
+        if not text_edits:
+            return
+
+        # versions refer to the documents before the batch, so check them first
+        by_uri: dict[str, list[Sequence[AnyTextEdit]]] = {}
+        for uri, version, edits in text_edits:
+            self._check_version(uri, version)
+            by_uri.setdefault(uri, []).append(edits)
+
+        limiter = anyio.CapacityLimiter(self.max_concurrency)
+        encoding = self.client.get_position_encoding()
+
+        results: dict[str, str | Exception] = {}
+
+        async def edit(uri: str, edit_lists: list[Sequence[AnyTextEdit]]) -> None:
+            try:
+                async with limiter:
+                    file_path = self.client.from_uri(uri, relative=False)
+                    content = await self.client.read_file(file_path)
+                new_content = apply_text_edits(
+                    self._indexed(uri, content), edit_lists[0], encoding
+                )
+                for edits in edit_lists[1:]:
+                    new_content = apply_text_edits(new_content, edits, encoding)
+            except InvalidTextEditError as e:
+                results[uri] = evolve(e, message=f"{uri}: {e.message}", uri=uri)
+            except Exception as e:  # noqa: BLE001
+                # raised below as is, instead of wrapped in an exception group
+                results[uri] = e
+            else:
+                results[uri] = new_content
+
+        async with asyncer.create_task_group() as tg:
+            for uri, edit_lists in by_uri.items():
+                tg.soonify(edit)(uri, edit_lists)
+
+        new_contents: dict[str, str] = {}
+        for uri in by_uri:
+            match results[uri]:
+                case str(new_content):
+                    new_contents[uri] = new_content
+                case error:
+                    raise error
+
+        # nothing is written unless every document could be edited
+        await self.client.write_files(
+            new_contents,
+            max_concurrency=self.max_concurrency,
+        )
 
     async def _apply_create_file(self, change: lsp_type.CreateFile) -> None:
         """Apply CreateFile resource operation."""
@@ -286,6 +379,7 @@ class WorkspaceEditApplicator:
         # Perform the rename
         _ = await old_path.rename(new_path)
         logger.debug(f"Renamed file: {old_uri} -> {new_uri}")
+        self.client.invalidate_cached_responses([old_uri, new_uri])
 
         # Update document state if tracked
         doc_state = self.client.get_document_state()
@@ -334,5 +428,7 @@ class WorkspaceEditApplicator:
             await path.unlink()
             logger.debug(f"Deleted file: {uri}")
 
+        self.client.invalidate_cached_responses([uri])
+
         # Update document state if tracked
         self.client.get_document_state().unregister(uri)
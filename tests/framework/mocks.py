@@ -2,14 +2,18 @@ from __future__ import annotations
 
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Any, override
 from unittest.mock import AsyncMock, MagicMock
 
 from anyio.abc import AnyByteReceiveStream, AnyByteSendStream
 from attrs import define, field
 
+from lsp_client.jsonrpc.convert import response_deserialize
+from lsp_client.protocol import CapabilityClientProtocol
 from lsp_client.server.abc import StreamServer
 from lsp_client.utils.channel import Sender
+from lsp_client.utils.types import AnyPath, Request, Response
 from lsp_client.utils.workspace import Workspace
 
 
@@ -67,6 +71,71 @@ class MockServer(StreamServer):
         self._notifications.clear()
 
 
+class MockCapabilityClient(CapabilityClientProtocol):
+    """
+    A mock client answering requests without a server.
+
+    Subclasses list it before the capabilities under test and implement `answer`,
+    which returns the raw JSON result of a request. Files are not actually opened.
+    """
+
+    def __init__(self) -> None:
+        self.opened: list[tuple[AnyPath, ...]] = []
+
+    async def answer(self, req: Request) -> Any:
+        """The raw result of `req`."""
+        raise NotImplementedError(req)
+
+    @override
+    async def request[R](
+        self, req: Request, schema: type[Response[R]], *, lazy: bool = False
+    ) -> R:
+        result = await self.answer(req)
+        return response_deserialize(
+            {"jsonrpc": "2.0", "id": req.id, "result": result},  # type: ignore[attr-defined]
+            schema,
+        )
+
+    @override
+    def as_uri(self, file_path: AnyPath) -> str:
+        return Path(file_path).absolute().as_uri()
+
+    @override
+    @asynccontextmanager
+    async def open_files(self, *file_paths: AnyPath) -> AsyncGenerator[None]:
+        self.opened.append(file_paths)
+        yield
+
+    @override
+    def get_document_state(self) -> Any:
+        raise NotImplementedError
+
+    @override
+    def get_workspace(self) -> Any:
+        raise NotImplementedError
+
+    @override
+    def get_config_map(self) -> Any:
+        raise NotImplementedError
+
+    @override
+    @classmethod
+    def get_language_config(cls) -> Any:
+        raise NotImplementedError
+
+    @override
+    async def read_file(self, file_path: AnyPath, *, encoding: str = "utf-8") -> str:
+        raise NotImplementedError
+
+    @override
+    async def write_file(self, uri: str, content: str) -> None:
+        raise NotImplementedError
+
+    @override
+    async def notify(self, msg: Any) -> None:
+        raise NotImplementedError
+
+
 class MockStream:
     """A mock stream for testing."""
 
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Sequence
+
+import pytest
+
+from lsp_client.utils.line_index import LineIndex
+from lsp_client.utils.types import lsp_type
+from lsp_client.utils.workspace_edit import apply_text_edits, get_edit_text
+
+EDITS = 10_000
+
+
+def _legacy_apply_text_edits(content: str, edits: Sequence[lsp_type.TextEdit]) -> str:
+    """The implementation `apply_text_edits` replaced, as a baseline.
+
+    Each edit rebuilds the whole content, so applying it is quadratic.
+    """
+
+    index = LineIndex.from_text(content)
+    spans = [(*index.range_offsets(e.range), get_edit_text(e)) for e in edits]
+    for start, end, new_text in sorted(spans, key=lambda s: s[0], reverse=True):
+        content = content[:start] + new_text + content[end:]
+    return content
+
+
+def _rename_edits() -> tuple[str, list[lsp_type.TextEdit]]:
+    """A generated file with one rename per line, and a line deletion per 10."""
+
+    content = "".join(f"value_{i} = old_name + {i}\n" for i in range(EDITS))
+    edits: list[lsp_type.TextEdit] = []
+    for i in range(EDITS):
+        start = len(f"value_{i} = ")
+        if i % 10 == 9:
+            edits.append(
+                lsp_type.TextEdit(
+                    range=lsp_type.Range(
+                        start=lsp_type.Position(line=i, character=0),
+                        end=lsp_type.Position(line=i + 1, character=0),
+                    ),
+                    new_text="",
+                )
+            )
+            continue
+        edits.append(
+            lsp_type.TextEdit(
+                range=lsp_type.Range(
+                    start=lsp_type.Position(line=i, character=start),
+                    end=lsp_type.Position(line=i, character=start + 8),
+                ),
+                new_text="new_name",
+            )
+        )
+    return content, edits
+
+
+@pytest.mark.performance
+def test_apply_text_edits_10k():
+    content, edits = _rename_edits()
+
+    start = time.perf_counter()
+    result = apply_text_edits(content, edits)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = _legacy_apply_text_edits(content, edits)
+    legacy_elapsed = time.perf_counter() - start
+
+    assert result == expected
+    print(
+        f"\n{EDITS} edits: {elapsed * 1000:.1f}ms "
+        f"(legacy {legacy_elapsed * 1000:.1f}ms, {legacy_elapsed / elapsed:.1f}x)"
+    )
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from lsp_client.jsonrpc.convert import converter, get_structure_fn
+from lsp_client.utils.types import lsp_type
+
+ROUNDS = 5
+
+
+def _range(line: int) -> dict:
+    return {
+        "start": {"line": line, "character": 4},
+        "end": {"line": line, "character": 16},
+    }
+
+
+def _document_symbol(n: int, depth: int) -> dict:
+    return {
+        "name": f"symbol_{n}",
+        "kind": 12,
+        "range": _range(n),
+        "selectionRange": _range(n),
+        "children": [_document_symbol(n * 10 + k, depth - 1) for k in range(4)]
+        if depth
+        else [],
+    }
+
+
+PAYLOADS = {
+    "Location[]": (
+        lsp_type.ReferencesResponse,
+        {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": [
+                {"uri": f"file:///src/module_{i % 97}.py", "range": _range(i)}
+                for i in range(20_000)
+            ],
+        },
+    ),
+    "DocumentSymbol[]": (
+        lsp_type.DocumentSymbolResponse,
+        {
+            "jsonrpc": "2.0",
+            "id": 2,
+            "result": [_document_symbol(i, 3) for i in range(200)],
+        },
+    ),
+    "CompletionList": (
+        lsp_type.CompletionResponse,
+        {
+            "jsonrpc": "2.0",
+            "id": 3,
+            "result": {
+                "isIncomplete": False,
+                "items": [
+                    {
+                        "label": f"item_{i}",
+                        "kind": 6,
+                        "detail": "int",
+                        "sortText": f"{i:05}",
+                        "textEdit": {"range": _range(0), "newText": f"item_{i}"},
+                    }
+                    for i in range(5_000)
+                ],
+            },
+        },
+    ),
+    "PublishDiagnosticsParams": (
+        lsp_type.PublishDiagnosticsNotification,
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/publishDiagnostics",
+            "params": {
+                "uri": "file:///src/main.py",
+                "diagnostics": [
+                    {
+                        "range": _range(i),
+                        "message": f"message {i}",
+                        "severity": 1,
+                        "code": "E0001",
+                        "source": "checker",
+                    }
+                    for i in range(5_000)
+                ],
+            },
+        },
+    ),
+}
+
+
+def _timeit(fn) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return (time.perf_counter() - start) / ROUNDS
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("message", PAYLOADS)
+def test_structure_fast_path(message):
+    schema, raw = PAYLOADS[message]
+    structure = get_structure_fn(schema)
+
+    assert structure(raw) == converter.structure(raw, schema)
+
+    generic = _timeit(lambda: converter.structure(raw, schema))
+    fast = _timeit(lambda: structure(raw))
+    print(
+        f"\n{message}: generic {generic * 1000:.1f} ms, "
+        f"fast {fast * 1000:.1f} ms ({generic / fast:.1f}x)"
+    )
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import time
+
+import anyio
+import pytest
+from anyio.streams.buffered import BufferedByteReceiveStream
+
+from lsp_client.jsonrpc.parse import FrameReader, read_package, read_raw_package
+
+CHUNK_SIZE = 65536
+FRAME_COUNT = 20
+
+
+def _references_frame(count: int) -> bytes:
+    body = json.dumps(
+        {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": [
+                {
+                    "uri": f"file:///workspace/src/module_{i % 97}.py",
+                    "range": {
+                        "start": {"line": i, "character": 4},
+                        "end": {"line": i, "character": 16},
+                    },
+                }
+                for i in range(count)
+            ],
+        }
+    ).encode()
+    return f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+
+
+def _chunked_stream(data: bytes):
+    chunks = [data[i : i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE)]
+    tx, rx = anyio.create_memory_object_stream[bytes](len(chunks))
+    for chunk in chunks:
+        tx.send_nowait(chunk)
+    tx.close()
+    return rx
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_frame_reader_throughput():
+    data = _references_frame(20_000) * FRAME_COUNT
+    megabytes = len(data) / 1024 / 1024
+
+    buffered = BufferedByteReceiveStream(_chunked_stream(data))
+    start = time.perf_counter()
+    legacy = [await read_raw_package(buffered) for _ in range(FRAME_COUNT)]
+    legacy_elapsed = time.perf_counter() - start
+
+    reader = FrameReader(_chunked_stream(data))
+    start = time.perf_counter()
+    framed = [await read_package(reader) for _ in range(FRAME_COUNT)]
+    framed_elapsed = time.perf_counter() - start
+
+    assert framed == legacy
+    print(
+        f"\nread_raw_package: {megabytes / legacy_elapsed:.1f} MB/s"
+        f"\nFrameReader:      {megabytes / framed_elapsed:.1f} MB/s"
+    )
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_frame_reader_framing_throughput():
+    frame = _references_frame(20_000)
+    data = frame * FRAME_COUNT
+    megabytes = len(data) / 1024 / 1024
+    length = len(frame) - frame.index(b"\r\n\r\n") - 4
+
+    buffered = BufferedByteReceiveStream(_chunked_stream(data))
+    start = time.perf_counter()
+    for _ in range(FRAME_COUNT):
+        await buffered.receive_until(b"\r\n", max_bytes=65536)
+        await buffered.receive_until(b"\r\n", max_bytes=65536)
+        (await buffered.receive_exactly(length)).decode("utf-8")
+    legacy_elapsed = time.perf_counter() - start
+
+    reader = FrameReader(_chunked_stream(data))
+    start = time.perf_counter()
+    for _ in range(FRAME_COUNT):
+        await reader.receive_frame()
+    framed_elapsed = time.perf_counter() - start
+
+    print(
+        f"\nlegacy framing: {megabytes / legacy_elapsed:.1f} MB/s"
+        f"\nFrameReader:    {megabytes / framed_elapsed:.1f} MB/s"
+    )
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import time
+
+import anyio
+import anyio.lowlevel
+import pytest
+
+from lsp_client.jsonrpc.codec import StdlibJsonCodec
+from lsp_client.jsonrpc.convert import notification_serialize
+from lsp_client.jsonrpc.parse import FrameWriter, write_raw_package
+from lsp_client.utils.types import lsp_type
+
+BURST = 500
+
+
+class _CountingStream:
+    """Stand-in for a pipe: each `send` costs a syscall-like checkpoint."""
+
+    def __init__(self) -> None:
+        self.sends = 0
+        self.size = 0
+
+    async def send(self, data: bytes) -> None:
+        await anyio.lowlevel.checkpoint()
+        self.sends += 1
+        self.size += len(data)
+
+
+def _did_open(i: int) -> dict:
+    return dict(
+        notification_serialize(
+            lsp_type.DidOpenTextDocumentNotification(
+                params=lsp_type.DidOpenTextDocumentParams(
+                    text_document=lsp_type.TextDocumentItem(
+                        uri=f"file:///src/module_{i}.py",
+                        language_id="python",
+                        version=0,
+                        text="x = 1\n" * 200,
+                    )
+                )
+            )
+        )
+    )
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_did_open_burst_batching():
+    packages = [_did_open(i) for i in range(BURST)]
+    codec = StdlibJsonCodec()
+
+    direct = _CountingStream()
+    start = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        for package in packages:
+            tg.start_soon(write_raw_package, direct, package)
+    direct_time = time.perf_counter() - start
+
+    batched = _CountingStream()
+    writer = FrameWriter(batched)  # type: ignore[arg-type]
+    start = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        await tg.start(writer.run)
+        async with anyio.create_task_group() as burst:
+            for package in packages:
+                burst.start_soon(writer.write, codec.encode(package))
+        await writer.aclose()
+    batched_time = time.perf_counter() - start
+
+    print(
+        f"\n{BURST} didOpen: direct {direct.sends} writes {direct_time * 1000:.1f} ms, "
+        f"batched {batched.sends} writes {batched_time * 1000:.1f} ms "
+        f"({writer.stats.frames_per_flush:.1f} frames/flush)"
+    )
+    assert batched.size == direct.size
+    assert batched.sends < direct.sends
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+import pytest
+
+from lsp_client.jsonrpc.convert import response_deserialize
+from lsp_client.jsonrpc.lazy import lazy_response_deserialize
+from lsp_client.utils.types import lsp_type
+
+N_RESULTS = 100_000
+
+
+def _references() -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": [
+            {
+                "uri": f"file:///src/module_{i % 97}.py",
+                "range": {
+                    "start": {"line": i, "character": 4},
+                    "end": {"line": i, "character": 16},
+                },
+            }
+            for i in range(N_RESULTS)
+        ],
+    }
+
+
+def _measure(fn) -> tuple[float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+@pytest.mark.performance
+def test_lazy_references_count_and_uri():
+    raw = _references()
+
+    def eager():
+        result = response_deserialize(raw, lsp_type.ReferencesResponse)
+        assert result is not None
+        return len(result), {loc.uri for loc in result}
+
+    def lazy():
+        result = lazy_response_deserialize(raw, lsp_type.ReferencesResponse)
+        assert result is not None
+        return len(result), {loc["uri"] for loc in result.iter_raw()}
+
+    assert eager() == lazy()
+
+    eager_time, eager_peak = _measure(eager)
+    lazy_time, lazy_peak = _measure(lazy)
+    print(
+        f"\n{N_RESULTS} references: "
+        f"eager {eager_time * 1000:.1f} ms / {eager_peak / 2**20:.1f} MiB, "
+        f"lazy {lazy_time * 1000:.1f} ms / {lazy_peak / 2**20:.1f} MiB"
+    )
+    assert lazy_time < eager_time
+    assert lazy_peak < eager_peak
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+from charset_normalizer import from_bytes
+
+from lsp_client.client.document_state import DocumentStateManager
+
+N_FILES = 500
+
+
+@pytest.mark.performance
+@pytest.mark.anyio
+async def test_open_documents(tmp_path: Path):
+    source = "".join(f"def function_{i}(x: int) -> str:  # é\n" for i in range(500))
+    uris = []
+    for i in range(N_FILES):
+        path = tmp_path / f"module_{i}.py"
+        path.write_text(source, encoding="utf-8")
+        uris.append(path.as_uri())
+
+    manager = DocumentStateManager()
+    start = time.perf_counter()
+    states = await manager.open(uris)
+    elapsed = time.perf_counter() - start
+    assert len(states) == N_FILES
+
+    # the charset detection previously run on every file
+    start = time.perf_counter()
+    for path in list(tmp_path.iterdir())[:50]:
+        best = from_bytes(path.read_bytes()).best()
+        assert best is not None
+    detection_elapsed = (time.perf_counter() - start) * N_FILES / 50
+
+    print(
+        f"\nopen {N_FILES} files: {elapsed * 1000:.1f}ms "
+        f"(charset detection alone ~{detection_elapsed * 1000:.0f}ms, "
+        f"{detection_elapsed / elapsed:.1f}x)"
+    )
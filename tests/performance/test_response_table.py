@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Hashable
+from typing import override
+from uuid import uuid4
+
+import anyio
+import anyio.lowlevel
+import pytest
+from attrs import define, field
+
+from lsp_client.jsonrpc.id import ID, jsonrpc_id
+from lsp_client.jsonrpc.types import RawPackage
+from lsp_client.utils.channel import OneShotReceiver, OneShotTable, oneshot_channel
+from tests.framework.mocks import MockServer
+
+CONCURRENCY = 100
+ROUNDS = 100
+
+
+@define
+class EchoServer(MockServer):
+    """MockServer answering every request with an empty result.
+
+    Responses go through a dispatch task, like packages read from a real server.
+    """
+
+    _replies: list[RawPackage] = field(factory=list)
+    _wakeup: anyio.Event | None = None
+
+    @override
+    async def send(self, package: RawPackage) -> None:
+        self._replies.append({"jsonrpc": "2.0", "id": package["id"], "result": None})  # type: ignore[typeddict-item]
+        if self._wakeup:
+            self._wakeup.set()
+
+    async def dispatch(self) -> None:
+        while True:
+            if not self._replies:
+                self._wakeup = anyio.Event()
+                await self._wakeup.wait()
+            replies, self._replies = self._replies, []
+            for reply in replies:
+                await self._handle_package(None, reply)  # type: ignore[arg-type]
+
+
+@define
+class StreamTable:
+    """Previous table implementation: one memory stream pair per request."""
+
+    _pending: dict[Hashable, object] = field(factory=dict)
+    _condition: anyio.Condition = field(factory=anyio.Condition)
+
+    def __contains__(self, id: Hashable) -> bool:
+        return id in self._pending
+
+    async def send(self, id: Hashable, data: object) -> None:
+        await self._pending[id].send(data)  # type: ignore[attr-defined]
+        self._pending.pop(id)
+        if not self._pending:
+            async with self._condition:
+                self._condition.notify_all()
+
+    def reserve(self, id: Hashable) -> OneShotReceiver[object]:
+        tx, rx = oneshot_channel[object].create()
+        self._pending[id] = tx
+        return rx
+
+
+async def _hover_sweep(server: EchoServer, new_id: Callable[[], ID]) -> float:
+    async def one_client() -> None:
+        for _ in range(ROUNDS):
+            await server.request(
+                {"jsonrpc": "2.0", "id": new_id(), "method": "textDocument/hover"}  # type: ignore[typeddict-item]
+            )
+
+    async with anyio.create_task_group() as dispatcher:
+        dispatcher.start_soon(server.dispatch)
+        await anyio.lowlevel.checkpoint()
+
+        start = time.perf_counter()
+        async with anyio.create_task_group() as tg:
+            for _ in range(CONCURRENCY):
+                tg.start_soon(one_client)
+        elapsed = time.perf_counter() - start
+
+        dispatcher.cancel_scope.cancel()
+    return elapsed
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_request_throughput():
+    total = CONCURRENCY * ROUNDS
+
+    legacy = EchoServer()
+    legacy._resp_table = StreamTable()  # type: ignore[assignment]
+    legacy_time = await _hover_sweep(legacy, lambda: uuid4().hex)
+
+    server = EchoServer()
+    assert isinstance(server._resp_table, OneShotTable)
+    slot_time = await _hover_sweep(server, jsonrpc_id)
+    assert server._resp_table.completed
+
+    print(
+        f"\n{total} requests: memory streams + uuid {total / legacy_time:,.0f} req/s, "
+        f"slots + int ids {total / slot_time:,.0f} req/s "
+        f"({legacy_time / slot_time:.2f}x)"
+    )
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from lsp_client.utils.symbol import (
+    DocumentSymbolHierarchy,
+    DocumentSymbolPath,
+    contains,
+    is_narrower,
+)
+from lsp_client.utils.types import lsp_type
+
+CLASSES = 200
+METHODS = 100
+
+
+def _legacy_at_position(
+    root: lsp_type.DocumentSymbol, position: lsp_type.Position
+) -> lsp_type.DocumentSymbol | None:
+    """The implementation `at_position` replaced, as a baseline.
+
+    Scans every child at every depth.
+    """
+
+    if not contains(root.range, position):
+        return None
+
+    current = root
+    while True:
+        best_child = None
+        for child in current.children or ():
+            if contains(child.range, position) and (
+                best_child is None or is_narrower(child.range, best_child.range)
+            ):
+                best_child = child
+
+        if best_child is None:
+            return current
+        current = best_child
+
+
+def _symbol(
+    name: str,
+    start: int,
+    end: int,
+    children: list[lsp_type.DocumentSymbol] | None = None,
+) -> lsp_type.DocumentSymbol:
+    range_ = lsp_type.Range(
+        start=lsp_type.Position(line=start, character=0),
+        end=lsp_type.Position(line=end, character=0),
+    )
+    return lsp_type.DocumentSymbol(
+        name=name,
+        kind=lsp_type.SymbolKind.Method,
+        range=range_,
+        selection_range=range_,
+        children=children,
+    )
+
+
+def _generated_module() -> lsp_type.DocumentSymbol:
+    """A generated module of classes with many one-line methods each."""
+
+    classes = []
+    for c in range(CLASSES):
+        first = c * (METHODS + 1)
+        methods = [
+            _symbol(f"method_{m}", first + m + 1, first + m + 2) for m in range(METHODS)
+        ]
+        classes.append(_symbol(f"Class{c}", first, first + METHODS + 1, methods))
+    return _symbol("module", 0, CLASSES * (METHODS + 1), classes)
+
+
+@pytest.mark.performance
+def test_at_position_generated_module():
+    root = _generated_module()
+    positions = [
+        lsp_type.Position(line=line, character=4)
+        for line in range(0, CLASSES * (METHODS + 1), 3)
+    ]
+
+    start = time.perf_counter()
+    hierarchy = DocumentSymbolHierarchy(root)
+    result = hierarchy.at_positions(positions)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [_legacy_at_position(root, p) for p in positions]
+    legacy_elapsed = time.perf_counter() - start
+
+    assert result == expected
+    print(
+        f"\n{len(positions)} lookups over {CLASSES * METHODS} symbols: "
+        f"{elapsed * 1000:.1f}ms including indexing "
+        f"(legacy {legacy_elapsed * 1000:.1f}ms, {legacy_elapsed / elapsed:.1f}x)"
+    )
+
+
+@pytest.mark.performance
+def test_at_path_generated_module():
+    hierarchy = DocumentSymbolHierarchy(_generated_module())
+    paths = [
+        DocumentSymbolPath.from_symbols("module", f"Class{c}", f"method_{m}")
+        for c in range(CLASSES)
+        for m in range(METHODS)
+    ]
+
+    start = time.perf_counter()
+    assert all(hierarchy.at_path(path) is not None for path in paths)
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(paths)} path lookups: {elapsed * 1000:.1f}ms including indexing")
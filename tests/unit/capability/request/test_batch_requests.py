@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Any, override
+
+import anyio
+import pytest
+
+from lsp_client.capability.request.definition import WithRequestDefinition
+from lsp_client.capability.request.hover import WithRequestHover
+from lsp_client.capability.request.reference import WithRequestReferences
+from lsp_client.utils.types import Request, lsp_type
+from tests.framework.mocks import MockCapabilityClient
+
+
+def _location(line: int) -> dict:
+    pos = {"line": line, "character": 0}
+    return {"uri": "file:///b.py", "range": {"start": pos, "end": pos}}
+
+
+class BatchClient(
+    MockCapabilityClient,
+    WithRequestDefinition,
+    WithRequestHover,
+    WithRequestReferences,
+):
+    """Answers with the line of the requested position, later for earlier lines."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @override
+    async def answer(self, req: Request) -> Any:
+        line = req.params.position.line  # type: ignore[attr-defined]
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await anyio.sleep(0.001 * (10 - line % 10))
+        self.in_flight -= 1
+
+        match req:
+            case lsp_type.HoverRequest():
+                return {"contents": {"kind": "plaintext", "value": str(line)}}
+            case lsp_type.ReferencesRequest():
+                return [_location(line), _location(line + 1)]
+            case _:
+                return _location(line)
+
+
+POSITIONS = [lsp_type.Position(line=i, character=0) for i in range(30)]
+
+
+@pytest.mark.asyncio
+async def test_request_definitions_in_input_order():
+    client = BatchClient()
+
+    results = await client.request_definitions("a.py", POSITIONS, max_concurrency=4)
+
+    assert [r.range.start.line for r in results] == list(range(30))  # type: ignore[union-attr]
+    assert len(client.opened) == 1
+    assert client.max_in_flight == 4
+
+
+@pytest.mark.asyncio
+async def test_request_hovers_and_references():
+    client = BatchClient()
+
+    hovers = await client.request_hovers("a.py", POSITIONS[:3])
+    assert [hover.value for hover in hovers] == ["0", "1", "2"]  # type: ignore[union-attr]
+
+    references = await client.request_references_at("a.py", POSITIONS[:2])
+    assert [[loc.range.start.line for loc in refs] for refs in references] == [  # type: ignore[union-attr]
+        [0, 1],
+        [1, 2],
+    ]
+    assert len(client.opened) == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_hovers():
+    client = BatchClient()
+
+    async with client.stream_hovers("a.py", POSITIONS[:10]) as results:
+        completed = [(i, pos.line, hover.value) async for i, pos, hover in results]  # type: ignore[union-attr]
+
+    assert sorted(completed) == [(i, i, str(i)) for i in range(10)]
+    assert len(client.opened) == 1
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from typing import Any, override
+
+import pytest
+
+from lsp_client.capability.diagnostic.workspace import WithWorkspaceDiagnostic
+from lsp_client.capability.request.reference import WithRequestReferences
+from lsp_client.capability.request.workspace_symbol import WithRequestWorkspaceSymbol
+from lsp_client.utils.progress import ProgressDispatcher
+from lsp_client.utils.types import Request, lsp_type
+from tests.framework.mocks import MockCapabilityClient
+
+
+def _location(line: int) -> dict:
+    pos = {"line": line, "character": 0}
+    return {"uri": "file:///a.py", "range": {"start": pos, "end": pos}}
+
+
+class PartialResultClient(
+    MockCapabilityClient,
+    WithRequestReferences,
+    WithRequestWorkspaceSymbol,
+    WithWorkspaceDiagnostic,
+):
+    """Answers each request with the given partial results and final result."""
+
+    def __init__(self, partials: list[Any], result: Any) -> None:
+        super().__init__()
+        self.partials = partials
+        self.result = result
+        self.progress = ProgressDispatcher()
+        self.requests: list[Request] = []
+
+    @override
+    async def answer(self, req: Request) -> Any:
+        self.requests.append(req)
+        token = req.params.partial_result_token  # type: ignore[attr-defined]
+        for value in self.partials:
+            assert self.progress.dispatch(token, value)
+        return self.result
+
+    @override
+    def get_progress_dispatcher(self) -> ProgressDispatcher:
+        return self.progress
+
+
+@pytest.mark.asyncio
+async def test_stream_references() -> None:
+    client = PartialResultClient(
+        partials=[[_location(1), _location(2)], [_location(3)]], result=[]
+    )
+
+    async with client.stream_references(
+        "a.py", lsp_type.Position(line=0, character=0)
+    ) as references:
+        lines = [loc.range.start.line async for loc in references]
+
+    assert lines == [1, 2, 3]
+    [req] = client.requests
+    assert isinstance(req, lsp_type.ReferencesRequest)
+    assert req.params.partial_result_token is not None
+
+
+@pytest.mark.asyncio
+async def test_stream_workspace_symbols_without_partial_results() -> None:
+    symbol = {"name": "foo", "kind": 12, "location": {"uri": "file:///a.py"}}
+    client = PartialResultClient(partials=[], result=[symbol])
+
+    async with client.stream_workspace_symbols("foo") as symbols:
+        result = [s async for s in symbols]
+
+    assert [s.name for s in result] == ["foo"]
+    assert isinstance(result[0], lsp_type.WorkspaceSymbol)
+
+
+@pytest.mark.asyncio
+async def test_stream_workspace_diagnostic() -> None:
+    def report(uri: str) -> dict:
+        return {"kind": "full", "uri": uri, "version": None, "items": []}
+
+    client = PartialResultClient(
+        partials=[{"items": [report("file:///a.py")]}],
+        result={"items": [report("file:///b.py")]},
+    )
+
+    async with client.stream_workspace_diagnostic() as reports:
+        uris = [r.uri async for r in reports]
+
+    assert uris == ["file:///a.py", "file:///b.py"]
+
+
+@pytest.mark.asyncio
+async def test_stream_raises_request_error() -> None:
+    class FailingClient(PartialResultClient):
+        @override
+        async def answer(self, req: Request) -> Any:
+            token = req.params.partial_result_token  # type: ignore[attr-defined]
+            assert self.progress.dispatch(token, [_location(1)])
+            raise TimeoutError
+
+    client = FailingClient(partials=[], result=None)
+    lines: list[int] = []
+    with pytest.raises(TimeoutError):
+        async with client.stream_references(
+            "a.py", lsp_type.Position(line=0, character=0)
+        ) as references:
+            async for loc in references:
+                lines.append(loc.range.start.line)
+
+    # partial results received before the error are delivered
+    assert lines == [1]
+    assert not client.progress._subscribers
@@ -9,6 +9,9 @@ from lsp_client.capability.notification.text_document_synchronize import (
 )
 from lsp_client.capability.request.definition import WithRequestDefinition
 from lsp_client.capability.request.hover import WithRequestHover
+from lsp_client.capability.server_request.work_done_progress import (
+    WithRespondWorkDoneProgressCreate,
+)
 
 
 def test_mixin_hover():
@@ -46,3 +49,12 @@ def test_mixin_did_change_workspace_folders():
     capabilities = build_client_capabilities(WorkspaceFoldersClient)
     assert capabilities.workspace is not None
     assert capabilities.workspace.workspace_folders is True
+
+
+def test_mixin_work_done_progress():
+    class ProgressClient(WithRespondWorkDoneProgressCreate):
+        pass
+
+    capabilities = build_client_capabilities(ProgressClient)
+    assert capabilities.window is not None
+    assert capabilities.window.work_done_progress is True
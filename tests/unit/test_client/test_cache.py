@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from lsprotocol.types import LanguageKind
+
+from lsp_client.client.abc import Client
+from lsp_client.client.cache import ResponseCache, json_size, notified_uris
+from lsp_client.protocol.lang import LanguageConfig
+from lsp_client.server import DefaultServers
+from lsp_client.utils.types import lsp_type
+
+
+def response(result: object) -> dict:
+    return {"jsonrpc": "2.0", "id": 1, "result": result}
+
+
+def test_lru_eviction_by_entries():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "file:///a", response(1))
+    cache.put("b", "file:///b", response(2))
+    assert cache.get("a") is not None  # `b` becomes the least recently used
+    cache.put("c", "file:///c", response(3))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats.evictions == 1
+    assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+
+
+def test_eviction_by_bytes():
+    cache = ResponseCache(max_bytes=100, sizeof=lambda _: 40)
+    for key in "abc":
+        cache.put(key, f"file:///{key}", response(key))
+
+    assert len(cache) == 2
+    assert cache.nbytes == 80
+
+    # errors and null results are never cached
+    cache.put("d", "file:///d", {"jsonrpc": "2.0", "id": 1, "error": {}})  # type: ignore[typeddict-item]
+    cache.put("e", "file:///e", response(None))
+    assert cache.get("d") is None
+    assert cache.get("e") is None
+
+
+def test_json_size_extrapolates_long_lists():
+    items = [{"uri": f"file:///{i:04}.py"} for i in range(1000)]
+    exact = len(json.dumps(items, separators=(",", ":")))
+    assert abs(json_size(response(items)) - exact) < exact * 0.01
+    assert json_size(response([1])) == len('{"jsonrpc":"2.0","id":1,"result":[1]}')
+
+
+def test_invalidate():
+    cache = ResponseCache()
+    cache.put("a1", "file:///src/a.py", response(1))
+    cache.put("a2", "file:///src/a.py", response(2))
+    cache.put("b", "file:///src/pkg/b.py", response(3))
+    cache.put("c", "file:///c.py", response(4))
+
+    assert cache.invalidate(["file:///src/a.py"]) == 2
+    # directories drop all documents below them
+    assert cache.invalidate(["file:///src"]) == 1
+    assert len(cache) == 1
+
+    cache.clear()
+    assert not len(cache)
+    assert cache.nbytes == 0
+    assert cache.stats.invalidations == 4
+
+
+def test_notified_uris():
+    assert notified_uris(
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didChange",
+            "params": {"textDocument": {"uri": "file:///a"}, "contentChanges": []},
+        }
+    ) == ["file:///a"]
+    assert notified_uris(
+        {
+            "jsonrpc": "2.0",
+            "method": "workspace/didRenameFiles",
+            "params": {"files": [{"oldUri": "file:///a", "newUri": "file:///b"}]},
+        }
+    ) == ["file:///a", "file:///b"]
+    assert not notified_uris(
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/didOpen",
+            "params": {"textDocument": {"uri": "file:///a"}},
+        }
+    )
+
+
+HOVER = {"contents": "x: int"}
+
+
+class CountingServer:
+    def __init__(self, result: object = None) -> None:
+        self.result = result
+        self.requests: list[str] = []
+        self.notifications: list[str] = []
+
+    async def request(self, request: dict) -> dict:
+        self.requests.append(request["method"])
+        return response(self.result)
+
+    async def notify(self, notification: dict) -> None:
+        self.notifications.append(notification["method"])
+
+
+class CachingClient(Client):
+    @classmethod
+    def create_default_servers(cls) -> DefaultServers:
+        return None  # type: ignore[return-value]
+
+    @classmethod
+    def get_language_config(cls) -> LanguageConfig:
+        return LanguageConfig(
+            kind=LanguageKind.Python, suffixes=[".py"], project_files=["pyproject.toml"]
+        )
+
+    def check_server_compatibility(self, info: lsp_type.ServerInfo | None) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_client_caches_until_file_is_written(tmp_path: Path):
+    file_path = tmp_path / "a.py"
+    file_path.write_text("x = 1\n")
+    uri = file_path.as_uri()
+
+    client = CachingClient(workspace=tmp_path, response_cache=ResponseCache())
+    server = CountingServer(HOVER)
+    client._server = server  # type: ignore[assignment]
+
+    async def hover() -> None:
+        await client.request(
+            lsp_type.HoverRequest(
+                id=1,
+                params=lsp_type.HoverParams(
+                    text_document=lsp_type.TextDocumentIdentifier(uri=uri),
+                    position=lsp_type.Position(line=0, character=0),
+                ),
+            ),
+            schema=lsp_type.HoverResponse,
+        )
+
+    await hover()
+    await hover()
+    assert len(server.requests) == 1
+
+    await client.write_file(uri, "x = 2\n")
+    await hover()
+    assert len(server.requests) == 2
+
+    cache = client.response_cache
+    assert cache is not None
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+    assert cache.stats.invalidations == 1
+
+
+@pytest.mark.asyncio
+async def test_client_cache_misses_after_reopening_changed_file(tmp_path: Path):
+    file_path = tmp_path / "a.py"
+    file_path.write_text("x = 1\n")
+
+    cache = ResponseCache()
+    client = CachingClient(workspace=tmp_path, response_cache=cache)
+    server = CountingServer(HOVER)
+    client._server = server  # type: ignore[assignment]
+
+    async def hover() -> None:
+        # every opening restarts the document at version 0
+        async with client.open_files(file_path):
+            await client.request(
+                lsp_type.HoverRequest(
+                    id=1,
+                    params=lsp_type.HoverParams(
+                        text_document=lsp_type.TextDocumentIdentifier(
+                            uri=file_path.as_uri()
+                        ),
+                        position=lsp_type.Position(line=0, character=0),
+                    ),
+                ),
+                schema=lsp_type.HoverResponse,
+            )
+
+    await hover()
+    await hover()
+    assert len(server.requests) == 1
+    assert server.notifications.count("textDocument/didClose") == 2
+
+    # changed on disk while closed
+    file_path.write_text("x = 22\n")
+    await hover()
+    assert len(server.requests) == 2
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
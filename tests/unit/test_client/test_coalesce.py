@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import anyio
+import pytest
+
+from lsp_client.client.coalesce import RequestCoalescer, request_key
+from lsp_client.jsonrpc.exception import JsonRpcTransportError
+
+
+def hover(uri: str = "file:///a.py", **params: object) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "textDocument/hover",
+        "params": {
+            "textDocument": {"uri": uri},
+            "position": {"line": 1, "character": 2},
+            **params,
+        },
+    }
+
+
+def test_request_key():
+    assert request_key(hover(), 1) == request_key(hover(), 1)
+    assert request_key(hover(), 1) != request_key(hover(), 2)
+    assert request_key(hover(), 1) != request_key(hover("file:///b.py"), 1)
+    assert request_key(hover(workDoneToken="t"), 1) is None
+    assert request_key({**hover(), "method": "textDocument/rename"}, 1) is None
+
+
+class Backend:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.cancelled = 0
+        self.reply = anyio.Event()
+
+    async def send(self) -> dict:
+        self.calls += 1
+        try:
+            await self.reply.wait()
+        except anyio.get_cancelled_exc_class():
+            self.cancelled += 1
+            raise
+        return {"jsonrpc": "2.0", "id": 1, "result": self.calls}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_round_trip():
+    backend = Backend()
+    results: list[object] = []
+
+    async with RequestCoalescer().run() as coalescer:
+
+        async def request() -> None:
+            results.append(await coalescer.request("key", backend.send))
+
+        async with anyio.create_task_group() as waiters:
+            for _ in range(5):
+                waiters.start_soon(request)
+            await anyio.wait_all_tasks_blocked()
+            backend.reply.set()
+
+        assert backend.calls == 1
+        assert [r["result"] for r in results] == [1] * 5  # type: ignore[index]
+        assert (coalescer.stats.sent, coalescer.stats.shared) == (1, 4)
+
+        # a finished request is not reused
+        await coalescer.request("key", backend.send)
+        assert backend.calls == 2
+
+    # outside of `run`, requests are sent on their own
+    assert coalescer.task_group is None
+
+
+@pytest.mark.asyncio
+async def test_cancellation_is_reference_counted():
+    backend = Backend()
+
+    async with RequestCoalescer().run() as coalescer:
+        # the request is cancelled once its only waiter gives up
+        with anyio.move_on_after(0.01):
+            await coalescer.request("key", backend.send)
+        await anyio.wait_all_tasks_blocked()
+        assert (backend.calls, backend.cancelled) == (1, 1)
+
+        async with anyio.create_task_group() as waiters:
+            waiters.start_soon(coalescer.request, "key", backend.send)
+            await anyio.wait_all_tasks_blocked()
+            assert backend.calls == 2
+
+            # one waiter giving up keeps the request alive for the others
+            with anyio.move_on_after(0.01):
+                await coalescer.request("key", backend.send)
+            await anyio.wait_all_tasks_blocked()
+            assert backend.cancelled == 1
+            backend.reply.set()
+
+    assert backend.calls == 2
+    assert not coalescer._flights
+
+
+@pytest.mark.asyncio
+async def test_error_is_raised_to_all_waiters():
+    async def fail() -> dict:
+        await anyio.sleep(0.01)
+        raise JsonRpcTransportError("closed")
+
+    errors: list[BaseException] = []
+
+    async with RequestCoalescer().run() as coalescer:
+
+        async def request() -> None:
+            try:
+                await coalescer.request("key", fail)
+            except JsonRpcTransportError as e:
+                errors.append(e)
+
+        async with anyio.create_task_group() as waiters:
+            for _ in range(3):
+                waiters.start_soon(request)
+
+    assert len(errors) == 3
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import codecs
 from pathlib import Path
 
 import pytest
 
-from lsp_client.client.document_state import DocumentState, DocumentStateManager
+from lsp_client.client import document_state
+from lsp_client.client.document_state import (
+    DocumentState,
+    DocumentStateManager,
+    decode_content,
+)
 
 
 def test_document_state_immutable():
@@ -178,3 +184,115 @@ async def test_open_non_utf8_encoding(tmp_path: Path):
     assert new_docs[u1].content == content
     assert new_docs[u1].encoding.lower() in ("gbk", "gb2312", "cp936", "gb18030")
     assert manager.get_encoding(u1).lower() in ("gbk", "gb2312", "cp936", "gb18030")
+
+
+def test_overlay_update_holds_documents_open():
+    manager = DocumentStateManager()
+    manager.register("file:///open.py", "a", version=2)
+    manager.begin_overlay()
+
+    assert manager.overlay_update("file:///open.py", "b") == (3, False)
+    assert manager.overlay_update("file:///new.py", "c") == (0, True)
+    assert manager.overlay_update("file:///new.py", "d") == (1, False)
+
+    # closing the other reference keeps the changed document open
+    assert manager.close(["file:///open.py"]) == []
+    assert manager.get_content("file:///open.py") == "b"
+
+    changed = manager.end_overlay()
+    assert not manager.overlay_active
+    assert changed["file:///new.py"] is None
+    assert changed["file:///open.py"] is not None
+    assert changed["file:///open.py"].content == "a"
+    assert sorted(manager.close(changed)) == ["file:///new.py", "file:///open.py"]
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        (b"x = 1\n", ("x = 1\n", "utf-8")),
+        ("s = 'café'\n".encode(), ("s = 'café'\n", "utf-8")),
+        (codecs.BOM_UTF8 + b"x = 1\n", ("x = 1\n", "utf-8-sig")),
+    ],
+)
+def test_decode_content_utf8(content: bytes, expected: tuple[str, str]):
+    assert decode_content(content) == expected
+
+
+@pytest.mark.anyio
+async def test_open_caches_detected_encoding(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    f1 = tmp_path / "f1.py"
+    content = "这是一个测试文件，包含一些中文字符以测试编码检测功能。"  # noqa: RUF001
+    f1.write_bytes(content.encode("gbk"))
+    u1 = f1.as_uri()
+
+    manager = DocumentStateManager()
+    encoding = (await manager.open([u1]))[u1].encoding
+    manager.close([u1])
+
+    def fail(_: bytes) -> None:
+        raise AssertionError("charset detection should be cached")
+
+    monkeypatch.setattr(document_state, "from_bytes", fail)
+    state = (await manager.open([u1]))[u1]
+    assert (state.content, state.encoding) == (content, encoding)
+
+
+@pytest.mark.anyio
+async def test_warm_documents_evicted_by_count_and_size(tmp_path: Path):
+    uris = []
+    for i in range(4):
+        path = tmp_path / f"f{i}.py"
+        path.write_text("x" * 10)
+        uris.append(path.as_uri())
+
+    manager = DocumentStateManager(max_warm_documents=2, max_warm_bytes=25)
+    await manager.open(uris[:3])
+    # unused documents stay open, the least recently used one is evicted
+    assert manager.close(uris[:3]) == [uris[0]]
+    assert manager.get_content(uris[1]) is not None
+
+    # reopening a warm document takes it out of the warm set
+    assert await manager.open(uris[1:2]) == {}
+    assert manager.close(uris[1:2]) == []
+
+    await manager.open(uris[3:])
+    manager.max_warm_bytes = 15
+    assert manager.close(uris[3:]) == [uris[2], uris[1]]
+    assert manager.close_warm() == [uris[3]]
+
+
+@pytest.mark.anyio
+async def test_refresh_warm_reloads_changed_files(tmp_path: Path):
+    changed, unchanged = tmp_path / "changed.py", tmp_path / "unchanged.py"
+    changed.write_text("a = 1\n")
+    unchanged.write_text("b = 1\n")
+    uris = [changed.as_uri(), unchanged.as_uri()]
+
+    manager = DocumentStateManager(max_warm_documents=8)
+    await manager.open(uris)
+    manager.close(uris)
+
+    # a different size: the modification time may not change within a few ms
+    changed.write_text("a = 22\n")
+    old_indexes = await manager.refresh_warm(uris)
+
+    assert list(old_indexes) == [changed.as_uri()]
+    assert old_indexes[changed.as_uri()].text == "a = 1\n"
+    assert manager.get_content(changed.as_uri()) == "a = 22\n"
+    assert manager.get_version(changed.as_uri()) == 1
+    assert manager.get_version(unchanged.as_uri()) == 0
+
+
+@pytest.mark.anyio
+async def test_warm_documents_sized_in_bytes(tmp_path: Path):
+    path = tmp_path / "wide.py"
+    path.write_text("é" * 10, encoding="utf-8")
+    uri = path.as_uri()
+
+    # 10 characters, but 20 bytes
+    manager = DocumentStateManager(max_warm_documents=2, max_warm_bytes=15)
+    await manager.open([uri])
+    assert manager.close([uri]) == [uri]
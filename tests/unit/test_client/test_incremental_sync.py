@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from pathlib import Path
+from typing import override
+
+import pytest
+
+from lsp_client.capability.build import build_client_capabilities
+from lsp_client.utils.types import AnyPath, lsp_type
+
+from .test_cache import CachingClient
+
+
+class RecordingClient(CachingClient):
+    changes: list[Sequence[lsp_type.TextDocumentContentChangeEvent]]
+
+    @override
+    async def notify_text_document_changed(
+        self,
+        file_path: AnyPath,
+        content_changes: Sequence[lsp_type.TextDocumentContentChangeEvent],
+        version: int = 0,
+    ) -> None:
+        self.changes.append(content_changes)
+
+
+@pytest.mark.parametrize(
+    ("sync", "expected"),
+    [
+        (
+            lsp_type.TextDocumentSyncKind.Incremental,
+            lsp_type.TextDocumentContentChangePartial,
+        ),
+        (
+            lsp_type.TextDocumentSyncOptions(
+                change=lsp_type.TextDocumentSyncKind.Incremental
+            ),
+            lsp_type.TextDocumentContentChangePartial,
+        ),
+        (
+            lsp_type.TextDocumentSyncKind.Full,
+            lsp_type.TextDocumentContentChangeWholeDocument,
+        ),
+        (None, lsp_type.TextDocumentContentChangeWholeDocument),
+    ],
+)
+@pytest.mark.asyncio
+async def test_write_file_follows_server_sync_kind(
+    tmp_path: Path,
+    sync: lsp_type.TextDocumentSyncKind | lsp_type.TextDocumentSyncOptions | None,
+    expected: type,
+):
+    file_path = tmp_path / "a.py"
+    file_path.write_text("x = 1\n")
+    uri = file_path.as_uri()
+
+    client = RecordingClient(workspace=tmp_path)
+    client.changes = []
+    client._server_capabilities = lsp_type.ServerCapabilities(text_document_sync=sync)
+    client._doc.register(uri, "x = 1\n")
+
+    await client.write_file(uri, "x = 2\n")
+
+    [[change]] = client.changes
+    assert isinstance(change, expected)
+    if isinstance(change, lsp_type.TextDocumentContentChangePartial):
+        assert change.text == "2"
+    assert file_path.read_text() == "x = 2\n"
+
+
+def test_client_offers_position_encodings():
+    capabilities = build_client_capabilities(RecordingClient)
+    assert capabilities.general is not None
+    assert capabilities.general.position_encodings == [
+        lsp_type.PositionEncodingKind.Utf32,
+        lsp_type.PositionEncodingKind.Utf16,
+        lsp_type.PositionEncodingKind.Utf8,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_incremental_change_uses_negotiated_encoding(tmp_path: Path):
+    file_path = tmp_path / "a.py"
+    file_path.write_text("s = '😀'\n")
+    uri = file_path.as_uri()
+
+    client = RecordingClient(workspace=tmp_path)
+    client.changes = []
+    client._server_capabilities = lsp_type.ServerCapabilities(
+        text_document_sync=lsp_type.TextDocumentSyncKind.Incremental
+    )
+    client._position_encoding = lsp_type.PositionEncodingKind.Utf8
+    client._doc.register(uri, "s = '😀'\n")
+
+    await client.write_file(uri, "s = '😀!'\n")
+
+    [[change]] = client.changes
+    assert isinstance(change, lsp_type.TextDocumentContentChangePartial)
+    assert change.range.start == lsp_type.Position(line=0, character=9)
+
+
+@pytest.mark.asyncio
+async def test_write_files_notifies_open_documents(tmp_path: Path):
+    paths = [tmp_path / f"{name}.py" for name in "abc"]
+    for path in paths:
+        path.write_text("x = 1\n")
+
+    client = RecordingClient(workspace=tmp_path)
+    client.changes = []
+    for path in paths[:2]:
+        client._doc.register(path.as_uri(), "x = 1\n")
+
+    await client.write_files({path.as_uri(): "x = 2\n" for path in paths})
+
+    assert all(path.read_text() == "x = 2\n" for path in paths)
+    # only the open documents are synced
+    assert len(client.changes) == 2
+    assert all(client._doc.get_version(path.as_uri()) == 1 for path in paths[:2])
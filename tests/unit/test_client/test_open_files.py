@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from pathlib import Path
 from typing import override
 
@@ -117,3 +118,49 @@ async def test_open_files_mixed_files(tmp_path: Path):
         assert u2 not in client._doc._states
 
     assert u1 not in client._doc._states
+
+
+class RecordingOpenFilesClient(OpenFilesTestClient):
+    sent: list[str]
+
+    @override
+    async def notify_text_document_opened(
+        self, file_path: AnyPath, file_content: str
+    ) -> None:
+        self.sent.append("open")
+
+    @override
+    async def notify_text_document_changed(
+        self,
+        file_path: AnyPath,
+        content_changes: Sequence[lsp_type.TextDocumentContentChangeEvent],
+        version: int = 0,
+    ) -> None:
+        self.sent.append("change")
+
+    @override
+    async def notify_text_document_closed(self, file_path: AnyPath) -> None:
+        self.sent.append("close")
+
+
+@pytest.mark.anyio
+async def test_open_files_keeps_warm_documents_open(tmp_path: Path):
+    file_path = tmp_path / "test.py"
+    file_path.write_text("x = 1\n")
+
+    client = RecordingOpenFilesClient(workspace=tmp_path, max_warm_documents=4)
+    client.sent = []
+    uri = file_path.as_uri()
+
+    for _ in range(3):
+        async with client.open_files(file_path):
+            pass
+    assert client.sent == ["open"]
+    assert client._doc.get_content(uri) == "x = 1\n"
+
+    # the file changed on disk while it was unused
+    file_path.write_text("x = 22\n")
+    async with client.open_files(file_path):
+        assert client._doc.get_content(uri) == "x = 22\n"
+    assert client.sent == ["open", "change"]
+    assert client._doc.get_version(uri) == 1
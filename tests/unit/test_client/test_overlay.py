@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import override
+
+import pytest
+
+from lsp_client.exception import EditApplicationError
+from lsp_client.utils.types import Notification, lsp_type
+from lsp_client.utils.workspace_edit import WorkspaceEditApplicator
+
+from .test_cache import CachingClient
+
+
+class OverlayClient(CachingClient):
+    sent: list[Notification]
+
+    @override
+    async def notify(self, msg: Notification) -> None:
+        self.sent.append(msg)
+
+
+def _client(tmp_path: Path) -> OverlayClient:
+    client = OverlayClient(workspace=tmp_path)
+    client.sent = []
+    return client
+
+
+def _methods(client: OverlayClient) -> list[str]:
+    return [type(msg).__name__ for msg in client.sent]
+
+
+@pytest.mark.asyncio
+async def test_overlay_keeps_writes_in_memory(tmp_path: Path):
+    path = tmp_path / "a.py"
+    path.write_text("x = 1\n")
+    uri = path.as_uri()
+    client = _client(tmp_path)
+
+    async with client.overlay() as overlay:
+        await client.write_file(uri, "x = 2\n")
+        assert await client.read_file(path) == "x = 2\n"
+        assert overlay.uris == [uri]
+        assert path.read_text() == "x = 1\n"
+
+        await overlay.discard()
+        assert overlay.uris == []
+        assert await client.read_file(path) == "x = 1\n"
+
+    assert _methods(client) == [
+        "DidOpenTextDocumentNotification",
+        "DidCloseTextDocumentNotification",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_overlay_discard_reverts_open_document(tmp_path: Path):
+    path = tmp_path / "a.py"
+    path.write_text("x = 1\n")
+    uri = path.as_uri()
+    client = _client(tmp_path)
+    client._doc.register(uri, "x = 1\n", version=3)
+
+    async with client.overlay():
+        await client.write_file(uri, "x = 2\n")
+        assert client._doc.get_version(uri) == 4
+
+    # the server is told about the original content with a newer version
+    assert client._doc.get_content(uri) == "x = 1\n"
+    assert client._doc.get_version(uri) == 5
+    assert _methods(client) == ["DidChangeTextDocumentNotification"] * 2
+    assert path.read_text() == "x = 1\n"
+
+
+@pytest.mark.asyncio
+async def test_overlay_commit_writes_to_disk(tmp_path: Path):
+    paths = [tmp_path / "a.py", tmp_path / "b.py"]
+    for path in paths:
+        path.write_text("x = 1\n")
+    client = _client(tmp_path)
+
+    async with client.overlay() as overlay:
+        await client.write_files({path.as_uri(): "x = 2\n" for path in paths})
+        await overlay.commit()
+        assert overlay.uris == []
+
+    assert all(path.read_text() == "x = 2\n" for path in paths)
+    assert client._doc.get_content(paths[0].as_uri()) is None
+    assert _methods(client).count("DidCloseTextDocumentNotification") == 2
+
+
+@pytest.mark.asyncio
+async def test_overlay_applies_workspace_edits_in_memory(tmp_path: Path):
+    path = tmp_path / "a.py"
+    path.write_text("old_name = 1\n")
+    uri = path.as_uri()
+    client = _client(tmp_path)
+    applicator = WorkspaceEditApplicator(client=client)
+
+    edit = lsp_type.TextEdit(
+        range=lsp_type.Range(
+            start=lsp_type.Position(line=0, character=0),
+            end=lsp_type.Position(line=0, character=8),
+        ),
+        new_text="new_name",
+    )
+
+    async with client.overlay():
+        await applicator.apply_workspace_edit(
+            lsp_type.WorkspaceEdit(changes={uri: [edit]})
+        )
+        assert await client.read_file(path) == "new_name = 1\n"
+
+        with pytest.raises(EditApplicationError):
+            await applicator.apply_workspace_edit(
+                lsp_type.WorkspaceEdit(document_changes=[lsp_type.DeleteFile(uri=uri)])
+            )
+
+    assert path.read_text() == "old_name = 1\n"
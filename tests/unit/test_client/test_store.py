@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from lsp_client.client.store import (
+    STORED_METHODS,
+    ResultStore,
+    content_hash,
+    store_key,
+)
+from lsp_client.utils.types import lsp_type
+
+from .test_cache import CachingClient, CountingServer
+
+
+def response(result: object) -> dict:
+    return {"jsonrpc": "2.0", "id": 1, "result": result}
+
+
+def test_store_persists_across_instances(tmp_path: Path):
+    path = tmp_path / "results.sqlite"
+    with ResultStore(path=path) as store:
+        store.put_sync("a", response([1, 2]))  # type: ignore[arg-type]
+        store.put_sync("err", {"jsonrpc": "2.0", "id": 1, "error": {}})  # type: ignore[arg-type]
+
+    with ResultStore(path=path) as store:
+        assert store.get_sync("a") == response([1, 2])
+        assert store.get_sync("err") is None
+        assert (store.stats.hits, store.stats.misses) == (1, 1)
+
+
+def test_store_ttl(tmp_path: Path):
+    with ResultStore(path=tmp_path / "results.sqlite", ttl=-1) as store:
+        store.put_sync("a", response(None))  # type: ignore[arg-type]
+        assert store.get_sync("a") is None
+        assert store.stats.expired == 1
+
+
+def test_store_evicts_least_recently_used(tmp_path: Path):
+    one = response("x" * 100)
+
+    with ResultStore(path=tmp_path / "results.sqlite", max_bytes=300) as store:
+        store.put_sync("a", one)  # type: ignore[arg-type]
+        store.put_sync("b", one)  # type: ignore[arg-type]
+        assert store.get_sync("a") is not None  # `b` becomes least recently used
+        store.put_sync("c", one)  # type: ignore[arg-type]
+
+        assert store.get_sync("b") is None
+        assert store.get_sync("a") is not None
+        assert store.get_sync("c") is not None
+        assert store.stats.evictions == 1
+
+
+def test_keys():
+    assert content_hash("x = 1") == content_hash(b"x = 1")
+    assert store_key("a", "bc") != store_key("ab", "c")
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_stored_results(tmp_path: Path):
+    file_path = tmp_path / "a.py"
+    file_path.write_text("x = 1\n")
+    uri = file_path.as_uri()
+    request = lsp_type.DocumentSymbolRequest(
+        id=1,
+        params=lsp_type.DocumentSymbolParams(
+            text_document=lsp_type.TextDocumentIdentifier(uri=uri)
+        ),
+    )
+
+    with ResultStore(path=tmp_path / "results.sqlite") as store:
+        servers: list[CountingServer] = []
+        for _ in range(2):
+            # a new session with the same server
+            client = CachingClient(workspace=tmp_path, result_store=store)
+            client._server = server = CountingServer()  # type: ignore[assignment]
+            client._server_info = lsp_type.ServerInfo(name="fake", version="1.0")
+            await client.request(request, schema=lsp_type.DocumentSymbolResponse)
+            servers.append(server)
+
+        assert [len(server.requests) for server in servers] == [1, 0]
+
+        # changed content misses the store
+        file_path.write_text("x = 2\n")
+        await client.request(request, schema=lsp_type.DocumentSymbolResponse)
+        assert len(servers[-1].requests) == 1
+
+
+def test_diagnostics_not_stored_by_default():
+    # diagnostics depend on other files than the one hashed in the key
+    assert lsp_type.TEXT_DOCUMENT_DIAGNOSTIC not in STORED_METHODS
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+
+from lsp_client.clients.rust_analyzer import RustAnalyzerClient
+from lsp_client.clients.rust_analyzer.models import (
+    RustAnalyzerServerStatusNotification,
+    RustAnalyzerServerStatusParams,
+)
+from lsp_client.utils.types import lsp_type
+
+
+def progress(token: str, **value: object) -> lsp_type.ProgressNotification:
+    return lsp_type.ProgressNotification(
+        params=lsp_type.ProgressParams(token=token, value=value)
+    )
+
+
+@pytest.mark.asyncio
+async def test_work_done_progress_tracks_busy():
+    client = RustAnalyzerClient()
+
+    resp = await client.respond_work_done_progress_create(
+        lsp_type.WorkDoneProgressCreateRequest(
+            id=1, params=lsp_type.WorkDoneProgressCreateParams(token="index")
+        )
+    )
+    assert resp.id == 1
+    with pytest.raises(TimeoutError):
+        await client.wait_until_idle(timeout=0.05, quiet_period=0)
+
+    await client.receive_progress(progress("index", kind="begin", title="Indexing"))
+    await client.receive_progress(progress("index", kind="report", percentage=50))
+    assert client.get_progress_dispatcher().work_done.active == {"index": "Indexing"}
+
+    await client.receive_progress(progress("index", kind="end"))
+    await client.wait_until_idle(timeout=1, quiet_period=0)
+
+
+@pytest.mark.asyncio
+async def test_rust_analyzer_server_status_tracks_busy():
+    client = RustAnalyzerClient()
+
+    def status(quiescent: bool) -> RustAnalyzerServerStatusNotification:
+        return RustAnalyzerServerStatusNotification(
+            params=RustAnalyzerServerStatusParams(health="ok", quiescent=quiescent)
+        )
+
+    await client.receive_rust_analyzer_server_status(status(quiescent=False))
+    with pytest.raises(TimeoutError):
+        await client.wait_until_idle(timeout=0.05, quiet_period=0)
+
+    await client.receive_rust_analyzer_server_status(status(quiescent=True))
+    await client.wait_until_idle(timeout=1, quiet_period=0)
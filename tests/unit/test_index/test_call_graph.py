@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, override
+
+import anyio
+import pytest
+
+from lsp_client.capability.request.call_hierarchy import WithRequestCallHierarchy
+from lsp_client.index import CallGraphCrawler
+from lsp_client.utils.types import Request, lsp_type
+from tests.framework.mocks import MockCapabilityClient
+
+CALLS = {
+    "main": ["parse", "run"],
+    "parse": ["read", "tokenize"],
+    "run": ["parse", "log"],
+    "tokenize": ["log"],
+    "read": [],
+    "log": [],
+}
+"""The callees of each function of the fake workspace."""
+
+
+def _item(name: str) -> dict:
+    line = list(CALLS).index(name)
+    range_ = {
+        "start": {"line": line, "character": 0},
+        "end": {"line": line, "character": len(name)},
+    }
+    return {
+        "name": name,
+        "kind": lsp_type.SymbolKind.Function.value,
+        "uri": f"file:///{name}.py",
+        "range": range_,
+        "selectionRange": range_,
+    }
+
+
+def _call_range(line: int) -> dict:
+    pos = {"line": line, "character": 4}
+    return {"start": pos, "end": pos}
+
+
+class CallHierarchyClient(MockCapabilityClient, WithRequestCallHierarchy):
+    """Answers call hierarchy requests from `CALLS`."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.queried: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @override
+    async def answer(self, req: Request) -> Any:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await anyio.sleep(0.001)
+        self.in_flight -= 1
+
+        match req:
+            case lsp_type.CallHierarchyPrepareRequest(params=params):
+                name = Path(params.text_document.uri).stem
+                return [_item(name)]
+            case lsp_type.CallHierarchyOutgoingCallsRequest(params=params):
+                self.queried.append(f"out:{params.item.name}")
+                return [
+                    {"to": _item(callee), "fromRanges": [_call_range(i)]}
+                    for i, callee in enumerate(CALLS[params.item.name])
+                ]
+            case lsp_type.CallHierarchyIncomingCallsRequest(params=params):
+                self.queried.append(f"in:{params.item.name}")
+                return [
+                    {"from": _item(caller), "fromRanges": [_call_range(0)]}
+                    for caller, callees in CALLS.items()
+                    if params.item.name in callees
+                ]
+            case _:
+                raise NotImplementedError(req)
+
+
+ORIGIN = lsp_type.Position(line=0, character=0)
+
+
+def _names(crawler: CallGraphCrawler) -> list[tuple[str, str]]:
+    nodes = crawler.graph.nodes
+    return sorted(
+        (nodes[a].name, nodes[b].name) for a, b in crawler.graph.to_edge_list()
+    )
+
+
+@pytest.mark.asyncio
+async def test_crawl_outgoing():
+    client = CallHierarchyClient()
+    crawler = CallGraphCrawler(client, max_concurrency=2)
+
+    async with crawler.stream([("main.py", ORIGIN)]) as edges:
+        streamed = [(e.caller.name, e.callee.name) async for e in edges]
+
+    assert sorted(streamed) == _names(crawler)
+    assert _names(crawler) == [
+        ("main", "parse"),
+        ("main", "run"),
+        ("parse", "read"),
+        ("parse", "tokenize"),
+        ("run", "log"),
+        ("run", "parse"),
+        ("tokenize", "log"),
+    ]
+    # every item is queried once, and only the root file is opened
+    assert sorted(client.queried) == sorted(f"out:{name}" for name in CALLS)
+    assert client.opened == [("main.py",)]
+    assert client.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_crawl_budgets():
+    graph = await CallGraphCrawler(CallHierarchyClient(), max_depth=1).crawl(
+        [("main.py", ORIGIN)]
+    )
+    assert [item.name for item in graph.nodes] == ["main", "parse", "run"]
+
+    crawler = CallGraphCrawler(CallHierarchyClient(), max_nodes=4)
+    graph = await crawler.crawl([("main.py", ORIGIN)])
+    assert len(graph.nodes) == 4
+    # calls to items over the budget are left out
+    assert all(a < 4 and b < 4 for a, b in graph.to_edge_list())
+
+
+@pytest.mark.asyncio
+async def test_crawl_incoming_and_both():
+    crawler = CallGraphCrawler(CallHierarchyClient(), direction="incoming")
+    await crawler.crawl([("log.py", ORIGIN)])
+    assert _names(crawler) == [
+        ("main", "parse"),
+        ("main", "run"),
+        ("parse", "tokenize"),
+        ("run", "log"),
+        ("run", "parse"),
+        ("tokenize", "log"),
+    ]
+    assert {item.name for item in crawler.graph.nodes} == set(CALLS) - {"read"}
+
+    crawler = CallGraphCrawler(CallHierarchyClient(), direction="both")
+    # a root given twice is crawled once
+    graph = await crawler.crawl([("parse.py", ORIGIN), ("parse.py", ORIGIN)])
+    assert {item.name for item in graph.nodes} == set(CALLS)
+    # edges found from both of their ends are recorded once
+    assert len(_names(crawler)) == len(set(_names(crawler))) == 7
+
+
+@pytest.mark.asyncio
+async def test_call_graph_adjacency():
+    graph = await CallGraphCrawler(CallHierarchyClient()).crawl([("main.py", ORIGIN)])
+
+    offsets, targets = graph.to_adjacency()
+    assert len(offsets) == len(graph.nodes) + 1
+    assert offsets[-1] == len(targets) == len(graph.edges)
+    for i, item in enumerate(graph.nodes):
+        callees = {graph.nodes[j].name for j in targets[offsets[i] : offsets[i + 1]]}
+        assert callees == set(CALLS[item.name])
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from lsp_client.index import SymbolIndexer, SymbolRecord, SymbolStore
+from lsp_client.utils.symbol import DocumentSymbolPath
+from lsp_client.utils.types import lsp_type
+from lsp_client.utils.workspace import format_workspace
+
+from .test_symbols import IndexingClient
+
+
+def _record(path: Path, name: str, line: int = 0) -> SymbolRecord:
+    position = lsp_type.Position(line=line, character=4)
+    return SymbolRecord(
+        path,
+        DocumentSymbolPath.from_str(name),
+        lsp_type.SymbolKind.Function,
+        lsp_type.Range(start=position, end=position),
+    )
+
+
+def test_store_lookups(tmp_path: Path):
+    a, b = tmp_path / "a.py", tmp_path / "b.py"
+    with SymbolStore(tmp_path / "symbols.sqlite") as store:
+        store.put(a, (1, 1), [_record(a, "Foo"), _record(a, "Foo.bar", 3)])
+        store.put(b, (1, 1), [_record(b, "foo_bar"), _record(b, "Baz.bar")])
+
+    # lookups need no client, only the database
+    with SymbolStore(tmp_path / "symbols.sqlite") as store:
+        assert store.lookup("bar") == [_record(a, "Foo.bar", 3), _record(b, "Baz.bar")]
+        assert store.lookup("bar", kind=lsp_type.SymbolKind.Class) == []
+        assert [r.symbol_path.format() for r in store.lookup_prefix("Fo")] == ["Foo"]
+        assert [r.symbol_path.format() for r in store.lookup_prefix("foo")] == [
+            "foo_bar"
+        ]
+        assert len(store.lookup_prefix("", limit=3)) == 3
+        assert store.members("Foo") == [_record(a, "Foo.bar", 3)]
+        assert store.members(DocumentSymbolPath(())) == [
+            _record(a, "Foo"),
+            _record(b, "foo_bar"),
+        ]
+
+        store.put(a, (2, 2), [_record(a, "Qux")])
+        assert store.symbols_of(a) == [_record(a, "Qux")]
+
+
+def test_store_lookup_prefix_at_code_point_bounds(tmp_path: Path):
+    top, below = chr(0x10FFFF), chr(0xD7FF)
+    names = [f"a{top}", f"a{top}b", "b", f"{top}{top}", below, f"{below}x"]
+    a = tmp_path / "a.py"
+    with SymbolStore(tmp_path / "symbols.sqlite") as store:
+        store.put(a, (1, 1), [_record(a, name, i) for i, name in enumerate(names)])
+
+        def names_of(prefix: str) -> list[str]:
+            return [r.symbol_path.format() for r in store.lookup_prefix(prefix)]
+
+        assert names_of(f"a{top}") == [f"a{top}", f"a{top}b"]
+        assert names_of(top) == [f"{top}{top}"]
+        assert names_of(below) == [below, f"{below}x"]
+
+
+def test_store_dotted_container(tmp_path: Path):
+    a = tmp_path / "A.java"
+    position = lsp_type.Position(line=0, character=0)
+    record = SymbolRecord(
+        a,
+        DocumentSymbolPath(("com.example.Foo", "bar")),
+        lsp_type.SymbolKind.Method,
+        lsp_type.Range(start=position, end=position),
+    )
+    with SymbolStore(tmp_path / "symbols.sqlite") as store:
+        store.put(a, (1, 1), [record])
+
+        assert store.lookup("bar") == [record]
+        assert store.members(DocumentSymbolPath(("com.example.Foo",))) == [record]
+        assert store.members("com.example.Foo") == []
+        assert store.members("") == []
+
+
+def test_store_is_rebuilt_on_schema_change(tmp_path: Path):
+    path = tmp_path / "symbols.sqlite"
+    with SymbolStore(path) as store:
+        store.put(tmp_path / "a.py", (1, 1), [_record(tmp_path / "a.py", "Foo")])
+    with sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA user_version = 0")
+
+    with SymbolStore(path) as store:
+        assert store.lookup("Foo") == []
+
+
+def test_store_for_workspace(tmp_path: Path):
+    workspace = format_workspace(tmp_path)
+    store = SymbolStore.for_workspace(workspace, tmp_path / "cache")
+    assert store.path == tmp_path / "cache" / "symbols" / f"{workspace.id}.sqlite"
+
+
+@pytest.mark.asyncio
+async def test_update_reindexes_changed_files(tmp_path: Path):
+    root = tmp_path / "root"
+    root.mkdir()
+    for name in ("a.py", "b.py", "c.py", "bad.py"):
+        (root / name).write_text("")
+
+    with SymbolStore(tmp_path / "symbols.sqlite") as store:
+        client = IndexingClient(root)
+        stats = await SymbolIndexer(client).update(store)
+        assert (stats.files_total, stats.errors) == (4, 1)
+        assert len(client.requested) == 4
+        assert [r.path.name for r in store.lookup("method")] == ["a.py", "b.py", "c.py"]
+
+        # a new session: only the changed file and the failed one are queried
+        (root / "a.py").write_text("changed")
+        (root / "c.py").unlink()
+        client = IndexingClient(root)
+        stats = await SymbolIndexer(client).update(store)
+        assert sorted(Path(uri).name for uri in client.requested) == ["a.py", "bad.py"]
+        assert [r.path.name for r in store.lookup("method")] == ["a.py", "b.py"]
+        assert store.lookup("C") == []
+
+        client = IndexingClient(root)
+        await SymbolIndexer(client).update(store)
+        assert [Path(uri).name for uri in client.requested] == ["bad.py"]
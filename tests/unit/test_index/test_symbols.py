@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, override
+
+import anyio
+import pytest
+from lsprotocol.types import LanguageKind
+
+from lsp_client.capability.request.document_symbol import WithRequestDocumentSymbol
+from lsp_client.index import IndexStats, SymbolIndexer
+from lsp_client.protocol.lang import LanguageConfig
+from lsp_client.utils.symbol import DocumentSymbolPath
+from lsp_client.utils.types import Request, lsp_type
+from lsp_client.utils.workspace import Workspace, format_workspace
+from tests.framework.mocks import MockCapabilityClient
+
+
+def _range(line: int) -> dict:
+    return {
+        "start": {"line": line, "character": 0},
+        "end": {"line": line + 1, "character": 0},
+    }
+
+
+def _symbol(name: str, line: int, children: list[dict] | None = None) -> dict:
+    symbol = {
+        "name": name,
+        "kind": lsp_type.SymbolKind.Class.value,
+        "range": _range(line),
+        "selectionRange": _range(line),
+    }
+    if children:
+        symbol["children"] = children
+    return symbol
+
+
+class IndexingClient(MockCapabilityClient, WithRequestDocumentSymbol):
+    """Answers with a class and a method named after the file, or fails for `bad.py`."""
+
+    def __init__(self, root: Path) -> None:
+        super().__init__()
+        self.workspace = format_workspace(root)
+        self.requested: list[str] = []
+
+    @override
+    async def answer(self, req: Request) -> Any:
+        uri = req.params.text_document.uri  # type: ignore[attr-defined]
+        self.requested.append(uri)
+        name = Path(uri).stem
+        if name == "bad":
+            raise TimeoutError
+        await anyio.sleep(0)
+        return [_symbol(name.title(), 0, [_symbol("method", 1)])]
+
+    @override
+    def get_workspace(self) -> Workspace:
+        return self.workspace
+
+    @override
+    @classmethod
+    def get_language_config(cls) -> LanguageConfig:
+        return LanguageConfig(
+            kind=LanguageKind.Python, suffixes=[".py"], project_files=[]
+        )
+
+
+@pytest.mark.asyncio
+async def test_index_workspace(tmp_path: Path):
+    for name in ("a.py", "b.py", "bad.py", "notes.txt", "ignored/c.py"):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text("")
+    (tmp_path / ".gitignore").write_text("ignored/\n")
+
+    progress: list[int] = []
+    indexer = SymbolIndexer(
+        IndexingClient(tmp_path),
+        max_concurrency=2,
+        on_progress=lambda stats: progress.append(stats.files_done),
+    )
+    records = await indexer.index()
+
+    assert sorted((r.path.name, r.symbol_path.format()) for r in records) == [
+        ("a.py", "A"),
+        ("a.py", "A.method"),
+        ("b.py", "B"),
+        ("b.py", "B.method"),
+    ]
+    method = next(
+        r for r in records if r.symbol_path == DocumentSymbolPath(("A", "method"))
+    )
+    assert method.range.start.line == 1
+    assert method.kind == lsp_type.SymbolKind.Class
+
+    stats = indexer.stats
+    assert (stats.files_total, stats.files_done, stats.errors, stats.symbols) == (
+        3,
+        3,
+        1,
+        4,
+    )
+    assert progress == [1, 2, 3]
+
+
+def test_index_stats_throughput():
+    stats = IndexStats(files_done=10, started=0.0)
+    assert stats.files_per_second > 0
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, override
+
+import anyio
+import pytest
+
+from lsp_client.capability.request.type_hierarchy import WithRequestTypeHierarchy
+from lsp_client.index import TypeHierarchyClosure
+from lsp_client.utils.types import Request, lsp_type
+from tests.framework.mocks import MockCapabilityClient
+
+SUPERTYPES = {
+    "Shape": [],
+    "Polygon": ["Shape"],
+    "Circle": ["Shape"],
+    "Square": ["Polygon"],
+    "Triangle": ["Polygon"],
+    "Cube": ["Square"],
+}
+"""The direct supertypes of each type of the fake workspace."""
+
+
+class FakeDocumentState:
+    def __init__(self) -> None:
+        self.hashes: dict[str, str] = {}
+
+    def get_content_hash(self, uri: str) -> str | None:
+        return self.hashes.get(uri)
+
+
+class TypeHierarchyClient(MockCapabilityClient, WithRequestTypeHierarchy):
+    """Answers type hierarchy requests from `SUPERTYPES`, one file per type."""
+
+    def __init__(self, root: Path) -> None:
+        super().__init__()
+        self.root = root
+        self.state = FakeDocumentState()
+        self.requests: list[str] = []
+        for name in SUPERTYPES:
+            (root / f"{name}.java").write_text(f"class {name} {{}}\n")
+
+    def item(self, name: str) -> dict:
+        range_ = {
+            "start": {"line": 0, "character": 6},
+            "end": {"line": 0, "character": 6 + len(name)},
+        }
+        return {
+            "name": name,
+            "kind": lsp_type.SymbolKind.Class.value,
+            "uri": (self.root / f"{name}.java").as_uri(),
+            "range": range_,
+            "selectionRange": range_,
+        }
+
+    @override
+    async def answer(self, req: Request) -> Any:
+        await anyio.sleep(0)
+        match req:
+            case lsp_type.TypeHierarchyPrepareRequest(params=params):
+                name = Path(params.text_document.uri).stem
+                self.requests.append(f"prepare:{name}")
+                return [self.item(name)]
+            case lsp_type.TypeHierarchySupertypesRequest(params=params):
+                name = params.item.name
+                self.requests.append(f"super:{name}")
+                return [self.item(t) for t in SUPERTYPES[name]]
+            case lsp_type.TypeHierarchySubtypesRequest(params=params):
+                name = params.item.name
+                self.requests.append(f"sub:{name}")
+                return [self.item(t) for t, s in SUPERTYPES.items() if name in s]
+            case _:
+                raise NotImplementedError(req)
+
+    @override
+    def get_document_state(self) -> Any:
+        return self.state
+
+
+ORIGIN = lsp_type.Position(line=0, character=6)
+
+
+@pytest.mark.asyncio
+async def test_subtypes_closure(tmp_path: Path):
+    client = TypeHierarchyClient(tmp_path)
+    closure = TypeHierarchyClosure(client)
+
+    result = await closure.subtypes([(tmp_path / "Shape.java", ORIGIN)])
+
+    assert [item.name for item in result.roots] == ["Shape"]
+    assert {item.name for item in result.items} == {
+        "Polygon",
+        "Circle",
+        "Square",
+        "Triangle",
+        "Cube",
+    }
+    assert not result.truncated
+    nodes = result.nodes
+    assert sorted((nodes[a].name, nodes[b].name) for a, b in result.edges) == sorted(
+        (s, t) for t, supers in SUPERTYPES.items() for s in supers
+    )
+    assert sorted(client.requests) == sorted(
+        ["prepare:Shape", *(f"sub:{name}" for name in SUPERTYPES)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_supertypes_are_memoized(tmp_path: Path):
+    client = TypeHierarchyClient(tmp_path)
+    closure = TypeHierarchyClosure(client)
+
+    cube = await closure.supertypes([(tmp_path / "Cube.java", ORIGIN)])
+    assert [item.name for item in cube.items] == ["Square", "Polygon", "Shape"]
+
+    # `Triangle` shares its supertypes with `Cube`: only its own step is queried
+    client.requests.clear()
+    triangle = await closure.supertypes([(tmp_path / "Triangle.java", ORIGIN)])
+    assert [item.name for item in triangle.items] == ["Polygon", "Shape"]
+    assert client.requests == ["prepare:Triangle", "super:Triangle"]
+
+    # a re-query of an unchanged closure sends nothing nor opens any file
+    client.requests.clear()
+    opened = len(client.opened)
+    assert await closure.supertypes([(tmp_path / "Cube.java", ORIGIN)]) is cube
+    assert client.requests == []
+    assert len(client.opened) == opened
+
+
+@pytest.mark.asyncio
+async def test_closure_invalidated_by_document_changes(tmp_path: Path):
+    client = TypeHierarchyClient(tmp_path)
+    closure = TypeHierarchyClosure(client)
+    roots = [(tmp_path / "Cube.java", ORIGIN)]
+    await closure.supertypes(roots)
+
+    # a new content of an involved document re-queries the steps it is part of,
+    # even if it was reopened at the same version
+    client.requests.clear()
+    client.state.hashes[(tmp_path / "Polygon.java").as_uri()] = "edited"
+    await closure.supertypes(roots)
+    assert sorted(client.requests) == ["super:Polygon", "super:Square"]
+
+    # so does a change on disk
+    client.requests.clear()
+    (tmp_path / "Shape.java").write_text("class Shape extends Object {}\n")
+    await closure.supertypes(roots)
+    assert sorted(client.requests) == ["super:Polygon", "super:Shape"]
+
+    client.requests.clear()
+    closure.invalidate()
+    await closure.supertypes(roots)
+    assert len(client.requests) == 5
+
+
+@pytest.mark.asyncio
+async def test_closure_limits(tmp_path: Path):
+    client = TypeHierarchyClient(tmp_path)
+    roots = [(tmp_path / "Shape.java", ORIGIN)]
+
+    result = await TypeHierarchyClosure(client, max_depth=1).subtypes(roots)
+    assert {item.name for item in result.items} == {"Polygon", "Circle"}
+    assert result.truncated
+
+    result = await TypeHierarchyClosure(client, max_items=3).subtypes(roots)
+    assert len(result.items) == 3
+    assert result.truncated
+    assert all(a < 4 and b < 4 for a, b in result.edges)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from lsp_client.jsonrpc.codec import (
+    JsonCodec,
+    StdlibJsonCodec,
+    default_json_codec,
+    get_json_codec,
+)
+from lsp_client.jsonrpc.parse import write_raw_package
+
+PACKAGE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "result": [{"uri": "file:///a/ü.py", "range": None}],
+}
+
+
+@pytest.mark.parametrize("name", ["stdlib", "orjson", "msgspec"])
+def test_codec_roundtrip(name):
+    if name != "stdlib":
+        pytest.importorskip(name)
+
+    codec = get_json_codec(name)
+    assert isinstance(codec, JsonCodec)
+
+    encoded = codec.encode(PACKAGE)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == PACKAGE
+    assert codec.decode(bytearray(encoded)) == PACKAGE
+    assert codec.decode(memoryview(encoded)) == PACKAGE
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError, match="Unknown JSON codec"):
+        get_json_codec("yaml")  # type: ignore[arg-type]
+
+
+def test_default_codec_is_stdlib():
+    assert isinstance(default_json_codec(), StdlibJsonCodec)
+
+
+@pytest.mark.asyncio
+async def test_write_raw_package_with_codec():
+    pytest.importorskip("orjson")
+    mock_sender = AsyncMock()
+
+    await write_raw_package(mock_sender, PACKAGE, get_json_codec("orjson"))
+
+    sent = mock_sender.send.call_args.args[0]
+    header, body = sent.split(b"\r\n\r\n", 1)
+    assert header == f"Content-Length: {len(body)}".encode()
+    assert json.loads(body) == PACKAGE
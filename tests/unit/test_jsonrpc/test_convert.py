@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pytest
+
 """
 Example unit tests for JSON-RPC module.
 
@@ -76,6 +78,169 @@ class TestJsonRpcConvert:
             pass
 
 
+def _range(line: int) -> dict:
+    return {
+        "start": {"line": line, "character": 0},
+        "end": {"line": line, "character": 8},
+    }
+
+
+FAST_PATH_CASES = [
+    (
+        "ReferencesResponse",
+        {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": [{"uri": "file:///a.py", "range": _range(i)} for i in range(3)],
+        },
+    ),
+    (
+        "DocumentSymbolResponse",
+        {
+            "jsonrpc": "2.0",
+            "id": 2,
+            "result": [
+                {
+                    "name": "Outer",
+                    "kind": 5,
+                    "range": _range(0),
+                    "selectionRange": _range(0),
+                    "tags": [1],
+                    "children": [
+                        {
+                            "name": "inner",
+                            "kind": 6,
+                            "detail": "def inner()",
+                            "range": _range(1),
+                            "selectionRange": _range(1),
+                        }
+                    ],
+                }
+            ],
+        },
+    ),
+    (
+        "CompletionResponse",
+        {
+            "jsonrpc": "2.0",
+            "id": 3,
+            "result": {
+                "isIncomplete": False,
+                "items": [
+                    {
+                        "label": "print",
+                        "kind": 3,
+                        "documentation": {"kind": "markdown", "value": "doc"},
+                        "textEdit": {"range": _range(2), "newText": "print"},
+                    }
+                ],
+            },
+        },
+    ),
+    (
+        "PublishDiagnosticsNotification",
+        {
+            "jsonrpc": "2.0",
+            "method": "textDocument/publishDiagnostics",
+            "params": {
+                "uri": "file:///a.py",
+                "diagnostics": [
+                    {
+                        "range": _range(4),
+                        "message": "unused",
+                        "severity": 2,
+                        "code": "W0612",
+                        "tags": [1],
+                    }
+                ],
+            },
+        },
+    ),
+    (
+        "InitializeResponse",
+        {
+            "jsonrpc": "2.0",
+            "id": "initialize",
+            "result": {
+                "capabilities": {
+                    "notebookDocumentSync": {
+                        "notebookSelector": [
+                            {"notebook": {"notebookType": "jupyter-notebook"}},
+                            {"notebook": "*", "cells": [{"language": "python"}]},
+                        ]
+                    }
+                }
+            },
+        },
+    ),
+]
+
+
+class TestFastStructure:
+    """The generated fast path must agree with the generic converter."""
+
+    @pytest.mark.parametrize(("schema_name", "raw"), FAST_PATH_CASES)
+    def test_matches_generic_converter(self, schema_name, raw):
+        from lsp_client.jsonrpc.convert import converter, get_structure_fn
+        from lsp_client.utils.types import lsp_type
+
+        schema = getattr(lsp_type, schema_name)
+        assert get_structure_fn(schema)(raw) == converter.structure(raw, schema)
+
+    def test_structure_fn_is_cached(self):
+        from lsp_client.jsonrpc.convert import get_structure_fn
+        from lsp_client.utils.types import lsp_type
+
+        assert get_structure_fn(lsp_type.ReferencesResponse) is get_structure_fn(
+            lsp_type.ReferencesResponse
+        )
+
+    def test_enum_and_defaults(self):
+        from lsp_client.jsonrpc.convert import get_structure_fn
+        from lsp_client.utils.types import lsp_type
+
+        _, raw = FAST_PATH_CASES[1]
+        (symbol,) = get_structure_fn(lsp_type.DocumentSymbolResponse)(raw).result
+        assert symbol.kind is lsp_type.SymbolKind.Class
+        assert symbol.detail is None
+        assert symbol.children[0].children is None
+
+    @pytest.mark.parametrize(("schema_name", "raw"), FAST_PATH_CASES)
+    def test_unstructure_roundtrip(self, schema_name, raw):
+        from lsp_client.jsonrpc.convert import (
+            converter,
+            get_structure_fn,
+            get_unstructure_fn,
+        )
+        from lsp_client.utils.types import lsp_type
+
+        schema = getattr(lsp_type, schema_name)
+        value = get_structure_fn(schema)(raw)
+        assert get_unstructure_fn(schema)(value) == converter.unstructure(value)
+
+    @pytest.mark.parametrize(
+        "symbol",
+        [
+            # missing required `range`
+            {"name": "a", "kind": 5, "selectionRange": None},
+            # unknown `kind`
+            {"name": "a", "kind": 999, "range": None, "selectionRange": None},
+        ],
+    )
+    def test_malformed_payload_raises_class_validation_error(self, symbol):
+        from cattrs.errors import ClassValidationError
+
+        from lsp_client.jsonrpc.convert import converter, get_structure_fn
+        from lsp_client.utils.types import lsp_type
+
+        raw = {"jsonrpc": "2.0", "id": 1, "result": [symbol]}
+        schema = lsp_type.DocumentSymbolResponse
+        with pytest.raises(ClassValidationError):
+            converter.structure(raw, schema)
+        with pytest.raises(ClassValidationError):
+            get_structure_fn(schema)(raw)
+
+
 class TestJsonRpcException:
     """Tests for JSON-RPC exceptions."""
 
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import pytest
+
+from lsp_client.jsonrpc.id import jsonrpc_id, jsonrpc_uuid
+
+
+def test_jsonrpc_id_is_increasing_int():
+    first, second = jsonrpc_id(), jsonrpc_id()
+    assert isinstance(first, int)
+    assert isinstance(second, int)
+    assert second > first
+
+
+def test_jsonrpc_uuid_deprecated():
+    with pytest.warns(DeprecationWarning):
+        assert isinstance(jsonrpc_uuid(), str)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from lsp_client.jsonrpc.convert import response_deserialize
+from lsp_client.jsonrpc.lazy import LazySequence, lazy_response_deserialize
+from lsp_client.utils.type_guard import (
+    is_code_actions,
+    is_symbol_information_seq,
+    is_workspace_symbols,
+)
+from lsp_client.utils.types import lsp_type
+
+
+def _range(line: int) -> dict:
+    return {
+        "start": {"line": line, "character": 0},
+        "end": {"line": line, "character": 5},
+    }
+
+
+def _references(n: int) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": [
+            {"uri": f"file:///mod_{i}.py", "range": _range(i)} for i in range(n)
+        ],
+    }
+
+
+def test_lazy_references_match_eager():
+    raw = _references(10)
+    lazy = lazy_response_deserialize(raw, lsp_type.ReferencesResponse)
+
+    assert isinstance(lazy, LazySequence)
+    assert lazy.item_type is lsp_type.Location
+    assert len(lazy) == 10
+    assert lazy == response_deserialize(raw, lsp_type.ReferencesResponse)
+    assert lazy[-1].uri == "file:///mod_9.py"
+    assert lazy[2:4] == lazy.materialize()[2:4]
+
+
+def test_lazy_structures_on_access_only():
+    lazy = lazy_response_deserialize(_references(3), lsp_type.ReferencesResponse)
+    assert isinstance(lazy, LazySequence)
+
+    assert lazy.raw_at(1)["uri"] == "file:///mod_1.py"
+    assert [item["range"]["start"]["line"] for item in lazy.iter_raw()] == [0, 1, 2]
+    assert lazy._items is None
+
+    first = lazy[0]
+    assert lazy[0] is first
+    assert lazy._items == [first, None, None]
+
+
+def test_lazy_non_array_results_are_eager():
+    empty = lazy_response_deserialize(
+        {"jsonrpc": "2.0", "id": 1, "result": []}, lsp_type.ReferencesResponse
+    )
+    assert not isinstance(empty, LazySequence)
+    assert (
+        lazy_response_deserialize(
+            {"jsonrpc": "2.0", "id": 1, "result": None}, lsp_type.ReferencesResponse
+        )
+        is None
+    )
+
+    location = lazy_response_deserialize(
+        {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": {"uri": "file:///a.py", "range": _range(0)},
+        },
+        lsp_type.DefinitionResponse,
+    )
+    assert isinstance(location, lsp_type.Location)
+
+
+def test_lazy_disambiguates_array_alternatives():
+    workspace_symbols = lazy_response_deserialize(
+        {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": [
+                {"name": "foo", "kind": 12, "location": {"uri": "file:///a.py"}},
+            ],
+        },
+        lsp_type.WorkspaceSymbolResponse,
+    )
+    symbol_information = lazy_response_deserialize(
+        {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": [
+                {
+                    "name": "foo",
+                    "kind": 12,
+                    "location": {"uri": "file:///a.py", "range": _range(0)},
+                },
+            ],
+        },
+        lsp_type.WorkspaceSymbolResponse,
+    )
+
+    assert isinstance(workspace_symbols, LazySequence)
+    assert workspace_symbols.item_type is lsp_type.WorkspaceSymbol
+    assert is_workspace_symbols(workspace_symbols)
+    assert not is_symbol_information_seq(workspace_symbols)
+
+    assert isinstance(symbol_information, LazySequence)
+    assert symbol_information.item_type is lsp_type.SymbolInformation
+    assert is_symbol_information_seq(symbol_information)
+
+
+def test_lazy_union_item_type():
+    actions = lazy_response_deserialize(
+        {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": [
+                {"title": "run", "command": "run"},
+                {"title": "fix", "kind": "quickfix"},
+            ],
+        },
+        lsp_type.CodeActionResponse,
+    )
+
+    assert isinstance(actions, LazySequence)
+    assert isinstance(actions[0], lsp_type.Command)
+    assert isinstance(actions[1], lsp_type.CodeAction)
+    assert is_code_actions(actions)
@@ -3,11 +3,21 @@ from __future__ import annotations
 import json
 from unittest.mock import AsyncMock
 
+import anyio
+import anyio.abc
+import anyio.lowlevel
 import pytest
 from anyio.streams.buffered import BufferedByteReceiveStream
 
 from lsp_client.jsonrpc.exception import JsonRpcParseError, JsonRpcTransportError
-from lsp_client.jsonrpc.parse import read_raw_package, write_raw_package
+from lsp_client.jsonrpc.parse import (
+    FrameReader,
+    FrameWriter,
+    frame_header,
+    read_package,
+    read_raw_package,
+    write_raw_package,
+)
 from lsp_client.jsonrpc.types import RawNotification
 
 
@@ -57,3 +67,203 @@ async def test_write_raw_package():
     expected = f"Content-Length: {len(dumped)}\r\n\r\n".encode() + dumped
 
     mock_sender.send.assert_called_once_with(expected)
+
+
+def _frame(body: bytes, *headers: bytes) -> bytes:
+    return b"\r\n".join((*headers, b"")) + b"\r\n" + body
+
+
+async def _read_all(chunks: list[bytes]) -> list[object]:
+    tx, rx = anyio.create_memory_object_stream[bytes](len(chunks))
+    for chunk in chunks:
+        tx.send_nowait(chunk)
+    tx.close()
+
+    reader = FrameReader(rx)
+    packages = []
+    with pytest.raises(anyio.EndOfStream):
+        while True:
+            packages.append(await read_package(reader))
+    return packages
+
+
+@pytest.mark.asyncio
+async def test_frame_reader_multiple_frames_in_one_chunk():
+    body1 = json.dumps({"id": 1}).encode()
+    body2 = json.dumps({"id": 2}).encode()
+    data = _frame(body1, f"Content-Length: {len(body1)}".encode()) + _frame(
+        body2, f"Content-Length: {len(body2)}".encode()
+    )
+
+    assert await _read_all([data]) == [{"id": 1}, {"id": 2}]
+
+
+@pytest.mark.asyncio
+async def test_frame_reader_any_header_order():
+    body = json.dumps({"result": "ü"}).encode()
+    data = _frame(
+        body,
+        b"Content-Type: application/vscode-jsonrpc; charset=utf-8",
+        f"content-length: {len(body)}".encode(),
+    )
+
+    assert await _read_all([data]) == [{"result": "ü"}]
+
+
+@pytest.mark.asyncio
+async def test_frame_reader_split_chunks():
+    body = json.dumps({"items": list(range(1000))}).encode()
+    data = _frame(body, f"Content-Length: {len(body)}".encode()) * 3
+    chunks = [data[i : i + 7] for i in range(0, len(data), 7)]
+
+    assert await _read_all(chunks) == [{"items": list(range(1000))}] * 3
+
+
+@pytest.mark.asyncio
+async def test_frame_reader_incomplete_frame():
+    tx, rx = anyio.create_memory_object_stream[bytes](1)
+    tx.send_nowait(b"Content-Length: 10\r\n\r\n{}")
+    tx.close()
+
+    with pytest.raises(anyio.IncompleteRead):
+        await FrameReader(rx).receive_frame()
+
+
+@pytest.mark.asyncio
+async def test_frame_reader_missing_content_length():
+    tx, rx = anyio.create_memory_object_stream[bytes](1)
+    tx.send_nowait(b"Content-Type: application/json\r\n\r\n{}")
+    tx.close()
+
+    with pytest.raises(JsonRpcParseError):
+        await FrameReader(rx).receive_frame()
+
+
+class _RecordingStream:
+    def __init__(self, *, fail: bool = False) -> None:
+        self.writes: list[bytes] = []
+        self.fail = fail
+
+    async def send(self, data: bytes) -> None:
+        await anyio.lowlevel.checkpoint()
+        if self.fail:
+            raise anyio.BrokenResourceError
+        self.writes.append(data)
+
+
+@pytest.mark.asyncio
+async def test_frame_writer_batches_concurrent_writes():
+    stream = _RecordingStream()
+    writer = FrameWriter(stream)  # type: ignore[arg-type]
+    bodies = [f'{{"n": {i}}}'.encode() for i in range(50)]
+
+    async with anyio.create_task_group() as tg:
+        await tg.start(writer.run)
+        for body in bodies:
+            tg.start_soon(writer.write, body)
+        await anyio.sleep(0.01)
+        await writer.aclose()
+
+    assert len(stream.writes) < len(bodies)
+    assert b"".join(stream.writes) == b"".join(
+        frame_header(len(body)) + body for body in bodies
+    )
+    assert writer.stats.frames == len(bodies)
+    assert writer.stats.frames_per_flush > 1
+
+
+@pytest.mark.asyncio
+async def test_frame_writer_keeps_order():
+    stream = _RecordingStream()
+    writer = FrameWriter(stream, flush_threshold=1)  # type: ignore[arg-type]
+    bodies = [str(i).encode() for i in range(20)]
+
+    async with anyio.create_task_group() as tg:
+        await tg.start(writer.run)
+        for body in bodies:
+            await writer.write(body)
+        await writer.aclose()
+
+    frames = await _read_all(stream.writes)
+    assert frames == list(range(20))
+
+
+@pytest.mark.asyncio
+async def test_frame_writer_backpressure():
+    stream = _RecordingStream()
+    writer = FrameWriter(stream, max_pending_size=64)  # type: ignore[arg-type]
+
+    async with anyio.create_task_group() as tg:
+        await tg.start(writer.run)
+        await writer.write(b"x" * 100)
+        # `write` returned only after the oversized batch was flushed
+        assert stream.writes == [frame_header(100) + b"x" * 100]
+        await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_frame_writer_direct_write_when_not_running():
+    stream = _RecordingStream()
+    writer = FrameWriter(stream)  # type: ignore[arg-type]
+
+    await writer.write(b"{}")
+    assert stream.writes == [frame_header(2) + b"{}"]
+    assert writer.stats.flushes == 1
+
+
+@pytest.mark.asyncio
+async def test_frame_writer_error():
+    writer = FrameWriter(_RecordingStream(fail=True))  # type: ignore[arg-type]
+
+    async with anyio.create_task_group() as tg:
+        await tg.start(writer.run)
+        await writer.write(b"{}")
+        with pytest.raises(JsonRpcTransportError):
+            await writer.flush()
+
+    with pytest.raises(JsonRpcTransportError):
+        await writer.write(b"{}")
+
+
+@pytest.mark.asyncio
+async def test_frame_writer_error_passed_to_on_error():
+    errors: list[JsonRpcTransportError] = []
+    stream = _RecordingStream(fail=True)
+    writer = FrameWriter(stream, on_error=errors.append)  # type: ignore[arg-type]
+
+    async with anyio.create_task_group() as tg:
+        await tg.start(writer.run)
+        # queued before the flush fails, so it returns without an error
+        await writer.write(b"{}")
+
+    [error] = errors
+    assert isinstance(error.__cause__, anyio.BrokenResourceError)
+
+
+class _BlockingStream:
+    async def send(self, data: bytes) -> None:
+        await anyio.sleep_forever()
+
+
+@pytest.mark.asyncio
+async def test_frame_writer_backpressure_after_run_cancelled():
+    writer = FrameWriter(_BlockingStream(), max_pending_size=64)  # type: ignore[arg-type]
+    run_scope = anyio.CancelScope()
+
+    async def run(*, task_status: anyio.abc.TaskStatus[None]) -> None:
+        with run_scope:
+            await writer.run(task_status=task_status)
+
+    async def write() -> None:
+        with pytest.raises(JsonRpcTransportError):
+            await writer.write(b"x" * 100)
+
+    with anyio.fail_after(1):
+        async with anyio.create_task_group() as tg:
+            await tg.start(run)
+            await writer.write(b"{}")
+            await anyio.sleep(0.01)
+            # blocked until the stuck flush completes
+            tg.start_soon(write)
+            await anyio.sleep(0.01)
+            run_scope.cancel()
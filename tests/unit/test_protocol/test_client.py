@@ -118,3 +118,11 @@ def test_capability_client_protocol_from_uri_multi_root():
     assert client.from_uri(uri1, relative=True) == Path("root1/file.py")
     assert client.from_uri(uri2, relative=True) == Path("root2/file.py")
     assert client.from_uri(uri1, relative=False) == Path("/test/root1/file.py")
+
+
+def test_capability_client_protocol_default_progress_dispatcher():
+    client, other = MockClient(Workspace()), MockClient(Workspace())
+
+    dispatcher = client.get_progress_dispatcher()
+    assert client.get_progress_dispatcher() is dispatcher
+    assert other.get_progress_dispatcher() is not dispatcher
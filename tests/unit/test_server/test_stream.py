@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any, override
+
+import anyio
+import pytest
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from attrs import define, field
+
+from lsp_client.jsonrpc.exception import JsonRpcTransportError
+from lsp_client.jsonrpc.parse import FrameReader, frame_header, read_package
+from lsp_client.server.abc import StreamServer
+from lsp_client.utils.channel import channel
+from lsp_client.utils.progress import ProgressDispatcher
+from lsp_client.utils.workspace import Workspace
+
+
+def _memory_pipe() -> tuple[
+    MemoryObjectSendStream[bytes], MemoryObjectReceiveStream[bytes]
+]:
+    return anyio.create_memory_object_stream[bytes](128)
+
+
+@define
+class PipeServer(StreamServer):
+    """StreamServer over in-memory streams; the test plays the language server."""
+
+    _to_server: tuple[Any, Any] = field(factory=_memory_pipe, init=False)
+    _from_server: tuple[Any, Any] = field(factory=_memory_pipe, init=False)
+
+    @property
+    @override
+    def send_stream(self) -> MemoryObjectSendStream[bytes]:
+        return self._to_server[0]
+
+    @property
+    @override
+    def receive_stream(self) -> MemoryObjectReceiveStream[bytes]:
+        return self._from_server[1]
+
+    @override
+    async def check_availability(self) -> None:
+        return
+
+    @asynccontextmanager
+    async def peer(self) -> AsyncGenerator[FrameReader]:
+        yield FrameReader(self._to_server[1])
+
+    async def reply(self, package: dict) -> None:
+        body = self.codec.encode(package)
+        await self._from_server[0].send(frame_header(len(body)) + body)
+
+
+@asynccontextmanager
+async def running(server: PipeServer) -> AsyncGenerator[PipeServer]:
+    async with (
+        channel.create() as (sender, _),
+        server.run(Workspace(), sender),
+    ):
+        yield server
+        await server._from_server[0].aclose()
+
+
+def _request(id: str) -> dict:
+    return {"jsonrpc": "2.0", "id": id, "method": "textDocument/references"}
+
+
+@pytest.mark.asyncio
+async def test_request_roundtrip():
+    server = PipeServer()
+    async with running(server), server.peer() as peer:
+        async with anyio.create_task_group() as tg:
+            result = {}
+
+            async def call() -> None:
+                result["resp"] = await server.request(_request("1"))  # type: ignore[arg-type]
+
+            tg.start_soon(call)
+            assert (await read_package(peer))["id"] == "1"
+            await server.reply({"jsonrpc": "2.0", "id": "1", "result": None})
+
+        assert result["resp"]["result"] is None
+        assert server._resp_table.completed
+
+
+@pytest.mark.asyncio
+async def test_timeout_sends_cancel_request_and_drops_late_response():
+    server = PipeServer()
+    async with running(server), server.peer() as peer:
+        with anyio.move_on_after(0.05) as scope:
+            await server.request(_request("1"))  # type: ignore[arg-type]
+        assert scope.cancelled_caught
+
+        assert (await read_package(peer))["id"] == "1"
+        assert await read_package(peer) == {
+            "jsonrpc": "2.0",
+            "method": "$/cancelRequest",
+            "params": {"id": "1"},
+        }
+        assert server._resp_table.completed
+
+        # a late response is dropped without disturbing the dispatch loop
+        await server.reply({"jsonrpc": "2.0", "id": "1", "result": []})
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(server.request, _request("2"))
+            assert (await read_package(peer))["id"] == "2"
+            await server.reply({"jsonrpc": "2.0", "id": "2", "result": None})
+
+        with anyio.fail_after(1):
+            await server.wait_requests_completed()
+
+
+@pytest.mark.asyncio
+async def test_failed_send_releases_response_slot():
+    server = PipeServer()
+    # the server is gone: writing the request fails
+    await server._to_server[1].aclose()
+
+    with pytest.raises(anyio.BrokenResourceError):
+        await server.request(_request("1"))  # type: ignore[arg-type]
+    assert server._resp_table.completed
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_fails_pending_requests():
+    server = PipeServer()
+    errors: list[Exception] = []
+    # the failed flush is raised again on shutdown
+    with pytest.RaisesGroup(JsonRpcTransportError, flatten_subgroups=True):
+        async with running(server):
+            # the server is gone: the batched request is queued, then lost
+            await server._to_server[1].aclose()
+            with anyio.move_on_after(1):
+                try:
+                    await server.request(_request("1"))  # type: ignore[arg-type]
+                except JsonRpcTransportError as e:
+                    errors.append(e)
+
+    assert len(errors) == 1
+    assert server._resp_table.completed
+
+
+@pytest.mark.asyncio
+async def test_progress_values_delivered_before_response():
+    progress = ProgressDispatcher()
+    server = PipeServer(progress=progress)
+    async with running(server), server.peer() as peer:
+        with progress.subscribe("partial") as values:
+            async with anyio.create_task_group() as tg:
+
+                async def respond() -> None:
+                    assert (await read_package(peer))["id"] == "1"
+                    for value in ([1], [2]):
+                        await server.reply(
+                            {
+                                "jsonrpc": "2.0",
+                                "method": "$/progress",
+                                "params": {"token": "partial", "value": value},
+                            }
+                        )
+                    await server.reply({"jsonrpc": "2.0", "id": "1", "result": []})
+
+                tg.start_soon(respond)
+                await server.request(_request("1"))  # type: ignore[arg-type]
+
+            progress.finish("partial")
+            assert [value async for value in values] == [[1], [2]]
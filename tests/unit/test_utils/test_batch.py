@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import anyio
+import pytest
+
+from lsp_client.utils.batch import as_completed, gather_limited, stream_from
+
+
+async def _delayed(n: int) -> int:
+    # later items complete first
+    await anyio.sleep(0.001 * (5 - n))
+    return n * n
+
+
+@pytest.mark.asyncio
+async def test_gather_limited_keeps_input_order():
+    assert await gather_limited(range(5), _delayed, max_concurrency=5) == [
+        0,
+        1,
+        4,
+        9,
+        16,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_gather_limited_empty():
+    assert await gather_limited([], _delayed) == []
+
+
+@pytest.mark.asyncio
+async def test_as_completed_yields_in_completion_order():
+    async with as_completed(range(5), _delayed, max_concurrency=5) as results:
+        completed = [(i, item, result) async for i, item, result in results]
+    assert completed == [(i, i, i * i) for i in reversed(range(5))]
+
+
+@pytest.mark.asyncio
+async def test_as_completed_bounds_concurrency():
+    in_flight = peak = 0
+
+    async def query(n: int) -> int:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await anyio.sleep(0.001)
+        in_flight -= 1
+        return n
+
+    assert await gather_limited(range(20), query, max_concurrency=3) == list(range(20))
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_error_cancels_remaining_calls():
+    started: list[int] = []
+
+    async def query(n: int) -> int:
+        started.append(n)
+        if n == 1:
+            raise ValueError(n)
+        await anyio.sleep(1)
+        return n
+
+    with pytest.raises(ValueError, match="1"):
+        await gather_limited(range(10), query, max_concurrency=2)
+    assert started == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_leaving_as_completed_early_cancels_calls():
+    started: list[int] = []
+
+    async def query(n: int) -> int:
+        started.append(n)
+        await anyio.sleep(0.001 if n == 0 else 1)
+        return n
+
+    with anyio.fail_after(0.5):
+        async with as_completed(range(10), query, max_concurrency=2) as results:
+            async for _, item, _ in results:
+                assert item == 0
+                break
+    assert len(started) <= 3
+
+
+@pytest.mark.asyncio
+async def test_stream_from_raises_producer_error_after_values():
+    async def produce(send) -> None:
+        await send.send(1)
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(anyio.sleep, 1)
+            raise KeyError("boom")
+
+    received: list[int] = []
+    with pytest.raises(KeyError, match="boom"):
+        async with stream_from(produce) as values:
+            async for value in values:
+                received.append(value)
+    assert received == [1]
+
+
+@pytest.mark.asyncio
+async def test_stream_from_raises_consumer_error_unwrapped():
+    async def produce(send) -> None:
+        while True:
+            await send.send(0)
+
+    with pytest.raises(ValueError, match="consumer"):
+        async with stream_from(produce) as values:
+            async for _ in values:
+                raise ValueError("consumer")
@@ -82,3 +82,48 @@ async def test_completed_property() -> None:
     # Test that completed is False while pending
     # The actual transition to True after send is tested implicitly
     # by other tests that verify wait_until_empty works correctly
+
+
+@pytest.mark.asyncio
+async def test_release_drops_reservation() -> None:
+    table = OneShotTable()
+    rx = table.reserve("id")
+
+    await table.release("id")
+    assert "id" not in table
+    assert table.completed
+    await table.wait_until_empty()
+
+    with pytest.raises(anyio.EndOfStream):
+        await rx.receive()
+    with pytest.raises(ValueError):
+        await table.send("id", "late")
+
+
+@pytest.mark.asyncio
+async def test_fail_all_raises_to_receivers() -> None:
+    table = OneShotTable()
+    rx1, rx2 = table.reserve(1), table.reserve(2)
+
+    table.fail_all(anyio.BrokenResourceError())
+    assert table.completed
+
+    with pytest.raises(anyio.BrokenResourceError):
+        await rx1.receive()
+    with pytest.raises(anyio.BrokenResourceError):
+        rx2.try_receive()
+
+
+@pytest.mark.asyncio
+async def test_send_to_reserved_slot() -> None:
+    table = OneShotTable()
+    rx = table.reserve(1)
+    assert len(table) == 1
+
+    with pytest.raises(anyio.WouldBlock):
+        rx.try_receive()
+
+    await table.send(1, "response")
+    assert len(table) == 0
+    assert rx.try_receive() == "response"
+    assert await rx.receive() == "response"
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from lsp_client.utils.fs import write_text_atomic
+
+
+def test_write_text_atomic_replaces_content(tmp_path: Path):
+    path = tmp_path / "a.py"
+    path.write_text("old\n")
+    path.chmod(0o755)
+
+    write_text_atomic(path, "new\n")
+
+    assert path.read_text() == "new\n"
+    assert path.stat().st_mode & 0o777 == 0o755
+    assert [p.name for p in tmp_path.iterdir()] == ["a.py"]
+
+
+def test_write_text_atomic_new_file(tmp_path: Path):
+    path = tmp_path / "a.py"
+    write_text_atomic(path, "x = 1\n")
+
+    reference = tmp_path / "b.py"
+    reference.write_text("")
+    assert path.read_text() == "x = 1\n"
+    assert path.stat().st_mode == reference.stat().st_mode
+
+
+def test_write_text_atomic_new_file_honors_umask(tmp_path: Path):
+    old = os.umask(0o077)
+    try:
+        write_text_atomic(tmp_path / "a.py", "")
+    finally:
+        os.umask(old)
+    assert (tmp_path / "a.py").stat().st_mode & 0o777 == 0o600
+
+
+def test_write_text_atomic_follows_symlink(tmp_path: Path):
+    target = tmp_path / "target.py"
+    target.write_text("old\n")
+    link = tmp_path / "link.py"
+    link.symlink_to(target)
+
+    write_text_atomic(link, "new\n")
+
+    assert link.is_symlink()
+    assert target.read_text() == "new\n"
+
+
+def test_write_text_atomic_keeps_file_on_error(tmp_path: Path):
+    path = tmp_path / "a.py"
+    path.write_text("old\n")
+
+    with pytest.raises(UnicodeEncodeError):
+        write_text_atomic(path, "café\n", encoding="ascii")
+
+    assert path.read_text() == "old\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["a.py"]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from lsp_client.utils.ignore import IgnoreRule, is_ignored, iter_source_files
+
+
+def _rules(*lines: str, base: str = "") -> list[IgnoreRule]:
+    return [rule for line in lines if (rule := IgnoreRule.parse(line, base))]
+
+
+@pytest.mark.parametrize(
+    ("lines", "path", "is_dir", "expected"),
+    [
+        (["*.log"], "a/b/debug.log", False, True),
+        (["/build"], "build", True, True),
+        (["/build"], "src/build", True, False),
+        (["build/"], "build", False, False),
+        (["build/"], "src/build", True, True),
+        (["docs/*.py"], "docs/conf.py", False, True),
+        (["docs/*.py"], "docs/api/conf.py", False, False),
+        (["**/gen/*.py"], "a/b/gen/x.py", False, True),
+        (["*.py", "!keep.py"], "src/keep.py", False, False),
+        (["# comment", "", "\\#hash.py"], "#hash.py", False, True),
+        (["test_[ab].py"], "test_a.py", False, True),
+        (["test_[!ab].py"], "test_a.py", False, False),
+    ],
+)
+def test_is_ignored(lines: list[str], path: str, is_dir: bool, expected: bool):
+    assert is_ignored(_rules(*lines), path, is_dir=is_dir) is expected
+
+
+def test_rules_apply_below_their_directory():
+    rules = _rules("*.py", base="vendor")
+    assert is_ignored(rules, "vendor/lib/x.py", is_dir=False)
+    assert not is_ignored(rules, "src/x.py", is_dir=False)
+
+
+def test_iter_source_files(tmp_path: Path):
+    files = [
+        "main.py",
+        "README.md",
+        "src/app.py",
+        "src/generated/api.py",
+        "src/generated/keep.py",
+        "build/out.py",
+        "node_modules/pkg/index.py",
+        ".git/hooks/hook.py",
+    ]
+    for file in files:
+        (tmp_path / file).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file).write_text("")
+    (tmp_path / ".gitignore").write_text("/build/\n")
+    (tmp_path / "src" / ".ignore").write_text("generated/*\n!generated/keep.py\n")
+
+    found = [
+        p.relative_to(tmp_path).as_posix() for p in iter_source_files(tmp_path, [".py"])
+    ]
+    assert found == ["main.py", "src/app.py", "src/generated/keep.py"]
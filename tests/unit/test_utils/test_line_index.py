@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from lsp_client.utils.line_index import LineIndex, encoded_length
+from lsp_client.utils.types import lsp_type
+from lsp_client.utils.workspace_edit import apply_text_edits
+
+ENCODINGS = ("utf-8", "utf-16", "utf-32")
+
+
+def pos(line: int, character: int) -> lsp_type.Position:
+    return lsp_type.Position(line=line, character=character)
+
+
+def test_line_breaks():
+    index = LineIndex.from_text("a\nb\r\nc\rd")
+    assert index.line_count == 4
+    assert list(index.line_starts) == [0, 2, 5, 7]
+    assert index.offset_at(pos(3, 0)) == 7
+    # an offset between `\r` and `\n` belongs to the end of its line
+    assert index.position_at(4) == pos(1, 1)
+
+
+def test_positions_are_clamped():
+    index = LineIndex.from_text("ab\ncd")
+    assert index.offset_at(pos(0, 10)) == 2
+    assert index.offset_at(pos(5, 0)) == 5
+    assert index.position_at(100) == pos(1, 2)
+
+
+@pytest.mark.parametrize(
+    ("encoding", "column"), [("utf-8", 7), ("utf-16", 4), ("utf-32", 3)]
+)
+def test_columns_follow_encoding(encoding: str, column: int):
+    text = "é😀x = 1"
+    index = LineIndex.from_text(text)
+    assert index.position_at(3, encoding) == pos(0, column)
+    assert index.offset_at(pos(0, column), encoding) == 3
+    assert encoded_length(text[:3], encoding) == column
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_roundtrip(encoding: str):
+    rng = random.Random(0)
+    text = "".join(rng.choices("ab \n\r\té😀中", k=2000))
+    index = LineIndex.from_text(text)
+
+    for offset in range(len(text) + 1):
+        if text[offset - 1 : offset + 1] == "\r\n":
+            continue
+        assert index.offset_at(index.position_at(offset, encoding), encoding) == offset
+
+
+def test_apply_text_edits_with_encoding():
+    content = "s = '😀'\nt = 1\n"
+    edit = lsp_type.TextEdit(
+        range=lsp_type.Range(start=pos(0, 9), end=pos(0, 10)), new_text="\"'"
+    )
+    assert apply_text_edits(content, [edit], "utf-8") == "s = '😀\"'\nt = 1\n"
+
+    edit = lsp_type.TextEdit(
+        range=lsp_type.Range(start=pos(0, 7), end=pos(0, 8)), new_text='"'
+    )
+    assert apply_text_edits(content, [edit]) == "s = '😀\"\nt = 1\n"
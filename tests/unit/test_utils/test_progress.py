@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import anyio
+import pytest
+
+from lsp_client.utils.progress import ProgressDispatcher, WorkDoneProgressTracker
+
+
+def test_dispatch_without_subscriber():
+    assert not ProgressDispatcher().dispatch("token", 1)
+
+
+@pytest.mark.asyncio
+async def test_subscribe_receives_until_finish():
+    dispatcher = ProgressDispatcher()
+
+    with dispatcher.subscribe("token") as values:
+        assert dispatcher.dispatch("token", 1)
+        assert dispatcher.dispatch("token", 2)
+        dispatcher.finish("token")
+        assert not dispatcher.dispatch("token", 3)
+
+        assert [value async for value in values] == [1, 2]
+
+    with (
+        pytest.raises(ValueError),
+        dispatcher.subscribe("a"),
+        dispatcher.subscribe("a"),
+    ):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_partial_results_yield_before_response():
+    dispatcher = ProgressDispatcher()
+    response = anyio.Event()
+    seen: list[int] = []
+
+    async def send_request(token):
+        for batch in ([1, 2], [3]):
+            dispatcher.dispatch(token, batch)
+        await response.wait()
+        return [4]
+
+    async with dispatcher.partial_results(
+        send_request,
+        partial_items=lambda value: value,
+        result_items=lambda result: result,
+    ) as items:
+        async for item in items:
+            seen.append(item)
+            if item == 3:
+                # partial results are available while the request is pending
+                response.set()
+
+    assert seen == [1, 2, 3, 4]
+    assert not dispatcher._subscribers
+
+
+@pytest.mark.asyncio
+async def test_partial_results_cancel_on_exit():
+    dispatcher = ProgressDispatcher()
+    cancelled = anyio.Event()
+
+    async def send_request(token):
+        dispatcher.dispatch(token, [1])
+        try:
+            await anyio.sleep_forever()
+        finally:
+            cancelled.set()
+
+    async with dispatcher.partial_results(
+        send_request,
+        partial_items=lambda value: value,
+        result_items=lambda result: result,
+    ) as items:
+        async for _ in items:
+            break
+
+    assert cancelled.is_set()
+
+
+def test_work_done_tracker_idle():
+    tracker = WorkDoneProgressTracker()
+    assert tracker.idle
+
+    tracker.begin("index", "Indexing")
+    tracker.set_busy("status", True)
+    assert tracker.active == {"index": "Indexing"}
+
+    tracker.end("index")
+    assert not tracker.idle
+    tracker.set_busy("status", False)
+    assert tracker.idle
+
+    # ending an unknown token is a no-op
+    tracker.end("unknown")
+    assert tracker.idle
+
+
+@pytest.mark.asyncio
+async def test_wait_until_idle_waits_for_quiet_period():
+    tracker = WorkDoneProgressTracker()
+    tracker.begin("index")
+    done = anyio.Event()
+
+    async def wait() -> None:
+        await tracker.wait_until_idle(quiet_period=0.05)
+        done.set()
+
+    with anyio.fail_after(5):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(wait)
+            await anyio.sleep(0.01)
+            tracker.end("index")
+            # work starting within the quiet period keeps the server busy
+            tracker.begin("check")
+            await anyio.sleep(0.1)
+            assert not done.is_set()
+
+            tracker.end("check")
+            await done.wait()
@@ -143,3 +143,83 @@ def test_document_symbol_hierarchy():
     flattened = hierarchy.flattened
     assert len(flattened) == 4
     assert flattened[DocumentSymbolPath.from_symbols("root", "child2")] is child2
+
+
+def _symbol(
+    name: str,
+    start: tuple[int, int],
+    end: tuple[int, int],
+    children: list[lsp_type.DocumentSymbol] | None = None,
+) -> lsp_type.DocumentSymbol:
+    range_ = lsp_type.Range(
+        start=lsp_type.Position(line=start[0], character=start[1]),
+        end=lsp_type.Position(line=end[0], character=end[1]),
+    )
+    return lsp_type.DocumentSymbol(
+        name=name,
+        kind=lsp_type.SymbolKind.Function,
+        range=range_,
+        selection_range=range_,
+        children=children,
+    )
+
+
+def _pos(line: int, character: int) -> lsp_type.Position:
+    return lsp_type.Position(line=line, character=character)
+
+
+def test_at_position_picks_narrowest_sibling():
+    wide = _symbol("wide", (1, 0), (5, 0), [_symbol("inner", (2, 0), (3, 0))])
+    narrow = _symbol("narrow", (2, 0), (2, 10))
+    first, second = _symbol("dup", (7, 0), (8, 0)), _symbol("dup", (7, 0), (8, 0))
+    root = _symbol("root", (0, 0), (10, 0), [wide, narrow, first, second])
+    hierarchy = DocumentSymbolHierarchy(root=root)
+
+    assert hierarchy.at_position(_pos(2, 5)) is narrow
+    assert hierarchy.at_position(_pos(2, 10)) is wide.children[0]  # type: ignore[index]
+    assert hierarchy.at_position(_pos(4, 0)) is wide
+    # equal ranges: the later sibling wins, the first one by path
+    assert hierarchy.at_position(_pos(7, 3)) is second
+    assert hierarchy.at_path(DocumentSymbolPath.from_symbols("root", "dup")) is first
+
+
+def test_at_position_overlapping_siblings():
+    # the first containing sibling wins unless a later one nests inside it
+    a = _symbol("a", (0, 0), (50, 0))
+    b = _symbol("b", (40, 0), (60, 0))
+    root = _symbol("root", (0, 0), (100, 0), [a, b])
+    hierarchy = DocumentSymbolHierarchy(root=root)
+
+    assert hierarchy.at_position(_pos(45, 0)) is a
+    assert hierarchy.at_position(_pos(55, 0)) is b
+
+    inner = _symbol("inner", (44, 0), (46, 0))
+    root = _symbol("root", (0, 0), (100, 0), [a, b, inner])
+    hierarchy = DocumentSymbolHierarchy(root=root)
+
+    assert hierarchy.at_position(_pos(43, 0)) is a
+    assert hierarchy.at_position(_pos(45, 0)) is inner
+
+
+def test_at_position_clips_children_to_parent():
+    stray = _symbol("stray", (4, 0), (20, 0))
+    root = _symbol("root", (0, 0), (10, 0), [stray])
+    hierarchy = DocumentSymbolHierarchy(root=root)
+
+    assert hierarchy.at_position(_pos(5, 0)) is stray
+    assert hierarchy.at_position(_pos(12, 0)) is None
+
+
+def test_at_positions():
+    children = [_symbol(f"f{i}", (i * 2, 0), (i * 2 + 1, 0)) for i in range(50)]
+    root = _symbol("root", (0, 0), (100, 0), children)
+    hierarchy = DocumentSymbolHierarchy(root=root)
+
+    positions = [_pos(line, 0) for line in range(102)]
+    expected = [hierarchy.at_position(p) for p in positions]
+    assert hierarchy.at_positions(positions) == expected
+    # unsorted positions are resolved as well
+    assert hierarchy.at_positions(reversed(positions)) == expected[::-1]
+    assert expected[4] is children[2]
+    assert expected[5] is root
+    assert expected[100:] == [None, None]
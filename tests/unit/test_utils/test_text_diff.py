@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import random
+import re
+
+import pytest
+
+from lsp_client.utils.text_diff import (
+    common_prefix_length,
+    common_suffix_length,
+    diff_content_changes,
+)
+from lsp_client.utils.types import lsp_type
+
+
+def position_to_offset(text: str, position: lsp_type.Position) -> int:
+    line_start = 0
+    for _ in range(position.line):
+        line_start = re.compile(r"\r\n|\r|\n").search(text, line_start).end()  # type: ignore[union-attr]
+    units = 0
+    offset = line_start
+    while units < position.character:
+        units += 2 if ord(text[offset]) > 0xFFFF else 1
+        offset += 1
+    return offset
+
+
+def apply(text: str, change: lsp_type.TextDocumentContentChangePartial) -> str:
+    start = position_to_offset(text, change.range.start)
+    end = position_to_offset(text, change.range.end)
+    return text[:start] + change.text + text[end:]
+
+
+def test_common_prefix_and_suffix():
+    assert common_prefix_length("abcdef", "abcxef") == 3
+    assert common_prefix_length("abc", "abc") == 3
+    assert common_prefix_length("", "abc") == 0
+    assert common_suffix_length("abcdef", "abcxef", 6) == 2
+    assert common_suffix_length("aaaa", "aa", 1) == 1
+
+
+def test_columns_follow_encoding():
+    old = "s = '😀'\n"
+    new = "s = '😀!'\n"
+    for encoding, column in (("utf-16", 7), ("utf-8", 9), ("utf-32", 6)):
+        [change] = diff_content_changes(old, new, encoding)
+        assert change.range.start == lsp_type.Position(line=0, character=column)
+
+
+def test_rename_sends_small_change():
+    old = "".join(f"line {i}\n" for i in range(20_000))
+    new = old.replace("line 10000\n", "line 1000O\n")
+
+    [change] = diff_content_changes(old, new)
+    assert change.range.start == lsp_type.Position(line=10_000, character=9)
+    assert change.text == "O"
+    assert apply(old, change) == new
+
+
+@pytest.mark.parametrize(
+    ("old", "new"),
+    [
+        ("a\r\nb\r\n", "a\r\nc\r\nb\r\n"),
+        ("a\r\nb", "a\nb"),
+        ("x\r\n", "x\r\r\n"),
+        ("same", "same"),
+        ("", "new"),
+        ("old", ""),
+    ],
+)
+def test_line_breaks_and_edges(old: str, new: str):
+    [change] = diff_content_changes(old, new)
+    assert apply(old, change) == new
+
+
+def test_random_edits():
+    rng = random.Random(0)
+    alphabet = "ab\n\r😀é "
+    for _ in range(500):
+        old = "".join(rng.choices(alphabet, k=rng.randint(0, 30)))
+        new = list(old)
+        for _ in range(rng.randint(1, 3)):
+            i = rng.randint(0, len(new))
+            new[i : i + rng.randint(0, 3)] = rng.choices(alphabet, k=rng.randint(0, 3))
+        new = "".join(new)
+
+        [change] = diff_content_changes(old, new)
+        assert apply(old, change) == new, (old, new)
@@ -10,7 +10,11 @@ import pytest
 from lsprotocol import types as lsp_type
 
 from lsp_client.client.document_state import DocumentStateManager
-from lsp_client.exception import EditApplicationError, VersionMismatchError
+from lsp_client.exception import (
+    EditApplicationError,
+    InvalidTextEditError,
+    VersionMismatchError,
+)
 from lsp_client.protocol import CapabilityClientProtocol
 from lsp_client.protocol.lang import LanguageConfig
 from lsp_client.utils.config import ConfigurationMap
@@ -193,6 +197,55 @@ def test_apply_text_edits_snippet():
     assert result == "Hello snippet\n"
 
 
+def _edit(
+    start: tuple[int, int], end: tuple[int, int], new_text: str
+) -> lsp_type.TextEdit:
+    return lsp_type.TextEdit(
+        range=lsp_type.Range(
+            start=lsp_type.Position(line=start[0], character=start[1]),
+            end=lsp_type.Position(line=end[0], character=end[1]),
+        ),
+        new_text=new_text,
+    )
+
+
+def test_apply_text_edits_insertions_keep_order():
+    """Test that insertions at the same position are applied in the given order."""
+    content = "ab\n"
+    edits = [
+        _edit((0, 1), (0, 2), "B"),
+        _edit((0, 1), (0, 1), "1"),
+        _edit((0, 1), (0, 1), "2"),
+    ]
+    assert apply_text_edits(content, edits) == "a12B\n"
+
+
+def test_apply_text_edits_end_of_document():
+    """Test that the position after the last line refers to the end of document."""
+    content = "a\nb\n"
+    assert apply_text_edits(content, [_edit((1, 0), (2, 0), "c\n")]) == "a\nc\n"
+    # columns past the end of a line refer to the line end
+    assert apply_text_edits(content, [_edit((0, 9), (0, 9), "!")]) == "a!\nb\n"
+
+
+def test_apply_text_edits_rejects_overlap():
+    """Test that overlapping edits are reported instead of guessed."""
+    content = "hello world\n"
+    edits = [_edit((0, 0), (0, 5), "bye"), _edit((0, 3), (0, 8), "x")]
+    with pytest.raises(InvalidTextEditError) as exc_info:
+        apply_text_edits(content, edits)
+    assert exc_info.value.edit_index == 1
+
+
+def test_apply_text_edits_rejects_out_of_range():
+    """Test that edits beyond the end of the document are reported."""
+    content = "a\nb\n"
+    with pytest.raises(InvalidTextEditError):
+        apply_text_edits(content, [_edit((5, 0), (5, 0), "x")])
+    with pytest.raises(InvalidTextEditError):
+        apply_text_edits(content, [_edit((0, 1), (0, 0), "x")])
+
+
 @pytest.mark.asyncio
 async def test_workspace_edit_applicator_simple():
     """Test applying a simple workspace edit."""
@@ -597,3 +650,73 @@ async def test_delete_file_error_not_exists():
 
         with pytest.raises(EditApplicationError, match="does not exist"):
             await applicator.apply_workspace_edit(edit)
+
+
+@pytest.mark.asyncio
+async def test_apply_changes_to_many_files(tmp_path: Path):
+    client = MockClient(temp_dir=tmp_path)
+    applicator = WorkspaceEditApplicator(client=client, max_concurrency=4)
+
+    files = [tmp_path / f"mod_{i}.py" for i in range(50)]
+    for file in files:
+        file.write_text("import old_name\nold_name.run()\n")
+
+    edits = [_edit((0, 7), (0, 15), "new_name"), _edit((1, 0), (1, 8), "new_name")]
+    edit = lsp_type.WorkspaceEdit(changes={file.as_uri(): edits for file in files})
+
+    await applicator.apply_workspace_edit(edit)
+    for file in files:
+        assert file.read_text() == "import new_name\nnew_name.run()\n"
+
+
+@pytest.mark.asyncio
+async def test_invalid_edit_leaves_all_files_untouched(tmp_path: Path):
+    client = MockClient(temp_dir=tmp_path)
+    applicator = WorkspaceEditApplicator(client=client)
+
+    good, bad = tmp_path / "good.py", tmp_path / "bad.py"
+    good.write_text("a = 1\n")
+    bad.write_text("b = 2\n")
+
+    edit = lsp_type.WorkspaceEdit(
+        changes={
+            good.as_uri(): [_edit((0, 0), (0, 1), "x")],
+            bad.as_uri(): [_edit((0, 0), (0, 3), "y"), _edit((0, 2), (0, 5), "z")],
+        }
+    )
+
+    with pytest.raises(InvalidTextEditError) as exc_info:
+        await applicator.apply_workspace_edit(edit)
+    assert exc_info.value.uri == bad.as_uri()
+    assert good.read_text() == "a = 1\n"
+    assert bad.read_text() == "b = 2\n"
+
+
+@pytest.mark.asyncio
+async def test_resource_operations_keep_order_with_text_edits(tmp_path: Path):
+    client = MockClient(temp_dir=tmp_path)
+    applicator = WorkspaceEditApplicator(client=client)
+
+    created, renamed = tmp_path / "created.py", tmp_path / "renamed.py"
+    edit = lsp_type.WorkspaceEdit(
+        document_changes=[
+            lsp_type.CreateFile(uri=created.as_uri()),
+            lsp_type.TextDocumentEdit(
+                text_document=lsp_type.OptionalVersionedTextDocumentIdentifier(
+                    uri=created.as_uri(), version=None
+                ),
+                edits=[_edit((0, 0), (0, 0), "a = 1\n")],
+            ),
+            lsp_type.RenameFile(old_uri=created.as_uri(), new_uri=renamed.as_uri()),
+            lsp_type.TextDocumentEdit(
+                text_document=lsp_type.OptionalVersionedTextDocumentIdentifier(
+                    uri=renamed.as_uri(), version=None
+                ),
+                edits=[_edit((1, 0), (1, 0), "b = 2\n")],
+            ),
+        ]
+    )
+
+    await applicator.apply_workspace_edit(edit)
+    assert not created.exists()
+    assert renamed.read_text() == "a = 1\nb = 2\n"